@@ -0,0 +1,160 @@
+#  This file is part of sydpy.
+# 
+#  Copyright (C) 2014-2015 Bogdan Vukobratovic
+#
+#  sydpy is free software: you can redistribute it and/or modify 
+#  it under the terms of the GNU Lesser General Public License as 
+#  published by the Free Software Foundation, either version 2.1 
+#  of the License, or (at your option) any later version.
+# 
+#  sydpy is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+# 
+#  You should have received a copy of the GNU Lesser General 
+#  Public License along with sydpy.  If not, see 
+#  <http://www.gnu.org/licenses/>.
+
+"""Benchmark of the delta cycle scheduler.
+
+The design comprises a number of parallel ripple chains, each stage being
+a process that copies the value of the previous stage. Every clock edge 
+thus causes as many delta cycles as the chains are deep, with all the 
+chains being active in each delta cycle.
+
+The benchmark compares the former set based scheduler against the ordered 
+run-queue one, with and without the static sensitivity lists, and with the
+stages implemented as method processes. Each kernel is run in a separate 
+interpreter:
+
+    python benchmarks/bench_scheduler.py [chains] [depth] [duration]
+"""
+
+import subprocess
+import sys
+import time
+
+import sydpy
+from sydpy import ddic, compinit, Component, Process, MethodProcess, isig, \
+    Delay, bit8, Simulator, Scheduler
+
+class SetPoolSimulator(Simulator):
+    """Simulator kernel with the set based ready, trigger and update pools,
+    the way they were implemented before the RunQueue."""
+    
+    def __init__(self, sched : sydpy.Dependency('scheduler'), **kwargs):
+        super().__init__(sched, **kwargs)
+        self.trig_pool = set()
+        self.update_pool = set()
+        self._ready_pool = set()
+        
+    def _evaluate(self):
+        while self._ready_pool:
+            proc = self._ready_pool.pop()
+            self._unsubscribe(proc)
+            events = proc.switch()
+            if events is not None:
+                self._subscribe(proc, events)
+            else:
+                self._proc_pool.remove(proc)
+                proc.exit_func()
+        
+        while self.trig_pool:
+            trig = self.trig_pool.pop()
+            trig.resolve(self._ready_pool)
+
+    def _update(self):
+        for s in self.update_pool:
+            s._update()
+            
+        self.update_pool.clear()
+
+class RippleChains(Component):
+    @compinit
+    def __init__(self, name, parent, chains=100, depth=20, static=True, method=False, **kwargs):
+        Component.__init__(self, name, parent)
+        
+        self.src = isig('src', self, dtype=bit8, dflt=0)
+        Process('p_src', self, self.p_src, senslist=[Delay(1)])
+        
+        for c in range(chains):
+            prev = self.src
+            for d in range(depth):
+                stage = isig('s{}_{}'.format(c, d), self, dtype=bit8, dflt=0)
+                if method:
+                    MethodProcess('p{}_{}'.format(c, d), self, self.p_stage, 
+                                  senslist=[prev.e['changed']], pargs=(prev, stage))
+                else:
+                    Process('p{}_{}'.format(c, d), self, self.p_stage, 
+                            senslist=[prev.e['changed']], pargs=(prev, stage),
+                            static=static)
+                prev = stage
+                
+    def p_src(self):
+        self.src <<= self.src.read() + 1
+        
+    def p_stage(self, din, dout):
+        dout <<= din.read()
+
+KERNELS = {
+           'set'      : (SetPoolSimulator, dict(static=False)),
+           'runqueue' : (Simulator, dict(static=False)),
+           'static'   : (Simulator, dict(static=True)),
+           'method'   : (Simulator, dict(method=True)),
+           }
+
+def run(kernel, chains, depth, duration):
+    """Build the design, run it with the selected kernel and return the 
+    number of delta cycles and the simulation wall time."""
+    
+    sim_cls, design_params = KERNELS[kernel]
+    
+    ddic.provide('scheduler', Scheduler())
+    ddic.provide_on_demand('cls/sim', sim_cls, 'sim')
+    sim = ddic['sim']
+    sim.duration = duration
+    
+    deltas = [0]
+    
+    def count_delta(time, delta_count, sim):
+        deltas[0] += 1
+        return True
+    
+    sim.events['delta_end'].append(count_delta)
+    
+    RippleChains('top', None, chains=chains, depth=depth, **design_params)
+    
+    start = time.perf_counter()
+    sim.run()
+    
+    return deltas[0], time.perf_counter() - start
+
+def main(argv):
+    args = [int(a) for a in argv[1:]]
+    chains, depth, duration = (args + [100, 20, 50][len(args):])[:3]
+    
+    results = {}
+    
+    for kernel in KERNELS:
+        out = subprocess.check_output([sys.executable, __file__, '--kernel', 
+                                       kernel, str(chains), str(depth), 
+                                       str(duration)])
+        deltas, elapsed = out.split()
+        results[kernel] = int(deltas) / float(elapsed)
+        
+    print("{} processes, {} delta cycles per clock edge".format(chains*depth + 1, depth))
+    
+    for kernel, rate in results.items():
+        print("{:>10}: {:10.1f} delta cycles/s".format(kernel, rate))
+        
+    for kernel in ['runqueue', 'static', 'method']:
+        print("{:>10}: {:10.2f}x speedup over 'set'".format(kernel, results[kernel] / results['set']))
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--kernel']:
+        args = [int(a) for a in sys.argv[3:]]
+        deltas, elapsed = run(sys.argv[2], *args)
+        print(deltas, elapsed)
+    else:
+        main(sys.argv)
@@ -0,0 +1,302 @@
+#  This file is part of sydpy.
+#
+#  Copyright (C) 2014-2015 Bogdan Vukobratovic
+#
+#  sydpy is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation, either version 2.1
+#  of the License, or (at your option) any later version.
+#
+#  sydpy is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General
+#  Public License along with sydpy.  If not, see
+#  <http://www.gnu.org/licenses/>.
+
+"""Kernel benchmark suite built from synthetic designs.
+
+Each benchmark builds its design, runs it and reports:
+
+    elaboration_s  - Time needed to build the design hierarchy
+    run_s          - Time needed to run the simulation
+    deltas_per_s   - Delta cycles per second of the run
+    events_per_s   - Triggered events per second of the run
+    peak_rss_kb    - Peak resident memory of the benchmark process
+
+Every benchmark runs in a separate interpreter, so that the peak memory
+and the kernel state of one does not affect the others. The results are
+output as JSON, to be tracked over the releases:
+
+    python benchmarks/bench_suite.py [-o results.json] [-s scale] [name ...]
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import traceback
+
+import sydpy
+from sydpy import ddic, compinit, Component, Process, isig, \
+    Delay, bit, Bit, bit8, Simulator, Scheduler
+
+class Clock(Component):
+    """Clock generator toggling the clk signal every half period."""
+    @compinit
+    def __init__(self, name, parent, period=2, **kwargs):
+        Component.__init__(self, name, parent)
+        self.clk = isig('clk', self, dtype=bit, dflt=0)
+        Process('p_clk', self, self.p_clk, senslist=[Delay(period // 2)])
+
+    def p_clk(self):
+        self.clk <<= ~self.clk.read()
+
+class Counters(Component):
+    """Number of N-bit counters incremented on each rising clock edge."""
+    @compinit
+    def __init__(self, name, parent, count=200, width=16, **kwargs):
+        Component.__init__(self, name, parent)
+        self.clkgen = Clock('clkgen', self)
+        clk = self.clkgen.clk
+
+        for i in range(count):
+            cnt = isig('cnt{}'.format(i), self, dtype=Bit(width), dflt=0)
+            Process('p_cnt{}'.format(i), self, self.p_cnt,
+                    senslist=[clk.e['posedge']], pargs=(cnt,))
+
+    def p_cnt(self, cnt):
+        cnt <<= cnt.read() + 1
+
+class FifoChains(Component):
+    """Chains of bounded isig queues, each stage popping the data from the
+    previous one and pushing it to the next one."""
+    @compinit
+    def __init__(self, name, parent, chains=10, depth=10, capacity=4, **kwargs):
+        Component.__init__(self, name, parent)
+
+        for c in range(chains):
+            prev = isig('src{}'.format(c), self, dtype=bit8, dflt=0,
+                        capacity=capacity)
+            Process('p_src{}'.format(c), self, self.p_src, senslist=[Delay(1)],
+                    pargs=(prev,))
+
+            for d in range(depth):
+                stage = isig('s{}_{}'.format(c, d), self, dtype=bit8, dflt=0,
+                             capacity=capacity)
+                Process('p{}_{}'.format(c, d), self, self.p_stage, senslist=[],
+                        pargs=(prev, stage))
+                prev = stage
+
+            Process('p_sink{}'.format(c), self, self.p_sink, senslist=[],
+                    pargs=(prev,))
+
+    def p_src(self, dout):
+        dout.bpush(dout.read_next() + 1)
+
+    def p_stage(self, din, dout):
+        while True:
+            dout.bpush(din.bpop())
+
+    def p_sink(self, din):
+        while True:
+            din.bpop()
+
+class Fanout(Component):
+    """Producers each writing a signal read by a number of consumers, which 
+    are all woken up by its change."""
+    @compinit
+    def __init__(self, name, parent, producers=10, fanout=10, **kwargs):
+        Component.__init__(self, name, parent)
+
+        for p in range(producers):
+            ch = isig('ch{}'.format(p), self, dtype=bit8, dflt=0)
+            Process('p_prod{}'.format(p), self, self.p_prod, senslist=[Delay(1)],
+                    pargs=(ch,))
+
+            for c in range(fanout):
+                Process('p_cons{}_{}'.format(p, c), self, self.p_cons,
+                        senslist=[ch.e['changed']], pargs=(ch,))
+
+    def p_prod(self, ch):
+        ch <<= ch.read() + 1
+
+    def p_cons(self, ch):
+        ch.read()
+
+class Node(Component):
+    """Node of the deep hierarchy. The leaves hold a toggling register."""
+    @compinit
+    def __init__(self, name, parent, clk, depth=6, fanout=3, **kwargs):
+        Component.__init__(self, name, parent)
+
+        if depth:
+            self.subs = [Node('n{}'.format(i), self, clk, depth=depth - 1, fanout=fanout)
+                         for i in range(fanout)]
+        else:
+            self.reg = isig('reg', self, dtype=bit, dflt=0)
+            Process('p_reg', self, self.p_reg, senslist=[clk.e['posedge']])
+
+    def p_reg(self):
+        self.reg <<= ~self.reg.read()
+
+class Hierarchy(Component):
+    """Deep and wide tree of components."""
+    @compinit
+    def __init__(self, name, parent, depth=6, fanout=3, **kwargs):
+        Component.__init__(self, name, parent)
+        self.clkgen = Clock('clkgen', self)
+        self.root = Node('root', self, self.clkgen.clk, depth=depth, fanout=fanout)
+
+def attach_vcd(sim, out_path):
+    """Attach the VCDTracer extension to the simulator. The signals are 
+    registered with it by trace_signals() once the design is built."""
+    from sydpy._util._injector import features
+    from sydpy._configurator import Configurator
+    from sydpy.extens.tracing import VCDTracer
+
+    features.Provide('Configurator', Configurator({'sys.output_path': out_path,
+                                                   'sys.project_path': out_path}))
+    tracer = VCDTracer(sim.events)
+    # Header writer of the tracer walks the former component hierarchy
+    sim.events['run_end'].remove(tracer.writeVcdHeader)
+
+    return tracer
+
+def trace_signals(sim, tracer, top):
+    """Register all the isig interfaces of the design with the tracer, and 
+    write the VCD file at the end of the run, with the interfaces declared 
+    within a single scope."""
+    from sydpy.extens.tracing import VCDTrace
+
+    intfs = {}
+    for intf in top.search(of_type=isig, depth=64):
+        intfs.setdefault(id(intf), intf)
+
+    traces = [VCDTrace(intf.name.replace('/', '.'), intf, init=intf.read())
+              for intf in intfs.values()]
+
+    def write_vcd(sim):
+        tmp_path = tracer.vcdfile.name
+        tracer.vcdfile.close()
+        tracer.vcdfile = open(tmp_path[:-len('.tmp')], 'w')
+
+        tracer.writeVcdHeaderStart()
+        tracer.writeComponentHeaderStart(top)
+        for t in traces:
+            t.print_var_declaration()
+        tracer.writeComponentHeaderEnd()
+        tracer.writeVcdHeaderEnd()
+
+        tracer.writeVcdInitValuesStart()
+        for t in traces:
+            t.print_init_val()
+        tracer.writeVcdInitValuesEnd()
+
+        with open(tmp_path) as f:
+            tracer.vcdfile.write(f.read())
+
+        tracer.vcdfile.close()
+        return True
+
+    sim.events['run_end'].append(write_vcd)
+
+    return traces
+
+# name: (design class, design parameters, simulation duration, VCD tracing)
+BENCHMARKS = {
+              'counters'  : (Counters, dict(count=200, width=16), 400, False),
+              'fifo'      : (FifoChains, dict(chains=10, depth=10), 200, False),
+              'fanout'    : (Fanout, dict(producers=10, fanout=10), 200, False),
+              'hierarchy' : (Hierarchy, dict(depth=6, fanout=3), 100, False),
+              'counters_vcd': (Counters, dict(count=200, width=16), 400, True),
+              }
+
+def run(name, scale=1):
+    """Build and run the benchmark design and return the measured results."""
+
+    design, params, duration, vcd = BENCHMARKS[name]
+
+    ddic.provide('scheduler', Scheduler())
+    ddic.provide_on_demand('cls/sim', Simulator, 'sim')
+    sim = ddic['sim']
+    sim.duration = int(duration * scale)
+
+    if vcd:
+        tracer = attach_vcd(sim, os.path.join(os.getcwd(), 'out', 'bench_' + name))
+
+    start = time.perf_counter()
+    top = design('top', None, **params)
+    elaboration = time.perf_counter() - start
+
+    if vcd:
+        trace_signals(sim, tracer, top)
+
+    start = time.perf_counter()
+    sim.run()
+    elapsed = time.perf_counter() - start
+
+    stats = sim.stats()
+
+    return {
+            'params'        : params,
+            'duration'      : sim.duration,
+            'processes'     : stats['processes'],
+            'deltas'        : stats['deltas'],
+            'events'        : stats['events'],
+            'elaboration_s' : elaboration,
+            'run_s'         : elapsed,
+            'deltas_per_s'  : stats['deltas'] / elapsed,
+            'events_per_s'  : stats['events'] / elapsed,
+            'peak_rss_kb'   : resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            }
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Run the sydpy kernel benchmarks.")
+    parser.add_argument('names', nargs='*', help="Benchmarks to run, all by default")
+    parser.add_argument('-o', '--output', help="Write the JSON results to the file")
+    parser.add_argument('-s', '--scale', type=float, default=1,
+                        help="Scale the simulation durations")
+    args = parser.parse_args(argv[1:])
+
+    results = {}
+
+    for name in (args.names or list(BENCHMARKS)):
+        proc = subprocess.run([sys.executable, __file__, '--run', name,
+                               str(args.scale)], stdout=subprocess.PIPE,
+                              stderr=subprocess.PIPE, universal_newlines=True)
+        try:
+            results[name] = json.loads(proc.stdout.strip().splitlines()[-1])
+        except (ValueError, IndexError):
+            results[name] = {'error': proc.stderr.strip().splitlines()[-1:]}
+
+    report = {
+              'sydpy'     : sydpy.__version__,
+              'python'    : platform.python_version(),
+              'platform'  : platform.platform(),
+              'timestamp' : time.strftime('%Y-%m-%dT%H:%M:%S'),
+              'benchmarks': results,
+              }
+
+    out = json.dumps(report, indent=4, sort_keys=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(out)
+
+    print(out)
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--run']:
+        try:
+            print(json.dumps(run(sys.argv[2], float(sys.argv[3]))))
+        except Exception as e:
+            print(json.dumps({'error': traceback.format_exception_only(type(e), e)[-1].strip()}))
+    else:
+        main(sys.argv)
@@ -0,0 +1,134 @@
+#  This file is part of sydpy.
+#
+#  Copyright (C) 2014-2015 Bogdan Vukobratovic
+#
+#  sydpy is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation, either version 2.1
+#  of the License, or (at your option) any later version.
+#
+#  sydpy is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General
+#  Public License along with sydpy.  If not, see
+#  <http://www.gnu.org/licenses/>.
+
+"""Benchmark of the value propagation through the signals.
+
+The design comprises a number of transaction pipelines. The source of each
+pipeline issues a struct transaction with a data burst every clock cycle,
+and each pipeline stage forwards the transaction it receives to the next
+one, so that the struct values are passed between the signals without
+being modified.
+
+The benchmark compares the former kernel, which copied the value on each
+write and each signal update, against the kernel committing the values by
+reference. Each kernel is run in a separate interpreter:
+
+    python benchmarks/bench_values.py [pipes] [depth] [duration]
+"""
+
+import copy
+import subprocess
+import sys
+import time
+
+import sydpy.intfs.isig
+from sydpy import ddic, compinit, Component, Process, isig, Delay, Struct, \
+    Array, bit, bit8, bit32, Simulator, Scheduler
+from sydpy._signal import Signal
+
+Transaction = Struct(('addr', bit32),
+                     ('data', Array(bit8)),
+                     ('last', bit))
+
+class CopySignal(Signal):
+    """Signal that copies the value on each write and update, the way it
+    was implemented before the values were committed by reference."""
+
+    def write(self, val):
+        Signal.write(self, copy.deepcopy(val))
+
+    def _update(self):
+        Signal._update(self)
+        self._val = copy.deepcopy(self._val)
+
+class TransactionPipes(Component):
+    @compinit
+    def __init__(self, name, parent, pipes=20, depth=10, burst=16, **kwargs):
+        Component.__init__(self, name, parent)
+
+        self.burst = burst
+
+        for p in range(pipes):
+            prev = isig('src{}'.format(p), self, dtype=Transaction, dflt=Transaction())
+            Process('p_src{}'.format(p), self, self.p_src, senslist=[Delay(1)],
+                    pargs=(prev,))
+
+            for d in range(depth):
+                stage = isig('s{}_{}'.format(p, d), self, dtype=Transaction, dflt=Transaction())
+                Process('p{}_{}'.format(p, d), self, self.p_stage,
+                        senslist=[prev.e['changed']], pargs=(prev, stage))
+                prev = stage
+
+    def p_src(self, dout):
+        addr = int(dout.read()._val[0]) + 1
+        dout <<= Transaction([addr, [addr + i for i in range(self.burst)], 1])
+
+    def p_stage(self, din, dout):
+        dout <<= din.read()
+
+KERNELS = {
+           'copy'      : CopySignal,
+           'reference' : Signal,
+           }
+
+def run(kernel, pipes, depth, duration):
+    """Build the design, run it with the selected kernel and return the
+    number of transactions passed between the signals and the simulation
+    wall time."""
+
+    sydpy.intfs.isig.Signal = KERNELS[kernel]
+
+    ddic.provide('scheduler', Scheduler())
+    ddic.provide_on_demand('cls/sim', Simulator, 'sim')
+    sim = ddic['sim']
+    sim.duration = duration
+
+    TransactionPipes('top', None, pipes=pipes, depth=depth)
+
+    start = time.perf_counter()
+    sim.run()
+
+    return pipes*(depth + 1)*duration, time.perf_counter() - start
+
+def main(argv):
+    args = [int(a) for a in argv[1:]]
+    pipes, depth, duration = (args + [20, 10, 100][len(args):])[:3]
+
+    results = {}
+
+    for kernel in KERNELS:
+        out = subprocess.check_output([sys.executable, __file__, '--kernel',
+                                       kernel, str(pipes), str(depth),
+                                       str(duration)])
+        trans, elapsed = out.split()
+        results[kernel] = int(trans) / float(elapsed)
+
+    print("{} pipelines, {} stages each".format(pipes, depth))
+
+    for kernel, rate in results.items():
+        print("{:>10}: {:10.1f} transactions/s".format(kernel, rate))
+
+    print("{:>10}: {:10.2f}x speedup over 'copy'".format('reference', results['reference'] / results['copy']))
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--kernel']:
+        args = [int(a) for a in sys.argv[3:]]
+        trans, elapsed = run(sys.argv[2], *args)
+        print(trans, elapsed)
+    else:
+        main(sys.argv)
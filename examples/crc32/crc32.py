@@ -22,11 +22,7 @@ class Crc32(Module):
     def tlm(self, crc_in: tlm(Array(bit8)).slave, crc_out: tlm(bit32).master):
         @always_acquire(self, crc_in)
         def proc(val):
-            crc = 0
-            for b in val:
-                crc = zlib.crc32(bytes([int(b)]), crc)
-                  
-            crc_out.blk_next = crc
+            crc_out.blk_next = zlib.crc32(ByteArray().conv(val))
     
         
     # Algorithm from: http://www.hackersdelight.org/hdcodetxt/crc.c.txt
@@ -64,17 +64,8 @@ class Eth1GMac(Module):
             if len(pkt.data) < 46:
                 pkt.data += [bit8(0) for _ in range(46 - len(pkt.data))]
 
-            crc = 0
-            for b in convgen(pkt, bit8):
-                crc = zlib.crc32(bytes([int(b)]), crc)
-#                 print("{0} -> {1}".format(b, hex(~bit32(crc))))
-                
-#             print("Final: {0}".format(hex(bit32(crc))))
-
-            crc = zlib.crc32(bytes(map(int, 
-                                       convgen(pkt, bit8)
-                                       ))
-                             )
+            # Packet bytes are gathered into a single buffer for zlib
+            crc = zlib.crc32(ByteArray().conv(pkt))
             crc_rev = list(convgen(bit32(crc), bit8))[::-1]
             
             pkt_gmii = eth_gmii_pkt([
@@ -33,10 +33,12 @@ class Hdlang: #(Enum):
 
 from ddi.ddi import compinit, ddic, Dependency, diinit
 
-from sydpy.component import restart_sydsys, Component
+from sydpy.component import sydsys, restart_sydsys, Component
 from sydpy.simulator import Simulator, Scheduler
+from sydpy._profiler import KernelProfiler
+from sydpy._signal_bank import SignalBank
 from sydpy.channel import Channel
-from sydpy.process import Process
+from sydpy.process import Process, MethodProcess, always_method
 from sydpy.server import Server
 from sydpy.xsim import XsimIntf
 from sydpy.cosim import Cosim
@@ -54,6 +56,8 @@ from sydpy.types import *
     
 __all__ = [
            "Simulator",
+           "KernelProfiler",
+           "SignalBank",
            "Component",
            "compinit",
            "Channel",
@@ -62,6 +66,8 @@ __all__ = [
            "Delay",
            "Cosim",
            "Process",
+           "MethodProcess",
+           "always_method",
            "isig",
            "iseq",
            "sydsys",
@@ -75,6 +81,7 @@ __all__ = [
            "bit32",
            "bit64",
            "Array",
+           "ByteArray",
 #            "Enum",
 #            "Struct",
 #            "Vector",
@@ -0,0 +1,308 @@
+#  This file is part of sydpy.
+#
+#  Copyright (C) 2014-2015 Bogdan Vukobratovic
+#
+#  sydpy is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation, either version 2.1
+#  of the License, or (at your option) any later version.
+#
+#  sydpy is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General
+#  Public License along with sydpy.  If not, see
+#  <http://www.gnu.org/licenses/>.
+
+"""Module implements the simulation checkpoints and the fork-based
+branching of the simulation."""
+
+import os
+import pickle
+import random
+import sys
+import traceback
+
+from greenlet import greenlet
+from sydpy.component import Component
+from sydpy._event import Event, EventSet
+from sydpy._signal import Signal
+from sydpy._signal_bank import BankSignal
+from sydpy.process import Process
+from sydpy.rnd.rnd import rnd
+
+class CheckpointError(Exception):
+    """Raised when the simulation state cannot be saved or restored."""
+    pass
+
+def _components(sim):
+    """Return all the components of the design hierarchy the processes
+    registered with the simulator belong to."""
+
+    roots = []
+    for p in sim._proc_pool:
+        c = p
+        while getattr(c, '_parent', None) is not None:
+            c = c._parent
+
+        roots.append(c)
+
+    comps = []
+    seen = set()
+    stack = list(reversed(roots))
+
+    while stack:
+        c = stack.pop()
+        if id(c) in seen:
+            continue
+
+        seen.add(id(c))
+        comps.append(c)
+
+        subs = list(vars(c).get('comp', {}).values())
+        if isinstance(c, Event):
+            subs.extend(c.subevents.values())
+
+        stack.extend(s for s in reversed(subs) if isinstance(s, Component))
+
+    return comps
+
+def _at_loop_top(proc):
+    """Return True if the process waits on its sensitivity list, i.e. it is
+    at the point it returns to after each activation."""
+    if not proc.senslist:
+        return False
+
+    if proc.armed:
+        return True
+
+    events = getattr(proc, 'events', None)
+    return (events is not None) and (tuple(events) == tuple(proc.senslist))
+
+class Checkpoint(object):
+    """Snapshot of the simulation state.
+
+    The snapshot holds the simulation time, the delay schedule, the kernel
+    pools, the values and queues of the signals, the event subscriptions,
+    the state of the processes and the state of the random generators.
+    Restoring it rolls the simulation back to the time of the snapshot.
+
+    The stacks of the greenlet processes cannot be saved. A process can be
+    rolled back only if it has not run since the snapshot was taken, or if
+    both then and now it waits at the top of its sensitivity list loop.
+    The state kept outside of the signals, like plain attributes of the
+    user components, is not saved either.
+    """
+
+    def __init__(self, sim):
+        _check_paused(sim)
+
+        self.sim = sim
+        self.time = sim.time
+        self.delta_count = getattr(sim, 'delta_count', 0)
+        self.delays = sim.delay_pool.items()
+        self.delay_now = sim.delay_pool._now
+        self.ready_pool = list(sim._ready_pool)
+        self.trig_pool = list(sim.trig_pool)
+        self.update_pool = list(sim.update_pool)
+        self.proc_pool = list(sim._proc_pool)
+
+        if sim.cycle_sched is not None:
+            self.comb_dirty = [list(d) for d in sim.cycle_sched._dirty]
+        else:
+            self.comb_dirty = None
+
+        self.procs = {}
+        for p in self.proc_pool:
+            self.procs[p] = dict(armed=p.armed,
+                                 events=getattr(p, 'events', None),
+                                 initialized=getattr(p, 'initialized', None),
+                                 activations=p.activations,
+                                 at_top=_at_loop_top(p),
+                                 subscribed=(p.static_sens is not None) and p.static_sens.subscribed)
+
+        self.comps = []
+        self.events = []
+        self.intfs = []
+        self.signals = []
+        self.banks = {}
+
+        for c in _components(sim):
+            if 'comp' in vars(c):
+                self.comps.append((c, dict(c.comp)))
+
+            if isinstance(c, Event):
+                self.events.append((c, dict(c.pool)))
+
+            if hasattr(c, '_sourced'):
+                self.intfs.append((c, c._sourced, c._sig))
+
+                if isinstance(c._sig, Signal):
+                    s = c._sig
+                    # Signal values are not modified in place, hence they 
+                    # can be kept by reference
+                    self.signals.append((s, (s._val, s._next, list(s.mem))))
+                elif isinstance(c._sig, BankSignal):
+                    bank = c._sig.bank
+                    if bank not in self.banks:
+                        self.banks[bank] = bank.state()
+
+        self.random_state = random.getstate()
+        self.rnd_states = [(r, r.getstate()) for r in rnd.instances]
+
+    def restore(self):
+        """Roll the simulation back to the state of the snapshot."""
+
+        sim = self.sim
+        _check_paused(sim)
+
+        for p, st in self.procs.items():
+            if p.is_method:
+                continue
+
+            if p.dead:
+                raise CheckpointError("Process {0} has terminated since the checkpoint".format(p.name))
+
+            if p.activations != st['activations']:
+                if not (st['at_top'] and _at_loop_top(p)):
+                    raise CheckpointError("Process {0} has moved since the checkpoint".format(p.name))
+
+        for c, comp in self.comps:
+            c.comp.clear()
+            c.comp.update(comp)
+            
+            if isinstance(c, EventSet):
+                c._update_flags()
+
+        for e, pool in self.events:
+            e.pool = dict(pool)
+
+        for intf, sourced, sig in self.intfs:
+            intf._sourced = sourced
+            intf._sig = sig
+
+        for s, state in self.signals:
+            (s._val, s._next, mem) = state
+            s.mem.clear()
+            s.mem.extend(mem)
+
+        for bank, state in self.banks.items():
+            bank.restore(state)
+
+        for p, st in self.procs.items():
+            p.armed = st['armed']
+            p.events = st['events']
+            if st['initialized'] is not None:
+                p.initialized = st['initialized']
+
+            if p.static_sens is not None:
+                p.static_sens.subscribed = st['subscribed']
+
+        sim._proc_pool[:] = self.proc_pool
+        sim.time = self.time
+        sim.delta_count = self.delta_count
+        sim.delay_pool.restore(self.delays, self.delay_now)
+
+        for pool, items in [(sim._ready_pool, self.ready_pool),
+                            (sim.trig_pool, self.trig_pool),
+                            (sim.update_pool, self.update_pool)]:
+            pool.clear()
+            pool.update(items)
+
+        if self.comb_dirty is not None:
+            sched = sim.cycle_sched
+            sched._lowest = len(sched.levels)
+            for d in sched._dirty:
+                d.clear()
+
+            for items in self.comb_dirty:
+                for p in items:
+                    sched.mark(p)
+
+        random.setstate(self.random_state)
+        for r, state in self.rnd_states:
+            r.setstate(state)
+
+def _check_paused(sim):
+    if isinstance(greenlet.getcurrent(), Process) or (greenlet.getcurrent() is sim.sched):
+        raise CheckpointError("Simulation state can only be saved or restored while the simulation is paused")
+
+    if sim._finished:
+        raise CheckpointError("Simulation has finished")
+
+def branch(sim, funcs, jobs=None):
+    """Continue the paused simulation in a separate forked child process for
+    each of the funcs. Each func is called with the simulator as the
+    argument within its child. The children share the memory of the warmed
+    up simulation through copy-on-write.
+
+    jobs - Maximum number of the children running at the same time.
+           Defaults to the number of CPUs.
+
+    Returns the list of the values returned by the funcs, which need to be
+    picklable. Raises CheckpointError if any of the funcs raised an
+    exception.
+    """
+
+    if not hasattr(os, 'fork'):
+        raise CheckpointError("Branching requires os.fork()")
+
+    _check_paused(sim)
+
+    jobs = jobs or os.cpu_count() or 1
+    pending = list(enumerate(funcs))
+    running = []
+    results = [None]*len(pending)
+    errors = []
+
+    while pending or running:
+        while pending and (len(running) < jobs):
+            i, func = pending.pop(0)
+            rfd, wfd = os.pipe()
+
+            sys.stdout.flush()
+            sys.stderr.flush()
+
+            pid = os.fork()
+            if pid == 0:
+                os.close(rfd)
+                try:
+                    try:
+                        data = pickle.dumps((True, func(sim)))
+                    except BaseException:
+                        data = pickle.dumps((False, traceback.format_exc()))
+
+                    with os.fdopen(wfd, 'wb') as f:
+                        f.write(data)
+
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                finally:
+                    os._exit(0)
+
+            os.close(wfd)
+            running.append((pid, i, rfd))
+
+        pid, i, rfd = running.pop(0)
+        with os.fdopen(rfd, 'rb') as f:
+            data = f.read()
+
+        os.waitpid(pid, 0)
+
+        if not data:
+            errors.append((i, "Child process exited without the result"))
+            continue
+
+        ok, val = pickle.loads(data)
+
+        if ok:
+            results[i] = val
+        else:
+            errors.append((i, val))
+
+    if errors:
+        raise CheckpointError('\n'.join("Branch {0} failed:\n{1}".format(i, tb) for i, tb in sorted(errors)))
+
+    return results
@@ -0,0 +1,271 @@
+#  This file is part of sydpy.
+#
+#  Copyright (C) 2014-2015 Bogdan Vukobratovic
+#
+#  sydpy is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation, either version 2.1
+#  of the License, or (at your option) any later version.
+#
+#  sydpy is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General
+#  Public License along with sydpy.  If not, see
+#  <http://www.gnu.org/licenses/>.
+
+"""Module implements DelayQueue class"""
+
+import heapq
+
+class DelayQueue(object):
+    """Queue of the processes scheduled for execution at some future time.
+
+    Wake-ups that fall within the wheel horizon are kept in a hashed timing
+    wheel, with an integer bitmap marking the occupied slots. Wake-ups
+    further in the future (or at non-integer times) are kept in a binary
+    heap. Cancellation is lazy: the entry is only marked dead and is
+    discarded once it reaches the front of the queue.
+
+    Each entry is a list [time, seq, proc], so that the heap orders them
+    by time and then by the order of scheduling.
+    """
+
+    def __init__(self, wheel_bits=8):
+        """Create a new DelayQueue.
+
+        wheel_bits - Number of the timing wheel slots is 2**wheel_bits.
+        """
+        self.wheel_size = 1 << wheel_bits
+        self._mask = self.wheel_size - 1
+        self.clear()
+
+    def clear(self):
+        """Remove all scheduled processes and reset the statistics."""
+        self._wheel = [[] for _ in range(self.wheel_size)]
+        self._occupied = 0
+        self._heap = []
+        self._entries = {}
+        self._now = 0
+        self._seq = 0
+        self._garbage = 0
+
+        self.pushes = 0
+        self.wheel_pushes = 0
+        self.heap_pushes = 0
+        self.pops = 0
+        self.cancels = 0
+        self.stale = 0
+        self.compactions = 0
+        self.peak = 0
+
+    def restore(self, items, now=0):
+        """Replace the schedule with the (process, time) pairs, as returned 
+        by items(). The now argument is the time of the last removal from 
+        the queue. The statistics are kept."""
+        self._wheel = [[] for _ in range(self.wheel_size)]
+        self._occupied = 0
+        self._heap = []
+        self._entries = {}
+        self._now = now
+        self._garbage = 0
+
+        for proc, time in items:
+            self.push(proc, time)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def __contains__(self, proc):
+        return proc in self._entries
+
+    def get(self, proc, dflt=None):
+        """Return the time the process is scheduled for."""
+        entry = self._entries.get(proc)
+        if entry is None:
+            return dflt
+        else:
+            return entry[0]
+
+    def items(self):
+        """Return (process, time) pairs in the order of the scheduled time."""
+        return [(e[2], e[0]) for e in sorted(self._entries.values())]
+
+    def push(self, proc, time):
+        """Schedule the process for the execution at the given absolute time.
+        Any previous schedule of the process is cancelled."""
+
+        old = self._entries.get(proc)
+        if old is not None:
+            old[2] = None
+            self._garbage += 1
+
+        entry = [time, self._seq, proc]
+        self._seq += 1
+        self._entries[proc] = entry
+        self.pushes += 1
+
+        delta = time - self._now
+        if (time.__class__ is int) and (0 <= delta <= self._mask):
+            slot = time & self._mask
+            self._wheel[slot].append(entry)
+            self._occupied |= (1 << slot)
+            self.wheel_pushes += 1
+        else:
+            heapq.heappush(self._heap, entry)
+            self.heap_pushes += 1
+
+        if len(self._entries) > self.peak:
+            self.peak = len(self._entries)
+
+    def cancel(self, proc):
+        """Remove the process from the schedule, if it is scheduled."""
+        entry = self._entries.pop(proc, None)
+        if entry is not None:
+            entry[2] = None
+            self.cancels += 1
+            self._garbage += 1
+
+            if self._garbage > 2*len(self._entries) + 1024:
+                self._compact()
+
+    def _compact(self):
+        """Drop all cancelled entries from the wheel and the heap."""
+        for slot, entries in enumerate(self._wheel):
+            if entries:
+                entries[:] = [e for e in entries if e[2] is not None]
+                if not entries:
+                    self._occupied &= ~(1 << slot)
+
+        self._heap = [e for e in self._heap if e[2] is not None]
+        heapq.heapify(self._heap)
+        self._garbage = 0
+        self.compactions += 1
+
+    def _wheel_min(self):
+        """Return the time and slot of the earliest live wheel entries, or
+        (None, None) if there are none."""
+
+        while self._occupied:
+            base = self._now & self._mask
+            upper = self._occupied >> base
+
+            if upper:
+                offset = (upper & -upper).bit_length() - 1
+            else:
+                lower = self._occupied
+                offset = (lower & -lower).bit_length() - 1 + self.wheel_size - base
+
+            slot = (base + offset) & self._mask
+            entries = self._wheel[slot]
+
+            for e in entries:
+                if e[2] is not None:
+                    return self._now + offset, slot
+
+            # Only the cancelled entries remain in the slot
+            self.stale += len(entries)
+            self._garbage -= len(entries)
+            entries.clear()
+            self._occupied &= ~(1 << slot)
+
+        return None, None
+
+    def _heap_min(self):
+        """Return the time of the earliest live heap entry or None."""
+        heap = self._heap
+        while heap:
+            if heap[0][2] is not None:
+                return heap[0][0]
+
+            heapq.heappop(heap)
+            self.stale += 1
+            self._garbage -= 1
+
+        return None
+
+    def peek_time(self):
+        """Return the time of the earliest scheduled process, or None if
+        the queue is empty."""
+        t_wheel, _ = self._wheel_min()
+        t_heap = self._heap_min()
+
+        if t_wheel is None:
+            return t_heap
+        elif (t_heap is None) or (t_wheel <= t_heap):
+            return t_wheel
+        else:
+            return t_heap
+
+    def pop_next(self):
+        """Remove all the processes scheduled for the earliest time from the
+        queue. Return the tuple (time, processes), or None if the queue is
+        empty."""
+
+        t_wheel, slot = self._wheel_min()
+        t_heap = self._heap_min()
+
+        if t_wheel is None:
+            if t_heap is None:
+                return None
+            time = t_heap
+        elif (t_heap is None) or (t_wheel <= t_heap):
+            time = t_wheel
+        else:
+            time = t_heap
+
+        procs = []
+        entries = self._entries
+
+        if t_wheel == time:
+            wheel_entries = self._wheel[slot]
+            for e in wheel_entries:
+                proc = e[2]
+                if proc is not None:
+                    procs.append(proc)
+                    del entries[proc]
+                else:
+                    self.stale += 1
+                    self._garbage -= 1
+
+            wheel_entries.clear()
+            self._occupied &= ~(1 << slot)
+
+        heap = self._heap
+        while heap and heap[0][0] == time:
+            proc = heapq.heappop(heap)[2]
+            if proc is not None:
+                procs.append(proc)
+                del entries[proc]
+            else:
+                self.stale += 1
+                self._garbage -= 1
+
+        if time.__class__ is int:
+            self._now = time
+        else:
+            self._now = int(time)
+
+        self.pops += len(procs)
+
+        return time, procs
+
+    def stats(self):
+        """Return the dictionary with the queue statistics."""
+        return {
+                'scheduled'     : len(self._entries),
+                'peak'          : self.peak,
+                'pushes'        : self.pushes,
+                'wheel_pushes'  : self.wheel_pushes,
+                'heap_pushes'   : self.heap_pushes,
+                'pops'          : self.pops,
+                'cancels'       : self.cancels,
+                'stale'         : self.stale,
+                'compactions'   : self.compactions,
+                'wheel_size'    : self.wheel_size,
+                }
@@ -17,15 +17,52 @@
 #  <http://www.gnu.org/licenses/>.
 """Module implements Event and EventSet classes"""
 
-from sydpy.component import Component
+from sydpy.component import Component, sep
 from sydpy import compinit, ddic
 
+# Flags of the events that the signals check for on each update
+EV_UPDATED      = 1 << 0
+EV_CHANGED      = 1 << 1
+EV_EVENT_DEF    = 1 << 2
+EV_POSEDGE      = 1 << 3
+EV_NEGEDGE      = 1 << 4
+
+_event_flags = {
+                'updated'   : EV_UPDATED,
+                'changed'   : EV_CHANGED,
+                'event_def' : EV_EVENT_DEF,
+                'posedge'   : EV_POSEDGE,
+                'negedge'   : EV_NEGEDGE,
+                }
+
+def _key_mask(key):
+    """Return the bit mask of the data part selected by the key, or None if
+    the key does not select the bits."""
+    if isinstance(key, slice):
+        try:
+            high = max(key.start, key.stop)
+            low = min(key.start, key.stop)
+        except TypeError:
+            return None
+        
+        return ((1 << (high - low + 1)) - 1) << low
+    elif isinstance(key, int):
+        return 1 << key
+    else:
+        return None
+
 class EventSet(Component):
-    """Container for events."""
+    """Container for events.
+    
+    The flags attribute holds the EV_* bit of each of the events created
+    within the set, so that the signals can check which events they need to
+    trigger without looking them up.
+    """
     @compinit
     def __init__(self, name, parent, events = {}, missing_event_handle=None, dynamic=True, **kwargs):
         super().__init__(name, parent)
         
+        self.flags = 0
         self.events = events.copy()
         
         if missing_event_handle:
@@ -41,6 +78,12 @@ class EventSet(Component):
     def _missing_event_err(self, _, name):
         raise Exception("no such event")
     
+    def _update_flags(self):
+        """Recalculate the flags from the events within the set."""
+        self.flags = 0
+        for name in self.comp:
+            self.flags |= _event_flags.get(name.rsplit(sep, 1)[-1], 0)
+    
     def __getitem__(self, name):
         try:
             return Component.__getitem__(self, name)
@@ -62,15 +105,30 @@ class Event(Component):
         super().__init__(name, parent)
         
         self.parent = parent
-        self.pool = set()
+        # Dict is used as an ordered set, to keep wake-up order reproducible
+        self.pool = {}
         self.key = key
+        self.mask = _key_mask(key)
         self.subevents = {}
         
+        if isinstance(parent, EventSet):
+            parent.flags |= _event_flags.get(name.rsplit(sep, 1)[-1], 0)
+    
+    def __getitem__(self, key):
+        """Return the subevent triggered on the changes of the data part 
+        selected by the key."""
+        try:
+            return self.subevents[repr(key)]
+        except KeyError:
+            sube = Event(repr(key), self, key=key)
+            self.subevents[repr(key)] = sube
+            return sube
+        
     def unsubscribe(self, obj):
-        self.pool.remove(obj)
+        del self.pool[obj]
 
     def subscribe(self, obj):
-        self.pool.add(obj)
+        self.pool[obj] = None
         
     def trigger(self):
         ddic['sim'].trigger(self)
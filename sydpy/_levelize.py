@@ -0,0 +1,225 @@
+#  This file is part of sydpy.
+#
+#  Copyright (C) 2014-2015 Bogdan Vukobratovic
+#
+#  sydpy is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation, either version 2.1
+#  of the License, or (at your option) any later version.
+#
+#  sydpy is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General
+#  Public License along with sydpy.  If not, see
+#  <http://www.gnu.org/licenses/>.
+
+"""Module implements the levelized schedule of the combinational processes
+for the cycle-based simulation mode."""
+
+from sydpy.intfs.intf import Intf
+from sydpy._run_queue import RunQueue
+
+class CombLoopError(Exception):
+    """Raised when the combinational processes cannot be levelized."""
+    pass
+
+def _source(intf):
+    """Return the interface that actually holds the value of the connected
+    interface."""
+    while isinstance(getattr(intf, '_sig', None), Intf):
+        intf = intf._sig
+
+    return intf
+
+def levelize(procs):
+    """Sort the combinational processes by their dependencies.
+
+    Process depends on the other process if it is sensitive to some of the
+    interfaces the other process writes to. Returns the list of levels,
+    where each level is the list of processes that depend only on the
+    processes from the previous levels. Within a level, the processes keep
+    the order of the procs argument. Raises CombLoopError if the
+    dependencies contain a loop.
+    """
+
+    drivers = {}
+    for p in procs:
+        for intf in p.outputs:
+            drivers.setdefault(_source(intf), []).append(p)
+
+    succ = {p: [] for p in procs}
+    npred = {p: 0 for p in procs}
+
+    for p in procs:
+        preds = set()
+        for intf in p.senslist:
+            for d in drivers.get(_source(intf), ()):
+                if d is not p:
+                    preds.add(d)
+
+        for d in preds:
+            succ[d].append(p)
+
+        npred[p] = len(preds)
+
+    levels = []
+    cur = [p for p in procs if not npred[p]]
+    order = {p: i for i, p in enumerate(procs)}
+    done = 0
+
+    while cur:
+        levels.append(cur)
+        done += len(cur)
+        nxt = []
+        for p in cur:
+            for s in succ[p]:
+                npred[s] -= 1
+                if not npred[s]:
+                    nxt.append(s)
+
+        cur = sorted(nxt, key=order.__getitem__)
+
+    if done != len(procs):
+        loop = [p.name for p in procs if npred[p]]
+        raise CombLoopError("Combinational loop through processes: {0}".format(', '.join(loop)))
+
+    return levels
+
+class CombSens(object):
+    """Subscription of a levelized process to its sensitivity list. Instead
+    of waking up the process, it marks it for evaluation in the next sweep."""
+
+    def __init__(self, sched, proc):
+        self.sched = sched
+        self.proc = proc
+
+    def resolve(self, pool):
+        self.sched.mark(self.proc)
+
+class _Deferred(object):
+    """Event triggered within the sweep, whose waiters other than the 
+    levelized processes are resolved by the simulator afterwards, in the 
+    same delta cycle as in the event-driven mode."""
+
+    def __init__(self, event):
+        self.event = event
+
+    def resolve(self, pool):
+        for s in self.event.pool:
+            if s.__class__ is CombSens:
+                continue
+
+            if hasattr(s, 'resolve'):
+                s.resolve(pool)
+            else:
+                pool.add(s)
+
+class CycleSchedule(object):
+    """Levelized schedule of the combinational processes.
+
+    After the signals are updated at the end of a delta cycle, the
+    simulator calls sweep(), which evaluates all the marked combinational
+    processes level by level, updating the signals after each level. The
+    combinational logic thus settles within a single delta cycle, with
+    each process evaluated at most once, instead of iterating the delta
+    cycles until nothing changes.
+
+    The process functions are called directly, like the functions of the
+    method processes, hence they must not block.
+    """
+
+    def __init__(self, sim, procs):
+        self.sim = sim
+        self.levels = levelize(procs)
+        self._dirty = [RunQueue() for _ in self.levels]
+        self._lowest = len(self.levels)
+        self._deferred = []
+        self.sweeps = 0
+        self.evals = 0
+
+        for i, level in enumerate(self.levels):
+            for p in level:
+                p.level = i
+                p.comb_sens = CombSens(self, p)
+                for e in p.senslist:
+                    e.subscribe(p.comb_sens)
+
+    def __len__(self):
+        return sum(len(level) for level in self.levels)
+
+    def mark(self, proc):
+        """Mark the process for evaluation in the sweep."""
+        self._dirty[proc.level].add(proc)
+        if proc.level < self._lowest:
+            self._lowest = proc.level
+
+    def _resolve(self):
+        """Mark the levelized processes waiting on the triggered events. The 
+        events having other waiters are collected in _deferred."""
+        sim = self.sim
+        trig_pool = sim.trig_pool
+
+        while trig_pool:
+            triggered = trig_pool.swap()
+            sim.event_total += len(triggered)
+            for trig in triggered:
+                others = False
+                for s in trig.pool:
+                    if s.__class__ is CombSens:
+                        s.resolve(None)
+                    else:
+                        others = True
+
+                if others:
+                    self._deferred.append(_Deferred(trig))
+
+    def _defer(self):
+        """Hand the events with the waiters outside of the sweep back to the 
+        simulator, to be resolved at the end of the next evaluation."""
+        self.sim.trig_pool.update(self._deferred)
+        self._deferred.clear()
+
+    def sweep(self):
+        """Evaluate the marked processes in the order of levels."""
+
+        sim = self.sim
+        nlevels = len(self.levels)
+
+        self._resolve()
+
+        if self._lowest == nlevels:
+            self._defer()
+            return
+
+        self.sweeps += 1
+        last = -1
+        backtracks = 0
+
+        while self._lowest < nlevels:
+            i = self._lowest
+            self._lowest = i + 1
+            dirty = self._dirty[i]
+
+            if not dirty:
+                continue
+
+            # A process got marked at a level that has already been swept,
+            # due to a dependency not visible from the process code.
+            if i <= last:
+                backtracks += 1
+                if backtracks > sim.max_delta_count:
+                    raise Exception("Combinational logic did not settle in {0} passes".format(sim.max_delta_count))
+
+            last = i
+
+            for proc in dirty.swap():
+                self.evals += 1
+                sim._call_method(proc)
+
+            sim._update()
+            self._resolve()
+
+        self._defer()
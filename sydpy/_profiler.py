@@ -0,0 +1,200 @@
+#  This file is part of sydpy.
+#
+#  Copyright (C) 2014-2015 Bogdan Vukobratovic
+#
+#  sydpy is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation, either version 2.1
+#  of the License, or (at your option) any later version.
+#
+#  sydpy is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General
+#  Public License along with sydpy.  If not, see
+#  <http://www.gnu.org/licenses/>.
+
+"""Module implements the KernelProfiler class"""
+
+import json
+import time
+from itertools import islice
+
+from sydpy.component import sep
+
+_ACTIVATIONS, _WALL, _CPU, _EVENTS, _UPDATES = range(5)
+
+class KernelProfiler(object):
+    """Profiler of the simulation kernel.
+
+    Once attached to the simulator, the kernel runs each process activation
+    through the profiler, which records for each process:
+
+        activations - Number of the activations
+        wall        - Wall time spent within the process, in seconds
+        cpu         - CPU time spent within the process, in seconds
+        events      - Number of the events the process triggered, either 
+                      directly or by the signal updates it requested
+        updates     - Number of the signal updates the process requested
+
+    Additionally, the number of delta cycles in each timestep is collected
+    into a histogram. Nothing is measured while the profiler is detached.
+    """
+
+    def __init__(self, sim=None):
+        self.sim = None
+        self.reset()
+
+        if sim is not None:
+            self.attach(sim)
+
+    def reset(self):
+        """Clear all the collected data."""
+        self.procs = {}
+        self.delta_hist = {}
+        # Records of the processes that requested the pending signal 
+        # updates, by the id of the signal
+        self._writers = {}
+
+    def attach(self, sim):
+        """Start profiling the simulator kernel."""
+        self.sim = sim
+        sim.profiler = self
+        sim.events['timestep_end'].append(self._timestep_end)
+
+    def detach(self):
+        """Stop profiling the simulator kernel."""
+        sim = self.sim
+        if sim is not None:
+            sim.profiler = None
+            if self._timestep_end in sim.events['timestep_end']:
+                sim.events['timestep_end'].remove(self._timestep_end)
+
+        self.sim = None
+
+    def _timestep_end(self, time, sim):
+        self.delta_hist[sim.delta_count] = self.delta_hist.get(sim.delta_count, 0) + 1
+        return self.sim is sim
+
+    def measure(self, proc, func, *args, **kwargs):
+        """Call the function on behalf of the process and record the
+        measurements. Returns the value returned by the function."""
+
+        sim = self.sim
+        trig_len = len(sim.trig_pool)
+        update_len = len(sim.update_pool)
+        cpu = time.process_time()
+        wall = time.perf_counter()
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+
+            rec = self.procs.get(proc.name)
+            if rec is None:
+                rec = self.procs[proc.name] = [0, 0.0, 0.0, 0, 0]
+
+            rec[_ACTIVATIONS] += 1
+            rec[_WALL] += wall
+            rec[_CPU] += cpu
+            rec[_EVENTS] += len(sim.trig_pool) - trig_len
+            rec[_UPDATES] += len(sim.update_pool) - update_len
+
+            for sig in islice(sim.update_pool, update_len, None):
+                self._writers[id(sig)] = rec
+
+    def update(self, sigs):
+        """Update the signals on behalf of the simulator, and attribute the 
+        events triggered by each update to the process that requested it."""
+
+        trig_pool = self.sim.trig_pool
+        writers = self._writers
+
+        for s in sigs:
+            trig_len = len(trig_pool)
+            s._update()
+            rec = writers.get(id(s))
+            if rec is not None:
+                rec[_EVENTS] += len(trig_pool) - trig_len
+
+        writers.clear()
+
+    def _rec_dict(self, rec):
+        return {
+                'activations'   : rec[_ACTIVATIONS],
+                'wall'          : rec[_WALL],
+                'cpu'           : rec[_CPU],
+                'events'        : rec[_EVENTS],
+                'updates'       : rec[_UPDATES],
+                }
+
+    def process_stats(self):
+        """Return the measurements for each process by its qualified name."""
+        return {name: self._rec_dict(rec) for name, rec in self.procs.items()}
+
+    def component_stats(self):
+        """Return the measurements rolled up by the qualified names of the
+        components. The figures of each component include the figures of
+        all the processes within its hierarchy."""
+
+        comps = {}
+        for name, rec in self.procs.items():
+            path = name.split(sep)[:-1]
+            for i in range(1, len(path) + 1):
+                qname = sep.join(path[:i])
+                total = comps.get(qname)
+                if total is None:
+                    total = comps[qname] = [0, 0.0, 0.0, 0, 0]
+
+                for j, val in enumerate(rec):
+                    total[j] += val
+
+        return {name: self._rec_dict(rec) for name, rec in comps.items()}
+
+    def delta_histogram(self):
+        """Return the dictionary mapping the number of delta cycles to the
+        number of timesteps that took that many delta cycles."""
+        return dict(sorted(self.delta_hist.items()))
+
+    def to_json(self, path=None):
+        """Return the collected data as the JSON string, and write it to the
+        file if the path is supplied."""
+
+        out = json.dumps({
+                          'processes'       : self.process_stats(),
+                          'components'      : self.component_stats(),
+                          'delta_histogram' : {str(k): v for k, v in self.delta_histogram().items()},
+                          }, indent=4, sort_keys=True)
+
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(out)
+
+        return out
+
+    def to_folded(self, path=None, metric='wall'):
+        """Return the measurements in the folded stack format used by the
+        flamegraph tools, and write them to the file if the path is supplied.
+        The stacks follow the component hierarchy. Time metrics are given
+        in microseconds."""
+
+        index = {'activations': _ACTIVATIONS, 'wall': _WALL, 'cpu': _CPU,
+                 'events': _EVENTS, 'updates': _UPDATES}[metric]
+        scale = 1000000 if index in (_WALL, _CPU) else 1
+
+        lines = []
+        for name, rec in sorted(self.procs.items()):
+            lines.append("{0} {1}".format(';'.join(name.split(sep)),
+                                          int(round(rec[index]*scale))))
+
+        out = '\n'.join(lines) + '\n'
+
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(out)
+
+        return out
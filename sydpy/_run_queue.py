@@ -0,0 +1,89 @@
+#  This file is part of sydpy.
+#
+#  Copyright (C) 2014-2015 Bogdan Vukobratovic
+#
+#  sydpy is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation, either version 2.1
+#  of the License, or (at your option) any later version.
+#
+#  sydpy is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General
+#  Public License along with sydpy.  If not, see
+#  <http://www.gnu.org/licenses/>.
+
+"""Module implements RunQueue class"""
+
+import itertools
+
+# Each queue stamps the objects under its own attribute name, drawn from this 
+# counter, so that adding an object to one queue does not erase its stamp 
+# from another.
+_queue_ids = itertools.count()
+
+class RunQueue(object):
+    """Ordered set of objects (processes, events or signals) the kernel
+    needs to handle in the current delta cycle.
+
+    Objects are kept in the order they were added. Instead of hashing,
+    the duplicates are detected by stamping each added object with the
+    generation of the queue, in the attribute private to the queue. Taking 
+    the batch out of the queue starts a new generation, hence every object 
+    can be added again. The two underlying lists are swapped and reused 
+    between the batches.
+    """
+
+    def __init__(self):
+        self._items = []
+        self._spare = []
+        self._stamp = '_rq_gen{0}'.format(next(_queue_ids))
+        self._gen = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __contains__(self, obj):
+        return getattr(obj, self._stamp, None) == self._gen
+
+    def add(self, obj):
+        """Add the object to the queue, unless it is already in it."""
+        stamp = self._stamp
+        if getattr(obj, stamp, None) == self._gen:
+            return
+
+        setattr(obj, stamp, self._gen)
+        self._items.append(obj)
+
+    def update(self, objs):
+        """Add all the objects from the iterable to the queue."""
+        for obj in objs:
+            self.add(obj)
+
+    def swap(self):
+        """Take out the current batch of objects and start a new generation.
+
+        The returned list is handed back to the queue on the next swap, so
+        it should be consumed before that.
+        """
+        items = self._items
+        spare = self._spare
+        spare.clear()
+        self._items = spare
+        self._spare = items
+        self._gen += 1
+        return items
+
+    def clear(self):
+        """Remove all objects from the queue."""
+        self._items.clear()
+        self._gen += 1
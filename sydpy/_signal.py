@@ -15,13 +15,14 @@
 #  You should have received a copy of the GNU Lesser General 
 #  Public License along with sydpy.  If not, see 
 #  <http://www.gnu.org/licenses/>.
-from sydpy._event import EventSet, Event
-import copy
+from sydpy._event import EventSet, Event, EV_UPDATED, EV_CHANGED, \
+    EV_EVENT_DEF, EV_POSEDGE, EV_NEGEDGE
 from sydpy import ddic
 
 """Module implements Signal class"""
 
 from sydpy._delay import Delay 
+from collections import deque
 from enum import Enum
 
 class SignalMem(Enum):
@@ -39,22 +40,95 @@ class SignalType(Enum):
 class SignalQueueEmpty(Exception):
     pass
 
+class SignalQueueFull(Exception):
+    pass
+
+def _freeze(val):
+    try:
+        if not val._frozen:
+            val._freeze()
+    except AttributeError:
+        pass
+    
+    return val
+
+def _freeze_conv(dtype, val):
+    """Convert val to dtype and freeze it for sharing. The unfrozen value 
+    already of the dtype is replaced by its frozen copy, so that the 
+    caller's value stays mutable."""
+    conv = dtype.conv(val)
+    
+    if conv._frozen:
+        return conv
+    elif conv is val:
+        return val._frozen_copy()
+    else:
+        return conv._freeze()
+
+def _trigger_change(e, flags, val, next_val):
+    """Trigger the events from the event set e, that are caused by the 
+    change of the signal value from val to next_val."""
+    
+    if flags & EV_CHANGED:
+        e['changed'].trigger()
+        
+    if flags & EV_EVENT_DEF:
+        event_def = e['event_def']
+        event_def.trigger()
+        
+        if event_def.subevents:
+            _trigger_subevents(event_def.subevents, val, next_val)
+
+    if flags & (EV_POSEDGE | EV_NEGEDGE):
+        if not val and next_val and (val is not None):
+            if flags & EV_POSEDGE:
+                e['posedge'].trigger()
+        elif not next_val and val:
+            if flags & EV_NEGEDGE:
+                e['negedge'].trigger()
+
+def _trigger_subevents(subevents, val, next_val):
+    try:
+        # For bit values, the changed bits are found at once
+        diff = (val.val ^ next_val.val) | (val.vld ^ next_val.vld)
+    except AttributeError:
+        diff = None
+    
+    # Keys of the packed aggregates select the fields instead of the bits 
+    key_mask = getattr(next_val, '_key_mask', None)
+    
+    for sube in subevents.values():
+        mask = sube.mask if key_mask is None else key_mask(sube.key)
+        
+        if (diff is not None) and (mask is not None):
+            if diff & mask:
+                sube.trigger()
+        elif val.__getitem__(sube.key) != next_val.__getitem__(sube.key):
+            sube.trigger()
+
 class Signal(object):
     """Signal is smallest unit that provides evaluate-update mechanism for data."""
     
-    def __init__(self, val=None, event_set=None, trace=False): 
+    def __init__(self, val=None, event_set=None, trace=False, capacity=None, high_water=None): 
         """"Create a new Signal.
         
-        val       - Initialize signal with a value.
-        event_set - The set of events the signal trggers.
-        trace     - Should signal register for tracing or not.
+        val        - Initialize signal with a value.
+        event_set  - The set of events the signal trggers.
+        trace      - Should signal register for tracing or not.
+        capacity   - Maximum number of the values in the signal queue. The 
+                     queue is unbounded if None.
+        high_water - Number of the queued values at which the 'full' event 
+                     is triggered. Defaults to the capacity. The 'empty' 
+                     event is triggered when the queue is drained.
         """
         
         self._tracing = trace
         self.traces = None
-        self.mem = []
-        self._val = copy.deepcopy(val)
-        self._next = copy.deepcopy(val)
+        self.mem = deque()
+        self.capacity = capacity
+        self.high_water = high_water if high_water is not None else capacity
+        self._val = _freeze(val)
+        self._next = self._val
         
         self.e = event_set
     
@@ -66,9 +140,9 @@ class Signal(object):
         for the value to become available."""
         
         if not self.mem:
-            ddic['sim'].wait(self.e.enqueued)
+            ddic['sim'].wait(self.e['enqueued'])
         
-        self._next = self.mem.pop(0)
+        self._next = self._dequeue()
         ddic['sim'].update(self)
         ddic['sim'].wait(self.e['updated'])
             
@@ -79,28 +153,91 @@ class Signal(object):
         SignalQueueEmpty exception. """
         
         if self.mem:
-            self._next = self.mem.pop(0)
+            self._next = self._dequeue()
             ddic['sim'].update(self)
             return self._next
         else:
             raise SignalQueueEmpty
 
+    def pop_many(self, n=None):
+        """Pop up to n values from the signal queue, or all of them if n is 
+        None, and return them in a list. The signal is updated to the last 
+        popped value. If the queue is empty, trigger SignalQueueEmpty 
+        exception."""
+        
+        mem = self.mem
+        
+        if not mem:
+            raise SignalQueueEmpty
+        
+        if (n is None) or (n >= len(mem)):
+            vals = list(mem)
+            mem.clear()
+        else:
+            vals = [mem.popleft() for _ in range(n)]
+        
+        if (not mem) and ('empty' in self.e.comp):
+            self.e['empty'].trigger()
+        
+        self._next = vals[-1]
+        ddic['sim'].update(self)
+        return vals
+
+    def _dequeue(self):
+        val = self.mem.popleft()
+        
+        if (not self.mem) and ('empty' in self.e.comp):
+            self.e['empty'].trigger()
+        
+        return val
+
     def bpush(self, val):
-        """Push value to signal queue only if the queue is empty. Do not 
-        trigger the update."""
+        """Push value to signal queue only if the queue is empty, or if it 
+        is bounded, only if it is not full. Do not trigger the update."""
         
-        while self.mem:
-            ddic['sim'].wait(self.e['updated'])
+        if self.capacity is None:
+            while self.mem:
+                ddic['sim'].wait(self.e['updated'])
+        else:
+            while len(self.mem) >= self.capacity:
+                ddic['sim'].wait(self.e['updated'])
         
         self.push(val)
            
     def push(self, val):
-        """Push value to signal queue without triggering the update."""
+        """Push value to signal queue without triggering the update. If the
+        queue is full, trigger SignalQueueFull exception."""
+        
+        if (self.capacity is not None) and (len(self.mem) >= self.capacity):
+            raise SignalQueueFull
         
         self.mem.append(val)
+        self._enqueued()
+    
+    def push_many(self, vals):
+        """Push the values to signal queue without triggering the update. If 
+        the values do not fit into the queue, none is pushed and 
+        SignalQueueFull exception is triggered."""
+        
+        vals = list(vals)
+        
+        if (self.capacity is not None) and (len(self.mem) + len(vals) > self.capacity):
+            raise SignalQueueFull
+        
+        if vals:
+            self.mem.extend(vals)
+            self._enqueued(len(vals))
+    
+    def _enqueued(self, num=1):
         if 'enqueued' in self.e.comp:
             self.e['enqueued'].trigger()
         
+        if self.high_water is not None:
+            # Trigger only when the high-water mark is crossed
+            if len(self.mem) - num < self.high_water <= len(self.mem):
+                if 'full' in self.e.comp:
+                    self.e['full'].trigger()
+        
     def write(self, val):
         """Write a new value to the signal."""
         self._next = val
@@ -119,34 +256,19 @@ class Signal(object):
     def _update(self):
         """Callback called by simulator if signal registered for update cycle."""
         next_val = self._next
-            
         val = self._val
+        flags = self.e.flags
         
-        if 'updated' in self.e.comp:
+        if flags & EV_UPDATED:
             self.e['updated'].trigger()
         
         if val != next_val:
-            
-            if 'changed' in self.e.comp:
-                self.e['changed'].trigger()
-                
-            if 'event_def' in self.e.comp:
-                self.e['event_def'].trigger()
-                
-                for _, sube in self.e['event_def'].subevents.items():
-                    key = sube.key
-                    
-                    if val.__getitem__(key) != next_val.__getitem__(key):
-                        sube.trigger()
-
-            if not val and next_val and (val is not None):
-                if 'posedge' in self.e.comp:
-                    self.e['posedge'].trigger()
-            elif not next_val and val:
-                if 'negedge' in self.e.comp:
-                    self.e['negedge'].trigger()
-
-            self._val = copy.deepcopy(next_val)
+            if flags:
+                _trigger_change(self.e, flags, val, next_val)
+
+            # The value is committed by reference, and frozen so that it 
+            # cannot be modified in place while shared 
+            self._val = _freeze(next_val)
     
 #     def _create_event(self, event):
 #         if event not in self.e.events:
@@ -0,0 +1,215 @@
+#  This file is part of sydpy.
+#
+#  Copyright (C) 2014-2015 Bogdan Vukobratovic
+#
+#  sydpy is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation, either version 2.1
+#  of the License, or (at your option) any later version.
+#
+#  sydpy is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General
+#  Public License along with sydpy.  If not, see
+#  <http://www.gnu.org/licenses/>.
+
+"""Module implements the SignalBank class"""
+
+from array import array
+
+from sydpy import ddic
+from sydpy._delay import Delay
+from sydpy._event import EV_UPDATED
+from sydpy._signal import _freeze, _trigger_change
+from sydpy.types.bit import bit
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class SignalBank(object):
+    """Storage for a number of signals of the same bit type.
+
+    The current and the next values of all the signals are kept in four
+    flat buffers (value and validity bits, current and next), instead of
+    in a Signal object per signal. The bank registers for the update cycle
+    once per delta cycle, no matter how many of its signals were written,
+    and triggers the events only of the signals whose values have changed.
+    If NumPy is available, the changed signals are found by a single
+    vectorized compare of the buffers.
+
+    The signals of the bank carry no queue, i.e. they support only reads
+    and writes.
+    """
+
+    def __init__(self, dtype, size, dflt=None):
+        """"Create a new SignalBank.
+
+        dtype - Bit type of the signals.
+        size  - Number of the signals.
+        dflt  - Initial value of the signals.
+        """
+        if not (isinstance(dtype, type) and issubclass(dtype, bit)):
+            raise TypeError("Signal bank supports only the bit types.")
+
+        self.dtype = dtype
+        self.size = size
+
+        dflt = dtype.conv(dflt)
+
+        if dtype.w <= 64:
+            buf = lambda v: array('Q', [v])*size
+        else:
+            buf = lambda v: [v]*size
+
+        self._val = buf(dflt.val)
+        self._vld = buf(dflt.vld)
+        self._next_val = buf(dflt.val)
+        self._next_vld = buf(dflt.vld)
+
+        if (numpy is not None) and (dtype.w <= 64):
+            # Views share the memory with the buffers
+            self._views = [numpy.frombuffer(b, dtype=numpy.uint64) for b in
+                           (self._val, self._vld, self._next_val, self._next_vld)]
+        else:
+            self._views = None
+
+        # Cache of the value objects returned by the reads
+        self._objs = {}
+        # Dict is used as an ordered set of the written signals
+        self._written = {}
+        self.sigs = [BankSignal(self, i) for i in range(size)]
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        return self.sigs[index]
+
+    def attach(self, intfs):
+        """Make the signals of the bank drive the interfaces, one signal per
+        interface. The signals trigger the events of the interfaces."""
+
+        if len(intfs) > self.size:
+            raise ValueError("Signal bank has only {0} signals".format(self.size))
+
+        for sig, intf in zip(self.sigs, intfs):
+            sig.e = intf.e
+            intf._sig = sig
+            intf._sourced = True
+
+    def _read(self, index):
+        try:
+            return self._objs[index]
+        except KeyError:
+            obj = self._objs[index] = _freeze(self.dtype(self._val[index], self._vld[index]))
+            return obj
+
+    def _read_next(self, index):
+        return self.dtype(self._next_val[index], self._next_vld[index])
+
+    def _write(self, index, val):
+        val = self.dtype.conv(val)
+        self._next_val[index] = val.val
+        self._next_vld[index] = val.vld
+
+        if not self._written:
+            ddic['sim'].update(self)
+
+        self._written[index] = None
+
+    def _update(self):
+        """Callback called by simulator if bank registered for update cycle."""
+
+        sigs = self.sigs
+        objs = self._objs
+        written = self._written
+        self._written = {}
+
+        for i in written:
+            e = sigs[i].e
+            if (e is not None) and (e.flags & EV_UPDATED):
+                e['updated'].trigger()
+
+        val, vld, next_val, next_vld = self._val, self._vld, self._next_val, self._next_vld
+
+        if self._views is not None:
+            v_val, v_vld, v_next_val, v_next_vld = self._views
+            changed = numpy.flatnonzero((v_val != v_next_val) | (v_vld != v_next_vld)).tolist()
+        else:
+            changed = sorted(i for i in written
+                             if (val[i] != next_val[i]) or (vld[i] != next_vld[i]))
+
+        for i in changed:
+            e = sigs[i].e
+            flags = e.flags if e is not None else 0
+
+            if flags & ~EV_UPDATED:
+                old = self._read(i)
+                new = objs[i] = _freeze(self.dtype(next_val[i], next_vld[i]))
+                _trigger_change(e, flags, old, new)
+            else:
+                objs.pop(i, None)
+
+            if self._views is None:
+                val[i] = next_val[i]
+                vld[i] = next_vld[i]
+
+        if self._views is not None:
+            # All the values are committed at once
+            numpy.copyto(v_val, v_next_val)
+            numpy.copyto(v_vld, v_next_vld)
+
+    def state(self):
+        """Return the copy of the bank values."""
+        return ([b[:] for b in (self._val, self._vld, self._next_val, self._next_vld)],
+                dict(self._written))
+
+    def restore(self, state):
+        """Set the bank values from the copy returned by state()."""
+        bufs, written = state
+        for b, s in zip((self._val, self._vld, self._next_val, self._next_vld), bufs):
+            b[:] = s
+
+        self._objs = {}
+        self._written = dict(written)
+
+class BankSignal(object):
+    """Single signal of the SignalBank. Provides the reading and writing
+    part of the Signal interface."""
+
+    __slots__ = ['bank', 'index', 'e']
+
+    def __init__(self, bank, index, event_set=None):
+        self.bank = bank
+        self.index = index
+        self.e = event_set
+
+    @property
+    def _val(self):
+        return self.bank._read(self.index)
+
+    @property
+    def _next(self):
+        return self.bank._read_next(self.index)
+
+    def read(self):
+        return self.bank._read(self.index)
+
+    def write(self, val):
+        """Write a new value to the signal."""
+        self.bank._write(self.index, val)
+
+    def write_after(self, val, delay):
+        """Write a new value to the signal after a certain delay."""
+        if delay:
+            ddic['sim'].wait(Delay(delay))
+
+        self.write(val)
+
+    def get_queue(self):
+        return []
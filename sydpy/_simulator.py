@@ -24,6 +24,7 @@ import inspect
 from sydpy._util._injector import features, RequiredVariable  # @UnresolvedImport
 from sydpy._util._util import class_load, unif_enum, factory
 from sydpy._configurator import Configurator
+from sydpy._delay_queue import DelayQueue
 
 from greenlet import greenlet
 
@@ -50,12 +51,12 @@ def simtrig(event):
 def simdelay_add(proc, time):
     """Register process to be scheduled for execution after given time."""
     sim = RequiredVariable('Simulator')
-    sim.delay_pool[proc] = time + sim.time
+    sim.delay_pool.push(proc, time + sim.time)
     
 def simdelay_pop(proc):
     """Remove process from the delay schedule."""
     sim = RequiredVariable('Simulator')
-    sim.delay_pool.pop(proc, None)
+    sim.delay_pool.cancel(proc)
     
 def simproc_reg(proc):
     """Register a process with the simulator."""
@@ -297,7 +298,7 @@ class Simulator(object):
     def _initialize(self):
         
         self.max_time = None
-        self.delay_pool = {}
+        self.delay_pool = DelayQueue()
         self.trig_pool = set()
         self.update_pool = set()     
         self._ready_pool = set()
@@ -361,28 +362,19 @@ class Simulator(object):
         """Advanced time to the earliest scheduled process in delay pool and 
         return True, or return False if there are no more scheduled processes"""
         
-        if self.delay_pool:
-            t_new = None
-            
-            while self.delay_pool:
-                w = min(self.delay_pool, key=self.delay_pool.get)
-                if not t_new:
-                    t_new = self.delay_pool[w]
-                elif self.delay_pool[w] > t_new:
-                    break
-                    
-                self.delay_pool.pop(w)
-                self._ready_pool.add(w)
+        next_delay = self.delay_pool.pop_next()
 
-            self.time = t_new
-            self.delta_count = 0
-            
-            if self.time > self.max_time:
-                return False
-            else:
-                return True
-        else:
+        if next_delay is None:
             return False
+
+        self.time, procs = next_delay
+        self._ready_pool.update(procs)
+        self.delta_count = 0
+
+        if self.time > self.max_time:
+            return False
+        else:
+            return True
         
     def _finalize(self):
         """Call the exit functions of all processes."""
@@ -85,7 +85,7 @@ class Component:
                     yield c
                     
                 if depth:
-                    yield from c.search(pattern, pattern_relative=False, depth=depth-1)
+                    yield from c.search(pattern, of_type, depth-1, pattern_relative=False)
     
 #     def __getattr__(self, name):
 #         try:
@@ -23,6 +23,7 @@ import os
 from sydpy._util._injector import RequiredVariable, features  # @UnresolvedImport
 from sydpy import __version__ #, EnumItemType
 from sydpy._component import component_visitor
+from sydpy.types.bit import bit, bitstr_many
 
 class VCDTracer(object):
     
@@ -121,9 +122,7 @@ class VCDTracer(object):
         self.tf.write("b{0} {1}".format(bin(self._val, self._nrbits), self._code))
     
     def write_traces(self, time, sim):
-        for t in self.trace_list:
-            if t.changed():
-                t.print_val()
+        self.write_changed_traces()
                 
         return True
     
@@ -131,11 +130,29 @@ class VCDTracer(object):
         if delta_count:
             self.write_timestamp(time + delta_count/self.max_delta_count, sim)
                                 
-            for t in self.trace_list:
-                if t.changed():
-                    t.print_val()
+            self.write_changed_traces()
                 
         return True            
+    
+    def write_changed_traces(self):
+        """Write the values of all the changed traces at once. The bit values 
+        are formatted together by a single bitstr_many() call."""
+        lines = []
+        bit_traces = []
+        
+        for t in self.trace_list:
+            if t.changed():
+                t._val = t._producer.trace_val(t._name)
+                
+                if isinstance(t._val, bit):
+                    bit_traces.append(t)
+                else:
+                    lines.append(t._val_line())
+        
+        for t, digits in zip(bit_traces, bitstr_many([t._val for t in bit_traces])):
+            lines.append("b{0} {1}\n".format(digits, t._code))
+        
+        self.vcdfile.write(''.join(lines))
 
     def flush(self, sim):
         self.vcdfile.close()
@@ -209,12 +226,15 @@ class VCDTrace():
             self._print_val()
         
     def _print_val(self):
+        self._tracer.vcdfile.write(self._val_line())
+        
+    def _val_line(self):
         if isinstance(self._val, bool):
-            self._tracer.vcdfile.write("b{0} {1}\n".format(int(self._val), self._code))
+            return "b{0} {1}\n".format(int(self._val), self._code)
         elif hasattr(self._val, 'bitstr'):
-            self._tracer.vcdfile.write("b{0} {1}\n".format(self._val.bitstr(), self._code))
+            return "b{0} {1}\n".format(self._val.bitstr()[2:], self._code)
         else: # default to 'string'
-            self._tracer.vcdfile.write("s{0} {1}\n".format(str(self._val).replace(' ', '').replace("'", ""), self._code))
+            return "s{0} {1}\n".format(str(self._val).replace(' ', '').replace("'", ""), self._code)
     
     def print_var_declaration(self):
         name = self._name = self._name.replace(':','_').replace('[', '_').replace(']', '')
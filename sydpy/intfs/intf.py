@@ -238,20 +238,19 @@ class SlicedIntf(_IntfBase):
     
     def write(self, val):
         next_val = self.__parent.read_next()
-        next_val[self.__keys] = val
-        return self.__parent.write(next_val)
+        return self.__parent.write(next_val._replace(self.__keys, val))
     
     def unsubscribe(self, proc, event=None):
         if event is None:
-            self.__parent.e.event_def[self.__keys].unsubscribe(proc)
+            return self.__parent.e['event_def'][self.__keys].unsubscribe(proc)
         else:
-            getattr(self.__parent.e, event)[self.__keys].unsubscribe(proc)
+            return self.__parent.e[event][self.__keys].unsubscribe(proc)
         
     def subscribe(self, proc, event=None):
         if event is None:
-            return self.__parent.e.event_def[self.__keys].subscribe(proc)
+            return self.__parent.e['event_def'][self.__keys].subscribe(proc)
         else:
-            getattr(self.__parent.e, event)[self.__keys].subscribe(proc)
+            return self.__parent.e[event][self.__keys].subscribe(proc)
 #     def _hdl_gen_decl(self, lang=Hdlang.Verilog):
 #         raise Exception("Subproxy cannot declare a _signal!")
 #             
@@ -308,15 +307,15 @@ class Intf(Component, _IntfBase):
 
     def subscribe(self, proc, event=None):
         if event is None:
-            return self.e.event_def.subscribe(proc)
+            return self.e['event_def'].subscribe(proc)
         else:
-            return getattr(self.e, event).subscribe(proc)
+            return self.e[event].subscribe(proc)
 
     def unsubscribe(self, proc, event=None):
         if event is None:
-            return self.e.event_def.unsubscribe(proc)
+            return self.e['event_def'].unsubscribe(proc)
         else:
-            return getattr(self.e, event).subscribe(proc)
+            return self.e[event].unsubscribe(proc)
 
     def __str__(self):
         return str(self.read())
@@ -1,25 +1,25 @@
 from sydpy import compinit, ddic
-from sydpy._signal import Signal
+from sydpy._signal import Signal, SignalQueueEmpty, _freeze_conv
 from sydpy._event import EventSet, Event
 from sydpy.unit import Unit
 from sydpy.intfs.intf import Intf, SlicedIntf
-import copy
-from sydpy.types._type_base import convgen
 from sydpy.process import Process
 
 class isig(Intf):
     _intf_type = 'isig'
 
     @compinit
-    def __init__(self, name, parent, dtype, dflt=None):
+    def __init__(self, name, parent, dtype, dflt=None, capacity=None, high_water=None):
         super().__init__(name, parent)
         
+        self._capacity = capacity
+        self._high_water = high_water
         self._mch = None
         self._sch = None
         self._sig = None
         self._sourced = False
         self._dtype = dtype
-        self._dflt = self._dtype.conv(dflt)
+        self._dflt = _freeze_conv(self._dtype, dflt)
         self._sinks = set()
 #         self.inst("e", EventSet, missing_event_handle=self._missing_event)
         self.e = EventSet('e', self, missing_event_handle=self._missing_event)
@@ -39,20 +39,23 @@ class isig(Intf):
             
             self._sourced = True
         else:
-            self.inst('_p_dtype_convgen', Process, self._pfunc_dtype_convgen, [], pargs=(other,))
+            Process('_p_dtype_convgen', self, self._pfunc_dtype_convgen, senslist=[], pargs=(other,))
    
     
     def _pfunc_dtype_convgen(self, other):
+        # Partially converted value is completed by the next transaction
+        remain = None
+        
         while(1):
             data_recv = other.bpop()
-            data_conv_gen = convgen(data_recv, self._dtype)
+            data_conv_gen = self._dtype._convgen(data_recv, remain)
              
             try:
                 while True:
-                    self.bpush(next(data_conv_gen))
+                    data, _ = next(data_conv_gen)
+                    self.bpush(data)
             except StopIteration as e:
-                if e.value is not None:
-                    self.bpush(e.value)
+                remain = e.value
 
     def _drive(self, channel):
         self._mch = channel
@@ -66,10 +69,12 @@ class isig(Intf):
         except AttributeError:
             pass
         
-        val = self._get_dtype().conv(val)
+        # The written value gets shared with the readers
+        val = _freeze_conv(self._get_dtype(), val)
         
         if not self._sourced:
-            self._sig = Signal(val=copy.deepcopy(self._dflt), event_set = self.e)
+            self._sig = Signal(val=self._dflt, event_set = self.e, 
+                               capacity=self._capacity, high_water=self._high_water)
             self._sourced = True
             
         return val
@@ -82,28 +87,41 @@ class isig(Intf):
         val = self._prep_write(val)
         self._sig.push(val)
     
+    def push_many(self, vals):
+        vals = [self._prep_write(v) for v in vals]
+        self._sig.push_many(vals)
+        
     def write(self, val):
         val = self._prep_write(val)
         self._sig.write(val)
     
     def read_next(self):
         if not self._sourced:
-            return copy.deepcopy(self._dflt)
+            return self._dflt
         else:
             return self._sig._next
     
     def read(self):
         if not self._sourced:
-            return copy.deepcopy(self._dflt)
+            return self._dflt
         else:
             return self._sig.read()
-        
+
+    def trace_val(self, name=None):
+        return self.read()
+
     def bpop(self):
         if not self._sourced:
             ddic['sim'].wait(self.e['enqueued'])
             
         return self._sig.bpop()
     
+    def pop_many(self, n=None):
+        if not self._sourced:
+            raise SignalQueueEmpty
+        
+        return self._sig.pop_many(n)
+    
     def deref(self, key):
         return SlicedIntf(self, key)
     
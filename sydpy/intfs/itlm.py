@@ -1,7 +1,6 @@
 from sydpy.intfs.isig import isig
 from sydpy.process import Process
-import copy
-from sydpy._signal import Signal
+from sydpy._signal import Signal, _freeze_conv
 from sydpy.component import sydsys
 
 class Itlm(isig):
@@ -43,10 +42,11 @@ class Itlm(isig):
         except AttributeError:
             pass
         
-        val = self._dtype.conv(val)
+        val = _freeze_conv(self._dtype, val)
         
         if not self._sourced:
-            self._sig = Signal(val=copy.deepcopy(self._dflt), event_set = self.e)
+            self._sig = Signal(val=self._dflt, event_set = self.e, 
+                               capacity=self._capacity, high_water=self._high_water)
             self._sourced = True
             
         return val
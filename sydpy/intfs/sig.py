@@ -51,6 +51,9 @@ class sig(_Intf):
     def _rnd(self, rnd_var):
         return rnd_var._rnd(self._get_dtype())
     
+    def _rnd_many(self, rnd_var, n):
+        return rnd_var._rnd_many(self._get_dtype(), n)
+    
     def init(self, val):
         if val is not None:
             self._write('write', val)
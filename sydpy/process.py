@@ -1,17 +1,90 @@
 from greenlet import greenlet
 from sydpy.unit import Unit
 from sydpy._util._util import getio_vars
-from sydpy.component import Component, sydsys
+from sydpy.component import Component, sydsys, sep
 from sydpy import compinit, Dependency
 from sydpy.intfs.intf import Intf
+from sydpy._delay import Delay
+
+class BlockingCallError(Exception):
+    """Raised when a method process tries to block."""
+    pass
+
+def func_io_vars(func):
+    """Return the sets of interfaces read and written by the method of the 
+    component."""
+    
+#     parent_name = '.'.join(self.name.split('.')[:-1])
+#     qname_intfs = {c.name: c for c in system.search(parent_name + '.*', of_type=Intf)}
+    qname_intfs = {c.name: c for c in func.__self__.search(of_type=Intf)}
+    intfs = {}
+    for k,v in qname_intfs.items():
+        intfs[k.rsplit(sep, 1)[-1]] = v
+     
+    return getio_vars(func, intfs=intfs)
+
+class StaticSens(object):
+    """Permanent subscription of a process to its static sensitivity list.
+    
+    Instead of the process, the StaticSens object subscribes to the events 
+    from the sensitivity list, and stays subscribed between the process 
+    activations. It wakes up the process only while the process is armed, 
+    i.e. while it waits on its static sensitivity list.
+    """
+    
+    def __init__(self, proc, events):
+        self.proc = proc
+        self.events = events
+        self.subscribed = False
+        
+    def resolve(self, pool):
+        if self.proc.armed:
+            pool.add(self.proc)
+            
+    def arm(self):
+        """Subscribe to the events if not already subscribed, and arm the process."""
+        if not self.subscribed:
+            for e in self.events:
+                e.subscribe(self)
+            
+            self.subscribed = True
+            
+        self.proc.armed = True
+        
+    def release(self):
+        """Unsubscribe from the events and disarm the process."""
+        if self.subscribed:
+            for e in self.events:
+                e.unsubscribe(self)
+                
+            self.subscribed = False
+            
+        self.proc.armed = False
 
 class Process(Component, greenlet):
     """Wrapper class for functions that implement processes in user modules.
     
-    Class turns function in the greenlet task.""" 
+    Class turns function in the greenlet task.
+    
+    If the sensitivity list contains no delays, the process is by default 
+    made statically sensitive: it stays subscribed to the events from the 
+    sensitivity list for the whole simulation, which spares the kernel from 
+    unsubscribing and resubscribing it on each activation. Pass static=False
+    to turn this off.
+    
+    If the sensitivity list is derived from the code of the function, the 
+    sets of interfaces the function reads and writes are kept in the inputs 
+    and outputs attributes.""" 
+
+    armed = False
+    static_sens = None
+    is_method = False
+    inputs = None
+    outputs = None
+    activations = 0
 
     @compinit
-    def __init__(self, name, parent, func, sim : Dependency('sim'), senslist=None, pargs = (), pkwargs = {}, **kwargs):
+    def __init__(self, name, parent, func, sim : Dependency('sim'), senslist=None, pargs = (), pkwargs = {}, static=True, **kwargs):
         self.func = func
 
         self.senslist = senslist
@@ -21,25 +94,27 @@ class Process(Component, greenlet):
 
         if self.senslist is None:
             if func.__self__:
-#                 parent_name = '.'.join(self.name.split('.')[:-1])
-#                 qname_intfs = {c.name: c for c in system.search(parent_name + '.*', of_type=Intf)}
-                qname_intfs = {c.name: c for c in func.__self__.search(of_type=Intf)}
-                intfs = {}
-                for k,v in qname_intfs.items():
-                    intfs[k.rsplit('.', 1)[1]] = v
-                 
-                (inputs, outputs) = getio_vars(func, intfs=intfs)
+                (self.inputs, self.outputs) = func_io_vars(func)
+                self.senslist = self.inputs - self.outputs
+
+        if self.senslist:
+            self.senslist = tuple(self.senslist)
             
-                self.senslist = inputs - outputs
+            if static and not any(isinstance(e, Delay) for e in self.senslist):
+                self.static_sens = StaticSens(self, self.senslist)
 
         self._exit_func = None 
         self.sim.proc_reg(self)
         greenlet.__init__(self)
     
     def run(self):
-        if self.senslist:
+        if self.static_sens is not None:
             while(1):
-                self.sim.wait(*list(self.senslist))
+                self.sim.wait_sens(self.static_sens)
+                self.func(*self.pargs, **self.pkwargs)
+        elif self.senslist:
+            while(1):
+                self.sim.wait(*self.senslist)
                 self.func(*self.pargs, **self.pkwargs)
         else:
             self.func(*self.pargs, **self.pkwargs)
@@ -51,3 +126,62 @@ class Process(Component, greenlet):
             
 #         raise greenlet.GreenletExit 
 
+class MethodProcess(Component):
+    """Process whose function is called directly by the simulator kernel 
+    each time the process is triggered, without any greenlet switching. 
+    Similar to the SC_METHOD process of the SystemC.
+    
+    The function runs to completion on each activation, hence it must not 
+    block: waiting on events, blocking pop or push, or delayed writes 
+    inside the method process raise BlockingCallError.
+    
+    Like with Process, the sensitivity list is derived from the code of the 
+    function if it is not supplied. The process without the sensitivity 
+    list is run only once.
+    """
+    
+    armed = False
+    static_sens = None
+    is_method = True
+    inputs = None
+    outputs = None
+    activations = 0
+    
+    @compinit
+    def __init__(self, name, parent, func, sim : Dependency('sim'), senslist=None, pargs = (), pkwargs = {}, **kwargs):
+        self.func = func
+
+        self.senslist = senslist
+        self.pargs = pargs
+        self.pkwargs = pkwargs
+        self.sim = sim
+        self.events = None
+        self.initialized = False
+
+        if self.senslist is None:
+            if getattr(func, '__self__', None):
+                (self.inputs, self.outputs) = func_io_vars(func)
+                self.senslist = self.inputs - self.outputs
+
+        if self.senslist:
+            self.senslist = tuple(self.senslist)
+            
+            if not any(isinstance(e, Delay) for e in self.senslist):
+                self.static_sens = StaticSens(self, self.senslist)
+
+        self._exit_func = None 
+        self.sim.proc_reg(self)
+
+    def exit_func(self):
+        if self._exit_func:
+            self._exit_func()
+
+def always_method(parent, *senslist, **kwargs):
+    """This process decorator instantiates the MethodProcess for the 
+    function. The process is named after the function."""
+    
+    def _always_decorator(func):
+        return MethodProcess(func.__name__, parent, func, 
+                             senslist=(list(senslist) or None), **kwargs)
+    
+    return _always_decorator
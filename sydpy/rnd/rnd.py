@@ -16,20 +16,41 @@
 #  Public License along with sydpy.  If not, see 
 #  <http://www.gnu.org/licenses/>.
 
-"""Module implements random generator for sydpy types."""
+"""Module implements random generator for sydpy types.
+
+The values can be drawn one by one by iterating the generator, or in bulk
+by take(). The bit types draw their values from the whole 32-bit words of
+the underlying Mersenne Twister, so the bulk draws consume the stream the
+same way as the draws of the values one by one: the same seed gives the
+same values regardless of how they are drawn."""
 
 import sys
 import random
+import struct
+import weakref
+from collections import deque
 
 class rnd(object):
     '''
-    classdocs
+    Random generator of the values of the sydpy type dtype.
+    
+    batch - Number of the values drawn in bulk by the iteration, kept in a 
+            buffer until they are consumed.
     '''
     
-    def __init__(self, dtype, seed=None):
+    # All the live random generators, so that their state can be saved 
+    # with the simulation checkpoint
+    instances = weakref.WeakSet()
+    
+    def __init__(self, dtype, seed=None, batch=1):
         self.dtype = dtype
+        self.batch = batch
+        self.buffer = deque()
+        # Bulk generator functions resolved for each of the drawn types
+        self.generators = {}
+        rnd.instances.add(self)
         
-        if seed is None:
+        if seed is not None:
             self.set_seed(seed)
         else:
             self.randomize()
@@ -37,33 +58,113 @@ class rnd(object):
     def set_seed(self, seed):
         self.seed = seed
         self.rnd_gen = random.Random(seed)
+        self.buffer.clear()
     
     def randomize(self):
         self.set_seed(int(random.SystemRandom(0).random() * 65536))      
     
+    def getstate(self):
+        return (self.rnd_gen.getstate(), list(self.buffer))
+    
+    def setstate(self, state):
+        gen_state, buffer = state
+        self.rnd_gen.setstate(gen_state)
+        self.buffer = deque(buffer)
+    
     def rnd_int(self, imin=0, imax=sys.maxsize):
         return self._rnd_int(imin, imax)
     
     def _rnd_int(self, imin=0, imax=sys.maxsize):
         return self.rnd_gen.randint(imin, imax)
     
-    def _rnd(self, dtype):
-        try:
-            return getattr(self, "_rnd_" + dtype.__class__.__name__)()
-        except AttributeError:
-            pass
+    def _rnd_bytes(self, size):
+        return self.rnd_gen.getrandbits(8*size).to_bytes(size, 'little')
+    
+    def _rnd_words(self, widths, n=1):
+        """Return the flat list of n rows of random integers, an integer of
+        each of the widths per row. Each of the integers is drawn from the 
+        whole number of 32-bit words."""
+        
+        cnt = len(widths)*n
+        if not cnt:
+            return []
+        
+        words = [(w + 31) >> 5 for w in widths]
+        row_words = sum(words)
+        masks = [(1 << w) - 1 for w in widths]
         
+        # Words are filled in from the least significant one
+        buf = self.rnd_gen.getrandbits(32*row_words*n).to_bytes(4*row_words*n, 'little')
+        
+        if row_words == len(widths):
+            vals = struct.unpack('<{0}I'.format(cnt), buf)
+            
+            if len(set(masks)) == 1:
+                mask = masks[0]
+                return [v & mask for v in vals]
+            else:
+                return [v & masks[i % len(masks)] for i, v in enumerate(vals)]
+        else:
+            vals = []
+            pos = 0
+            for _ in range(n):
+                for k, mask in zip(words, masks):
+                    vals.append(int.from_bytes(buf[pos:pos + 4*k], 'little') & mask)
+                    pos += 4*k
+            
+            return vals
+    
+    def _generator(self, dtype):
+        """Return the function that draws the list of n values of dtype."""
         try:
-            return getattr(self, "_rnd_" + dtype.__name__)()
-        except AttributeError:
+            return self.generators[dtype]
+        except KeyError:
             pass
         
-        return dtype._rnd(self)
+        for name in (dtype.__class__.__name__, getattr(dtype, '__name__', None)):
+            method = getattr(self, "_rnd_" + str(name), None)
+            if method is not None:
+                gen = lambda n: [method() for _ in range(n)]
+                break
+        else:
+            if hasattr(dtype, '_rnd_many'):
+                gen = lambda n: dtype._rnd_many(self, n)
+            else:
+                gen = lambda n: [dtype._rnd(self) for _ in range(n)]
+        
+        self.generators[dtype] = gen
+        return gen
+    
+    def _rnd(self, dtype):
+        return self._generator(dtype)(1)[0]
+    
+    def _rnd_many(self, dtype, n):
+        return self._generator(dtype)(n)
+    
+    def take(self, n):
+        """Return the list of the n next random values."""
+        buffer = self.buffer
+        
+        if not buffer:
+            return self._rnd_many(self.dtype, n)
+        
+        vals = [buffer.popleft() for _ in range(min(n, len(buffer)))]
+        
+        if len(vals) < n:
+            vals.extend(self._rnd_many(self.dtype, n - len(vals)))
+        
+        return vals
+    
+    def fill(self, buf):
+        """Fill the mutable sequence buf with the next random values."""
+        buf[:] = self.take(len(buf))
+        return buf
     
     def __iter__(self):
         return self
         
     def __next__(self):
-        return self._rnd(self.dtype)
-        
-        
+        if not self.buffer:
+            self.buffer.extend(self._rnd_many(self.dtype, self.batch))
+            
+        return self.buffer.popleft()
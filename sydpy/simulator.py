@@ -4,9 +4,14 @@ from sydpy.unit import Unit
 from sydpy._util._util import class_load, unif_enum
 
 from greenlet import greenlet
-from sydpy.process import Process
+from sydpy.process import Process, BlockingCallError
 from sydpy._util._injector import features
 from sydpy.intfs.intf import Intf
+from sydpy._delay_queue import DelayQueue
+from sydpy._run_queue import RunQueue
+from sydpy._levelize import CycleSchedule, CombLoopError
+from sydpy._checkpoint import Checkpoint, branch
+from sydpy._profiler import KernelProfiler
 
 class SimEvent(list):
     """Simulator Event that can trigger list of callbacks.
@@ -26,7 +31,56 @@ class SimEvent(list):
     a tuple to the list. The first tuple item contains function 
     reference. The rest of the items will be passed to the
     callback once the _event is triggered.
+    
+    The on_change callback, if supplied, is called with the event as the
+    argument whenever the list of callbacks is modified.
     """
+    def __init__(self, *args, on_change=None):
+        list.__init__(self, *args)
+        self.on_change = on_change
+        
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change(self)
+    
+    def append(self, f):
+        list.append(self, f)
+        self._changed()
+        
+    def extend(self, fs):
+        list.extend(self, fs)
+        self._changed()
+        
+    def insert(self, i, f):
+        list.insert(self, i, f)
+        self._changed()
+        
+    def remove(self, f):
+        list.remove(self, f)
+        self._changed()
+        
+    def pop(self, *args):
+        f = list.pop(self, *args)
+        self._changed()
+        return f
+    
+    def clear(self):
+        list.clear(self)
+        self._changed()
+        
+    def __setitem__(self, key, f):
+        list.__setitem__(self, key, f)
+        self._changed()
+        
+    def __delitem__(self, key):
+        list.__delitem__(self, key)
+        self._changed()
+        
+    def __iadd__(self, fs):
+        list.extend(self, fs)
+        self._changed()
+        return self
+    
     def __call__(self, *args, **kwargs):
         """Trigger the _event and call the callbacks.
         
@@ -34,6 +88,9 @@ class SimEvent(list):
         all the callbacks.
         """
         
+        if not self:
+            return
+        
         expired = []
         
         for i, f in enumerate(self):
@@ -83,31 +140,52 @@ class Scheduler(greenlet):
             return
             
 class Simulator(Component):
-    '''Simulator kernel.'''
+    '''Simulator kernel.
+    
+    With cycle_based=True, the combinational processes, i.e. the processes 
+    whose sensitivity lists are derived from their code, are levelized when 
+    the simulation starts, and evaluated in a single ordered sweep after each 
+    delta cycle (see CycleSchedule). If the combinational processes cannot 
+    be levelized, the simulation stays event-driven, and the reason is kept 
+    in the levelize_error attribute.
+    
+    With profile=True, the KernelProfiler is attached to the kernel and kept 
+    in the profiler attribute.'''
 
-    def __init__(self, sched : Dependency('scheduler'), duration = 0, max_delta_count=1000, **kwargs):
-        self.delay_pool = {}
-        self.trig_pool = set()
-        self.update_pool = set()     
-        self._ready_pool = set()
+    def __init__(self, sched : Dependency('scheduler'), duration = 0, max_delta_count=1000, cycle_based=False, profile=False, **kwargs):
+        self.delay_pool = DelayQueue()
+        self.trig_pool = RunQueue()
+        self.update_pool = RunQueue()
+        self._ready_pool = RunQueue()
         self._proc_pool = []
+        self._method_proc = None
         self.running = False
+        self._started = False
+        self._finished = False
+        self._caller = None
+        self._until = None
+        self._stop = None
         self.duration = duration
         self.sched = sched
         self.max_delta_count = max_delta_count
+        self.cycle_based = cycle_based
+        self.delta_total = 0
+        self.event_total = 0
+        self.cycle_sched = None
+        self.levelize_error = None
 
         # Create events for Simulator extensions to hook to.
-        self.events = {
-                       'init_start'     : SimEvent(),
-                       'run_start'      : SimEvent(),
-                       'run_end'        : SimEvent(),
-                       'delta_start'    : SimEvent(),
-                       'post_evaluate'  : SimEvent(),
-                       'delta_end'      : SimEvent(),
-                       'delta_settled'  : SimEvent(),
-                       'timestep_start' : SimEvent(),
-                       'timestep_end'   : SimEvent(),
-                       }
+        self.events = {}
+        for name in ['init_start', 'run_start', 'run_end', 'delta_start',
+                     'post_evaluate', 'delta_end', 'delta_settled',
+                     'timestep_start', 'timestep_end']:
+            self.events[name] = SimEvent(on_change=self._hooks_modified)
+        
+        self._hooks_changed = True
+        
+        self.profiler = None
+        if profile:
+            KernelProfiler(self)
         
 #         self.inst('top', class_load(top))
 #         self.sched = Scheduler(log_task_switching=False)
@@ -131,41 +209,138 @@ class Simulator(Component):
 #                     
 #         return finished_all
     
-    def run(self):
-        self.sched.switch(self, self.duration)
+    def run(self, until=None):
+        """Run the simulation until the duration expires. If until is given, 
+        pause the simulation once the time reaches it instead, so that it can
+        be continued later. 
+        
+        Returns True if the simulation was paused, False if it has finished.
+        """
+        self._until = until
+        self._stop = None
+        
+        if (until is not None) and self._started and (until <= self.time):
+            return not self._finished
+        
+        return self._continue()
+    
+    def step(self, n_deltas=1):
+        """Run the simulation for n_deltas delta cycles and pause it."""
+        left = [n_deltas]
+        
+        def stop():
+            left[0] -= 1
+            return left[0] <= 0
+        
+        self._until = None
+        self._stop = stop
+        return self._continue()
+    
+    def run_until(self, predicate):
+        """Run the simulation until predicate(sim) returns True and pause it. 
+        The predicate is checked after each delta cycle."""
+        self._until = None
+        self._stop = lambda: predicate(self)
+        return self._continue()
+    
+    def resume(self):
+        """Continue the paused simulation until the duration expires."""
+        return self.run()
+        
+    def _continue(self):
+        if self._finished:
+            return False
+        
+        self._caller = greenlet.getcurrent()
+        
+        if self._started:
+            self.sched.switch()
+        else:
+            self.sched.switch(self, self.duration)
+            
+        return not self._finished
+    
+    def _pause(self):
+        """Return the control to the caller of the run methods, until the 
+        simulation is continued."""
+        self._caller.switch()
+        
+    def _until_reached(self):
+        next_time = self.delay_pool.peek_time()
+        return (next_time is None) or (next_time > self._until)
    
+    def checkpoint(self):
+        """Save the state of the paused simulation and return it as the 
+        Checkpoint object."""
+        return Checkpoint(self)
+    
+    def restore(self, checkpoint):
+        """Roll the paused simulation back to the saved checkpoint."""
+        checkpoint.restore()
+        
+    def branch(self, funcs, jobs=None):
+        """Continue the paused simulation in a forked child process for each
+        of the funcs, and return the list of their results."""
+        return branch(self, funcs, jobs)
+        
     def _run(self, duration=0, quiet=0):
         """Start the simulator scheduler loop."""
         
         # Instantiate the user module hierarchy
         self._initialize()
+        self._started = True
         
         if duration:
             self.duration = duration
         
         self.max_time = self.time + self.duration
  
+        if self.cycle_based:
+            self._levelize()
+            
+        sweep = self.cycle_sched.sweep if self.cycle_sched else None
+        
         self.running = True
         self.events['run_start'](self)
         self._finished = False
         
+        (timestep_start, delta_start, post_evaluate, delta_end, 
+         delta_settled, timestep_end) = self._bind_hooks()
+        
         while not self._finished:
+            if self._hooks_changed:
+                (timestep_start, delta_start, post_evaluate, delta_end, 
+                 delta_settled, timestep_end) = self._bind_hooks()
+            
             self.delta_count = 0
-            self.events['timestep_start'](self.time, self)
+            if timestep_start is not None:
+                timestep_start(self.time, self)
+            
             # Perform delta cycle loop as long as the events are triggering
             while self._ready_pool or self.trig_pool:
+                if self._hooks_changed:
+                    (timestep_start, delta_start, post_evaluate, delta_end, 
+                     delta_settled, timestep_end) = self._bind_hooks()
+                
                 #Perform one delta cycle
-                self.events['delta_start'](self.time, self.delta_count, self)
+                if delta_start is not None:
+                    delta_start(self.time, self.delta_count, self)
                  
                 self._evaluate()
                  
-                self.events['post_evaluate'](self.time, self.delta_count, self)
+                if post_evaluate is not None:
+                    post_evaluate(self.time, self.delta_count, self)
                  
                 self._update()
+                
+                if sweep is not None:
+                    sweep()
                  
-                self.events['delta_end'](self.time, self.delta_count, self)
+                if delta_end is not None:
+                    delta_end(self.time, self.delta_count, self)
                  
                 self.delta_count += 1
+                self.delta_total += 1
                  
                 if self.delta_count > self.max_delta_count:
                     self._finalize()
@@ -174,12 +349,35 @@ class Simulator(Component):
                     raise greenlet.GreenletExit
                     raise Exception("Maximum number of delta cycles reached: {0}".format(self.max_delta_count))
                 
-                if not (self._ready_pool or self.trig_pool):
-                    self.events['delta_settled'](self)
+                if delta_settled is not None:
+                    if not (self._ready_pool or self.trig_pool):
+                        delta_settled(self)
+                
+                if self._stop is not None and self._stop():
+                    self._pause()
+                    # Handle the changes made while the simulation was paused
+                    self._update()
                 
 #                 print('-----------------------------------------')
-                 
-            self.events['timestep_end'](self.time, self)
+            
+            if self._hooks_changed:
+                (timestep_start, delta_start, post_evaluate, delta_end, 
+                 delta_settled, timestep_end) = self._bind_hooks()
+                
+            if timestep_end is not None:
+                timestep_end(self.time, self)
+            
+            if self._until is not None:
+                while (self._until is not None) and self._until_reached():
+                    if self._until > self.time:
+                        self.time = self._until
+                        
+                    self._pause()
+                
+                # Handle the changes made while the simulation was paused
+                self._update()
+                if self._ready_pool or self.trig_pool:
+                    continue
              
             # All events have settled, let's advance time
             if not self._advance_time():
@@ -188,6 +386,19 @@ class Simulator(Component):
                 self._finished = True
                 raise greenlet.GreenletExit 
     
+    def _hooks_modified(self, event):
+        self._hooks_changed = True
+        
+    def _bind_hooks(self):
+        """Return the main loop hooks, with the ones that have no callbacks 
+        subscribed replaced by None, so that the main loop can skip them."""
+        
+        self._hooks_changed = False
+        
+        return [self.events[name] or None for name in 
+                ['timestep_start', 'delta_start', 'post_evaluate', 'delta_end',
+                 'delta_settled', 'timestep_end']]
+    
     def _initialize(self):
         
         self.max_time = None
@@ -200,6 +411,25 @@ class Simulator(Component):
         
 #         self.top_module = self.top_module_cls('top', None)
 
+    def _levelize(self):
+        """Take the combinational processes out of the event-driven 
+        scheduling and build the levelized schedule for them."""
+        
+        comb = [p for p in self._proc_pool 
+                if p.outputs and p.senslist and (p.static_sens is not None)]
+        
+        try:
+            self.cycle_sched = CycleSchedule(self, comb)
+        except CombLoopError as e:
+            self.cycle_sched = None
+            self.levelize_error = e
+            return
+        
+        comb = set(comb)
+        procs = [p for p in self._ready_pool if p not in comb]
+        self._ready_pool.clear()
+        self._ready_pool.update(procs)
+        
     def _unsubscribe(self, proc):
         """Unsubscribe the process from all events from  its sensitivity list."""
         
@@ -236,57 +466,105 @@ class Simulator(Component):
     def _evaluate(self):
         """Run all processes scheduled for execution. Resolve all triggered events afterwards."""
          
-        # Run the ready processes
+        profiler = self.profiler
+        
+        # Run the ready processes in the order they became ready
         while self._ready_pool:
-            proc = self._ready_pool.pop()
-            self._unsubscribe(proc)
-            events = proc.switch()
-            if events is not None:
-                self._subscribe(proc, events)
-            else:
-                # If process supplied no waiting events, it is to be terminated
-                self._proc_pool.remove(proc)
-                proc.exit_func()
+            for proc in self._ready_pool.swap():
+                if proc.is_method:
+                    self._run_method(proc)
+                    continue
+                
+                # Statically sensitive process stays subscribed to its events
+                if proc.armed:
+                    proc.armed = False
+                else:
+                    self._unsubscribe(proc)
+                    
+                proc.activations += 1
+                if profiler is None:
+                    events = proc.switch()
+                else:
+                    events = profiler.measure(proc, proc.switch)
+                
+                if events is None:
+                    # If process supplied no waiting events, it is to be terminated
+                    if proc.static_sens is not None:
+                        proc.static_sens.release()
+                        
+                    self._proc_pool.remove(proc)
+                    proc.exit_func()
+                elif events is proc.static_sens:
+                    events.arm()
+                else:
+                    self._subscribe(proc, events)
         
         # Resolve all triggered events          
         while self.trig_pool:
-            trig = self.trig_pool.pop()
-            trig.resolve(self._ready_pool)
+            triggered = self.trig_pool.swap()
+            self.event_total += len(triggered)
+            for trig in triggered:
+                trig.resolve(self._ready_pool)
+
+    def _run_method(self, proc):
+        """Call the method process function directly. On the first activation
+        the process only subscribes to its sensitivity list."""
+        
+        if not proc.senslist:
+            self._call_method(proc)
+            self._proc_pool.remove(proc)
+            proc.exit_func()
+            return
+        
+        if proc.static_sens is not None:
+            if proc.armed:
+                self._call_method(proc)
+            else:
+                proc.static_sens.arm()
+        else:
+            if proc.initialized:
+                self._unsubscribe(proc)
+                self._call_method(proc)
+            
+            proc.initialized = True
+            self._subscribe(proc, proc.senslist)
+
+    def _call_method(self, proc):
+        self._method_proc = proc
+        try:
+            if self.profiler is None:
+                proc.func(*proc.pargs, **proc.pkwargs)
+            else:
+                self.profiler.measure(proc, proc.func, *proc.pargs, **proc.pkwargs)
+        finally:
+            self._method_proc = None
 
     def _update(self):
         """Ask all signals to _update their values, and trigger new events. """
         
-        for s in self.update_pool:
-            s._update()
-            
-        self.update_pool.clear()
+        if self.profiler is None:
+            for s in self.update_pool.swap():
+                s._update()
+        else:
+            self.profiler.update(self.update_pool.swap())
         
     def _advance_time(self):
         """Advanced time to the earliest scheduled process in delay pool and 
         return True, or return False if there are no more scheduled processes"""
         
-        if self.delay_pool:
-            t_new = None
-            
-            while self.delay_pool:
-                w = min(self.delay_pool, key=self.delay_pool.get)
-                if not t_new:
-                    t_new = self.delay_pool[w]
-                elif self.delay_pool[w] > t_new:
-                    break
-                    
-                self.delay_pool.pop(w)
-                self._ready_pool.add(w)
+        next_delay = self.delay_pool.pop_next()
 
-            self.time = t_new
-            self.delta_count = 0
-            
-            if self.time > self.max_time:
-                return False
-            else:
-                return True
-        else:
+        if next_delay is None:
+            return False
+
+        self.time, procs = next_delay
+        self._ready_pool.update(procs)
+        self.delta_count = 0
+
+        if (self._until is None) and (self.time > self.max_time):
             return False
+        else:
+            return True
         
     def _finalize(self):
         """Call the exit functions of all processes."""
@@ -306,15 +584,36 @@ class Simulator(Component):
     
     def wait(self, *events):
         """Delay process execution by waiting for events."""
+        if self._method_proc is not None:
+            raise BlockingCallError("Method process {0} cannot block.".format(self._method_proc.name))
+            
         self.sched.switch(events)
     
+    def wait_sens(self, sens):
+        """Delay process execution by waiting on its static sensitivity list."""
+        self.sched.switch(sens)
+    
     def delay_add(self, proc, time):
         """Register process to be scheduled for execution after given time."""
-        self.delay_pool[proc] = time + self.time
+        self.delay_pool.push(proc, time + self.time)
     
     def delay_pop(self,proc):
         """Remove process from the delay schedule."""
-        self.delay_pool.pop(proc, None)
+        self.delay_pool.cancel(proc)
+
+    def stats(self):
+        """Return the dictionary with the kernel statistics."""
+        return {
+                'time'      : getattr(self, 'time', 0),
+                'deltas'    : self.delta_total,
+                'events'    : self.event_total,
+                'processes' : len(self._proc_pool),
+                'delay'     : self.delay_stats(),
+                }
+        
+    def delay_stats(self):
+        """Return the statistics of the delay schedule."""
+        return self.delay_pool.stats()
 
     def trigger(self, event):
         """Register event to trigger pool."""
@@ -19,8 +19,11 @@
 from ._type_base import conv, convgen, ConversionError
 from .bit import bit, bit8, bit16, bit32, bit64, Bit
 from .array import Array, array
+from .byte_array import ByteArray, byte_array
 from .vector import vector, Vector
 from .struct import struct, Struct
+from .packed import pstruct, pvector
+from .signed import signed, fixed, Signed, Fixed
 from .enum import Enum
 
 __all__ = ["conv",
@@ -33,10 +36,18 @@ __all__ = ["conv",
            "Bit",
            "array",
            "Array",
+           "byte_array",
+           "ByteArray",
            "vector",
            "Vector",
            "struct",
            "Struct",
+           "pstruct",
+           "pvector",
+           "signed",
+           "Signed",
+           "fixed",
+           "Fixed",
            "enum",
            "Enum"
            ]
@@ -0,0 +1,140 @@
+#  This file is part of sydpy.
+#
+#  Copyright (C) 2014-2015 Bogdan Vukobratovic
+#
+#  sydpy is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation, either version 2.1
+#  of the License, or (at your option) any later version.
+#
+#  sydpy is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General
+#  Public License along with sydpy.  If not, see
+#  <http://www.gnu.org/licenses/>.
+
+"""Module implements the conversion plans used by the convgen().
+
+A plan is created once per (source type, destination type) pair. Called with
+the source value and the remain of the previous conversion, it returns the
+generator that follows the _convgen() protocol, or None if it cannot
+convert the value, in which case the generic _convgen() search is used.
+
+The plans stream the bits through a single integer, instead of building a
+partially filled value for each step, so the remain returned at the end
+of one transaction is completed by the bits of the next one."""
+
+from sydpy.types.bit import Bit
+
+class BitPlan(object):
+    """Plan for the conversion between the bit types of different widths.
+
+    The first bits of the source fill the destination value first. Only the
+    fully valid sources are converted by the plan, as are the remains whose
+    valid bits form the contiguous low part.
+    """
+
+    def __init__(self, src, dst):
+        self.src = src
+        self.dst = dst
+        self.w = dst.w
+        self.mask = dst._mask
+        # Types of the source bits left after each step, by width
+        self.rest_types = {}
+
+    def _start(self, remain):
+        """Return the value and the width of the remain bits."""
+        if remain is None:
+            return 0, 0
+
+        vld = remain.vld & self.mask
+
+        if vld & (vld + 1):
+            return None
+
+        return remain.val & vld, vld.bit_length()
+
+    def __call__(self, other, remain):
+        if other.vld != other._mask:
+            return None
+
+        start = self._start(remain)
+        if start is None:
+            return None
+
+        val, w = start
+        return self._run(val | (other.val << w), w + other.w)
+
+    def _run(self, val, w):
+        dw = self.w
+        mask = self.mask
+        make = self.dst._make
+        rest_types = self.rest_types
+
+        while w >= dw:
+            data = make(val & mask)
+            val >>= dw
+            w -= dw
+
+            if w:
+                try:
+                    rest = rest_types[w](val)
+                except KeyError:
+                    rest_type = rest_types[w] = Bit(w)
+                    rest = rest_type(val)
+            else:
+                rest = None
+
+            resp = (yield data, rest)
+
+            if resp == False:
+                return rest
+
+        if w:
+            return self.dst(val, (1 << w) - 1)
+        else:
+            return None
+
+class BytesPlan(BitPlan):
+    """Plan for the conversion of the byte buffers to the bit types. Bytes
+    are read in the order of their indices, i.e. the first byte fills the
+    least significant bits. For the destinations of the whole number of
+    bytes, the data is sliced from the buffer without the shifting."""
+
+    def __init__(self, src, dst):
+        BitPlan.__init__(self, src, dst)
+
+        self.nbytes = dst.w // 8 if (dst.w % 8 == 0) else None
+
+    def __call__(self, other, remain):
+        start = self._start(remain)
+        if start is None:
+            return None
+
+        val, w = start
+
+        if (self.nbytes is not None) and (w == 0):
+            return self._slice(memoryview(other).cast('B'))
+        else:
+            return self._run(val | (int.from_bytes(other, 'little') << w), w + 8*len(other))
+
+    def _slice(self, buf):
+        nbytes = self.nbytes
+        make = self.dst._make
+        end = len(buf) - len(buf) % nbytes
+
+        for pos in range(0, end, nbytes):
+            data = make(int.from_bytes(buf[pos:pos + nbytes], 'little'))
+            rest = buf[pos + nbytes:] if (pos + nbytes < len(buf)) else None
+            resp = (yield data, rest)
+
+            if resp == False:
+                return rest
+
+        if end < len(buf):
+            return self.dst(int.from_bytes(buf[end:], 'little'), (1 << (8*(len(buf) - end))) - 1)
+        else:
+            return None
@@ -0,0 +1,118 @@
+#  This file is part of sydpy.
+#
+#  Copyright (C) 2014-2015 Bogdan Vukobratovic
+#
+#  sydpy is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation, either version 2.1
+#  of the License, or (at your option) any later version.
+#
+#  sydpy is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General
+#  Public License along with sydpy.  If not, see
+#  <http://www.gnu.org/licenses/>.
+
+"""Module implements the operators on the bit values with validity.
+
+Each operator takes the value and the validity bits of the operands and the
+mask of the result width, and returns the (val, vld) pair of the result.
+The invalid bits of the result value are zero. The operators use a fixed
+number of integer operations without branches, hence they work the same on
+Python integers and on the NumPy uint64 arrays.
+
+Logic operators keep the result bit valid whenever the valid operand bits
+determine it, e.g. a valid 0 makes the AND valid regardless of the other
+operand. The low bits of the sum, difference and product depend only on the
+low bits of the operands, so the arithmetic results are valid below the
+lowest invalid operand bit."""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def _valid_below(vld, mask):
+    """Return the mask of the bits below the lowest bit not set in vld."""
+    inv = ~vld & mask
+    # Lowest invalid bit, or zero if all the bits are valid
+    low = inv & -inv
+    return (low - 1) & mask
+
+def and_(a, a_vld, b, b_vld, mask):
+    a &= a_vld
+    b &= b_vld
+    vld = (a_vld & b_vld) | (a_vld & ~a) | (b_vld & ~b)
+    return a & b, vld & mask
+
+def or_(a, a_vld, b, b_vld, mask):
+    a &= a_vld
+    b &= b_vld
+    return (a | b) & mask, ((a_vld & b_vld) | a | b) & mask
+
+def xor(a, a_vld, b, b_vld, mask):
+    vld = a_vld & b_vld & mask
+    return (a ^ b) & vld, vld
+
+def invert(a, a_vld, mask):
+    return ~a & a_vld & mask, a_vld & mask
+
+def add(a, a_vld, b, b_vld, mask):
+    vld = _valid_below(a_vld & b_vld, mask)
+    return (a + b) & vld, vld
+
+def sub(a, a_vld, b, b_vld, mask):
+    vld = _valid_below(a_vld & b_vld, mask)
+    return (a - b) & vld, vld
+
+def mul(a, a_vld, b, b_vld, mask):
+    vld = _valid_below(a_vld & b_vld, mask)
+    return (a * b) & vld, vld
+
+def neg(a, a_vld, mask):
+    vld = _valid_below(a_vld, mask)
+    return -a & vld, vld
+
+unary_ops = {
+             'invert'   : invert,
+             'neg'      : neg,
+             }
+
+binary_ops = {
+              'and_'    : and_,
+              'or_'     : or_,
+              'xor'     : xor,
+              'add'     : add,
+              'sub'     : sub,
+              'mul'     : mul,
+              }
+
+def batch(op, w, a, b=None):
+    """Apply the operator op to the NumPy uint64 arrays of (val, vld) pairs,
+    i.e. the arrays of shape (..., 2), of the bit values of width w (up to
+    64). The second operand b can also be a Python integer, which is then
+    fully valid. Returns the array of the result pairs."""
+
+    if numpy is None:
+        raise ImportError("Batch operators require NumPy.")
+
+    if w > 64:
+        raise ValueError("Batch operators support the widths up to 64 bits.")
+
+    mask = numpy.uint64((1 << w) - 1)
+    a = numpy.asarray(a, dtype=numpy.uint64)
+
+    with numpy.errstate(over='ignore'):
+        if b is None:
+            val, vld = unary_ops[op](a[..., 0], a[..., 1], mask)
+        elif isinstance(b, int):
+            val, vld = binary_ops[op](a[..., 0], a[..., 1],
+                                      numpy.uint64(b & ((1 << w) - 1)), mask, mask)
+        else:
+            b = numpy.asarray(b, dtype=numpy.uint64)
+            val, vld = binary_ops[op](a[..., 0], a[..., 1], b[..., 0], b[..., 1], mask)
+
+    return numpy.stack(numpy.broadcast_arrays(val, vld), axis=-1)
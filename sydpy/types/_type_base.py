@@ -18,12 +18,39 @@
 
 """Module implements the base type for all sydpy types."""
 
+import copy
+
 from sydpy import ConversionError
 
 def conv(val, to_type):
     """Converts a value to specified type."""
     return to_type.conv(val)
 
+# Memoized converters keyed by (target type, source type). None marks the
+# pairs that cannot be converted.
+_converters = {}
+
+# Conversion plans of the convgen() keyed by (target type, source type). None 
+# marks the pairs converted by the generic search.
+_conv_plans = {}
+
+def _constructor(cls):
+    # Constructors reject the values in many ways, which are all reported as 
+    # the failed conversion, like by the other converters
+    def converter(other):
+        try:
+            return cls(other)
+        except Exception:
+            raise ConversionError
+    
+    return converter
+
+def _memoize(key, converter, result, memoize):
+    if memoize:
+        _converters[key] = converter
+        
+    return result
+
 def convgen(val, to_type, remain=None):
     """Generator conversion function. It can output multiple converted values 
     from a single source value.
@@ -31,14 +58,36 @@ def convgen(val, to_type, remain=None):
     For an example conversion of list of integers to integers.
     """
     
-    _convgen = to_type._convgen(val, remain)
-    while True:
-        data, _remain = next(_convgen)
-        
+    for data, _remain in to_type._convgen(val, remain):
         yield data
 
 class TypeBase(object):
-    """Base type for all sydpy typles."""
+    """Base type for all sydpy typles.
+    
+    Once a value is committed to a signal, it is shared by reference between
+    the signal and its readers, and it gets frozen together with the elements
+    and the fields of the aggregate types. The frozen value must not
+    be modified in place: the in-place modifications raise TypeError, and 
+    the _replace() method should be used instead to obtain the modified 
+    copy.
+    """
+    
+    __slots__ = ()
+    
+    _frozen = False
+    
+    def _freeze(self):
+        """Mark the value as shared, which prevents the in-place modifications."""
+        self._frozen = True
+        return self
+    
+    def _frozen_copy(self):
+        """Return the frozen copy of the value, to be shared in place of it."""
+        return copy.deepcopy(self)._freeze()
+    
+    def _check_mutable(self):
+        if self._frozen:
+            raise TypeError("Value shared by a signal cannot be modified in place, use _replace() instead.")
     
     @classmethod
     def cls_eq(cls, other):
@@ -60,21 +109,73 @@ class TypeBase(object):
     @classmethod
     def conv(cls, other=None):
         """Try to perform a simple conversion: one source to one converted object."""
-        try:
-            return getattr(cls, '_from_' + other.__class__.__name__)(other)
-        except AttributeError:
-            pass
+        # Values are not modified in place once shared, so the value of the 
+        # same type needs no copy
+        if other.__class__ is cls:
+            return other
         
         try:
-            return getattr(other, '_to_' + cls.__name__)(cls)
-        except AttributeError:
-            pass
+            converter = _converters[(cls, other.__class__)]
+        except KeyError:
+            return cls._conv_resolve(other)
+        
+        if converter is None:
+            raise ConversionError
         
         try:
-            return cls(other)
-        except:
-            pass
+            return converter(other)
+        except (ConversionError, AttributeError):
+            # Converter that won for the first value need not suit all the 
+            # values of the source type, so the full search is performed
+            return cls._conv_resolve(other, memoize=False)
+    
+    @classmethod
+    def _conv_resolve(cls, other, memoize=True):
+        """Find the converter from the type of other to cls by trying the 
+        conversion methods in turn, and memoize the one that succeeded."""
         
+        key = (cls, other.__class__)
+        
+        try:
+            try:
+                converter = getattr(cls, '_from_' + other.__class__.__name__)
+            except AttributeError:
+                pass
+            else:
+                try:
+                    return _memoize(key, converter, converter(other), memoize)
+                except AttributeError:
+                    pass
+            
+            name = '_to_' + cls.__name__
+            if hasattr(other, name):
+                converter = lambda other: getattr(other, name)(cls)
+                # Method found only on the instance, like the one Intf takes 
+                # from its current value, does not hold for the whole type
+                per_type = hasattr(other.__class__, name)
+                try:
+                    return _memoize(key, converter, converter(other), memoize and per_type)
+                except AttributeError:
+                    pass
+            
+            converter = _constructor(cls)
+            try:
+                return _memoize(key, converter, converter(other), memoize)
+            except ConversionError:
+                pass
+            
+            return _memoize(key, cls._conv_iter, cls._conv_iter(other), memoize)
+        except ConversionError:
+            # Failures are memoized only for the sydpy type sources, since 
+            # converting the Python values depends on the value itself
+            if memoize and isinstance(other, TypeBase):
+                _converters[key] = None
+            
+            raise
+    
+    @classmethod
+    def _conv_iter(cls, other):
+        """Convert by concatenating the elements of the iterable other."""
         try:
              
             other_vals = list(other)
@@ -108,14 +209,45 @@ class TypeBase(object):
         For an example conversion of list of integers to integers.
         """
     
-        _convgen = cls._convgen(other, remain)
-        while True:
-            data, _remain = next(_convgen)
-            
+        for data, _remain in cls._convgen(other, remain):
             yield data
     
+    @classmethod
+    def _rnd(cls, rnd_gen):
+        """Return the random value drawn from the sydpy.rnd generator."""
+        return cls._rnd_many(rnd_gen, 1)[0]
+    
+    @classmethod
+    def _rnd_many(cls, rnd_gen, n):
+        """Return the list of n random values. The types need to override
+        either this method or _rnd(), and the values drawn by it need to 
+        consume the generator stream as the n values drawn one by one."""
+        return [cls._rnd(rnd_gen) for _ in range(n)]
+    
+    @classmethod
+    def _conv_plan(cls, src):
+        """Return the conversion plan from the type src for the convgen(), or
+        None if the type has no plan for the source."""
+        return None
+    
     @classmethod        
     def _convgen(cls, other, remain=None):
+        key = (cls, other.__class__)
+        
+        try:
+            plan = _conv_plans[key]
+        except KeyError:
+            plan = _conv_plans[key] = cls._conv_plan(other.__class__)
+        
+        if plan is not None:
+            gen = plan(other, remain)
+            if gen is not None:
+                return (yield from gen)
+        
+        return (yield from cls._convgen_search(other, remain))
+    
+    @classmethod        
+    def _convgen_search(cls, other, remain=None):
         #First try the direct conversion
         try:
             yield (cls._conv_direct(other), None)
@@ -28,33 +28,46 @@ from sydpy.types import convgen
 
 def Array(cls, max_size=((1 << 16) - 1)):
     if (cls, max_size) not in __array_classes:
-        __array_classes[(cls, max_size)] = type('array', (array,), dict(dtype=cls,max_size=max_size))
+        __array_classes[(cls, max_size)] = type('array', (array,), dict(dtype=cls,max_size=max_size,__slots__=()))
         
     return __array_classes[(cls, max_size)] 
 
 class array(TypeBase):
+    __slots__ = ['_val', '_frozen']
     
     dtype = None
     max_size = (1 << 16) - 1
     
     def __init__(self, val=[]):
         
+        self._frozen = False
         self._val = []
         
         for v in val:
             self._val.append(self.dtype(v))
 
+    def _freeze(self):
+        # Elements are shared together with the value
+        for e in self._val:
+            e._freeze()
+        
+        return TypeBase._freeze(self)
+
     def _replace(self, key, val):
+        new_val = self._val.copy()
+        
         if isinstance( key, slice ) :
             high = max(key.start, key.stop)
             low = min(key.start, key.stop)
             
             for key in range(low, high + 1):
-                self._val[key] = self.dtype(val[key - low])
+                new_val[key] = self.dtype(val[key - low])
         elif isinstance( key, int ) :
-            self._val[key] = self.dtype(val)
+            new_val[key] = self.dtype(val)
         else:
             raise TypeError("Invalid argument type.")
+        
+        return self.__class__(new_val)
     
     def _full(self):
         return False
@@ -67,9 +80,7 @@ class array(TypeBase):
     def _rnd(cls, rnd_gen):
         size = rnd_gen.rnd_int(1, cls.max_size)
         
-        val = [rnd_gen._rnd(cls.dtype) for _ in range(size)] 
-        
-        return cls(val)
+        return cls(rnd_gen._rnd_many(cls.dtype, size))
     
     def _hdl_gen_ref(self, conv):
         s = conv._hdl_gen_ref(self._val[0])
@@ -87,6 +98,10 @@ class array(TypeBase):
         return len(self._val)
     
     def __iadd__(self, other):
+        # Frozen array is shared, hence the extended copy is returned
+        if self._frozen:
+            return self.__class__(self._val + [self.dtype(v) for v in other])
+        
         for v in other:
             self._val.append(self.dtype(v))
             
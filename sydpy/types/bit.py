@@ -20,9 +20,15 @@
 
 __bit_classes = {}
 
+import operator
+
 from sydpy.types._type_base import TypeBase
+from sydpy.types import _four_state
 from sydpy import ConversionError
 
+# Bit types up to this width intern all their values
+INTERN_WIDTH = 8
+
 def Bit(w):
     if w not in __bit_classes:
         cls_name = 'bit'
@@ -30,43 +36,95 @@ def Bit(w):
 #         if w != 1:
 #             cls_name += str(w)
              
-        __bit_classes[w] = type(cls_name, (bit,), dict(w=w))
+        cls = type(cls_name, (bit,), dict(w=w, _mask=(1 << w) - 1, 
+                                          _interned=None, __slots__=()))
+        
+        if w <= INTERN_WIDTH:
+            cls.intern_range(1 << w)
+        
+        __bit_classes[w] = cls
         
     return __bit_classes[w] 
 
-def bit_normalization(self, other):
-    self_val = self.val
-    
-    try:
-        other_val = other.val
+# Translation tables of the string parser. Undefined digits ('u', 'x' or 
+# 'z') are read as zeros, and the validity digits are set for the defined 
+# ones only.
+_val_digits = str.maketrans('uUxXzZ', '000000')
+_bin_vld_digits = str.maketrans('01uUxXzZ', '11000000')
+_hex_vld_digits = str.maketrans('0123456789abcdefABCDEFuUxXzZ', 'ffffffffffffffffffffff000000')
+
+def _mark_undefined(digits, undef, width):
+    """Replace the digits marked by the set bits of undef with 'U'. The 
+    undefined digits need to be '0'. Digits are added together as bytes, so 
+    there is no loop over the digits."""
+    marks = int.from_bytes(format(undef, 'b').zfill(width).encode(), 'big') - \
+            int.from_bytes(b'0'*width, 'big')
+    
+    return (int.from_bytes(digits.encode(), 'big') + marks*(ord('U') - ord('0'))).to_bytes(width, 'big').decode()
+
+def _bin_digits(val, vld, w):
+    """Return the w binary digits of the value, with 'U' for invalid bits."""
+    mask = (1 << w) - 1
+    
+    if vld == mask:
+        return format(val, 'b').zfill(w)
+    else:
+        return _mark_undefined(format(val & vld, 'b').zfill(w), vld ^ mask, w)
+
+def _hex_digits(val, vld, w):
+    """Return the hex digits of the value, with 'U' for the digits that have 
+    no valid bits."""
+    n = (w + 3) // 4
+    
+    if vld == (1 << w) - 1:
+        return '%0*x' % (n, val)
+    
+    # Lowest bit of each of the digits
+    lsbs = int('1'*n, 16)
+    # Bit per digit, set if any of the digit bits is valid
+    defined = (vld | (vld >> 1) | (vld >> 2) | (vld >> 3)) & lsbs
+    
+    digits = '%0*x' % (n, val & (defined * 0xf))
+    
+    if defined == lsbs:
+        return digits
+    else:
+        # Digits of the undefined mask are all '0' or '1'
+        return _mark_undefined(digits, int(format(defined ^ lsbs, 'x'), 2), n)
+
+def bitstr_many(vals):
+    """Return the list of the binary digits (without the '0b' prefix) of all
+    the bit values. The values are concatenated and formatted at once."""
+    val = 0
+    vld = 0
+    w = 0
+    
+    for v in reversed(vals):
+        val = (val << v.w) | v.val
+        vld = (vld << v.w) | v.vld
+        w += v.w
+    
+    digits = _bin_digits(val, vld, w)
+    
+    strs = []
+    end = w
+    for v in vals:
+        strs.append(digits[end - v.w:end])
+        end -= v.w
         
-        if other.w < self.w:
-            dif_mask = ((1 << (self.w - other.w)) - 1) << other.w
-            other_vld = dif_mask | other.vld
-            
-            self_vld = self.vld
-            width = self.w
-        else:
-            dif_mask = ((1 << (other.w - self.w)) - 1) << self.w
-            self_vld = dif_mask | self.vld
-            other_vld = other.vld
-            width = other.w 
-    except AttributeError:
-        other_vld = self._mask
-        other_val = other
-        self_vld = self.vld
-        width = self.w
-
-    return width, self_val, self_vld, other_val, other_vld 
+    return strs
 
 class bit(TypeBase):
-    __slots__ = ['val', 'vld']
+    __slots__ = ['val', 'vld', '_frozen']
     
     w = 1
+    _mask = 1
+    # Shared frozen instances of the fully valid values, indexed by value
+    _interned = None
     
     def __init__(self, val=None, vld=None):
 
-        self._mask = ((1 << self.w) - 1)
+        self._frozen = False
         
         if vld is None:
             vld = self._mask
@@ -74,6 +132,9 @@ class bit(TypeBase):
         if val is None:
             self.val = 0
             self.vld = 0
+        elif val.__class__ is int:
+            self.val = val & self._mask
+            self.vld = vld & self._mask
         else:
             try:
                 vld = val.vld
@@ -82,27 +143,38 @@ class bit(TypeBase):
                 if isinstance(val, str):
                     val = val.strip()
                     if val.startswith('0b'):
-                        pos = val.find('b')
-                        vld = (1 << (len(val) - pos)) - 1
-                        val = int(val, 2)
+                        digits = val[2:]
+                        val = int(digits.translate(_val_digits), 2)
+                        vld = (1 << len(digits)) | int(digits.translate(_bin_vld_digits), 2)
                     elif val.startswith('0x'):
-                        val = val.split('x')[-1]
-                        num = 0
-                        vld = self._mask
-                        for c in val:
-                            num <<= 4
-                            vld <<= 4
-                            if c != 'u':
-                                num += int(c, 16)
-                                vld += 0xf
-                                
-                        val = num
+                        digits = val[2:]
+                        val = int(digits.translate(_val_digits), 16)
+                        vld = (self._mask << (4*len(digits))) | int(digits.translate(_hex_vld_digits), 16)
                     else:
                         val = int(val)
             
             self.val = val & self._mask
             self.vld = vld & self._mask
 
+    def __copy__(self):
+        # Copy is private, hence it is not frozen even if the original is
+        return self.__class__(self.val, self.vld)
+    
+    def __deepcopy__(self, memo):
+        return self.__class__(self.val, self.vld)
+    
+    def _frozen_copy(self):
+        interned = self._interned
+        if (interned is not None) and (self.vld == self._mask) and (self.val < len(interned)):
+            return interned[self.val]
+        
+        # Copied slot by slot, the bits need no normalization
+        new = object.__new__(self.__class__)
+        new.val = self.val
+        new.vld = self.vld
+        new._frozen = True
+        return new
+    
     def _replace(self, key, val):
         if isinstance( key, slice ) :
             #Get the start, stop, and step from the slice
@@ -200,10 +272,13 @@ class bit(TypeBase):
             raise TypeError
     
     @classmethod
-    def _rnd(cls, rnd_gen):
-        return cls(rnd_gen._rnd_int(0, (1 << cls.w) - 1))
+    def _rnd_many(cls, rnd_gen, n):
+        mask = cls._mask
+        return [cls(v, mask) for v in rnd_gen._rnd_words((cls.w,), n)]
     
     def __setitem__(self, key, val):
+        self._check_mutable()
+        
         if isinstance( key, slice ) :
             #Get the start, stop, and step from the slice
 #             return [self[ii] for ii in xrange(*key.indices(len(self)))]
@@ -258,36 +333,10 @@ class bit(TypeBase):
         return Bit(w_slice)(val, vld)
                   
     def bitstr(self):
-        val = self.val
-        vld = self.vld
-        bitstr = ''
-        for i in range(self.w):
-            if vld & 1:
-                bitstr += str(val & 1)
-            else:
-                bitstr += 'U'
-                
-            vld >>= 1
-            val >>= 1
-            
-        return '0b' + bitstr[::-1]
+        return '0b' + _bin_digits(self.val, self.vld, self.w)
     
     def __str__(self):
-        val = self.val
-        vld = self.vld
-        hexstr = ''
-        for i in range(-(int(-self.w//4))):
-            if vld & 0xf:
-                hexstr += '{0:1x}'.format(int(val & 0xf))
-            else:
-                if (vld & 0xf) == 0:
-                    hexstr += 'U'
-                else:
-                    hexstr += 'u'
-            vld >>= 4
-            val >>= 4
-            
-        return '0x' + hexstr[::-1]
+        return '0x' + _hex_digits(self.val, self.vld, self.w)
 
     __repr__ = __str__
     
@@ -302,12 +351,8 @@ class bit(TypeBase):
         
     def _icon(self, other):
         try:
-            for last_unset in reversed(range(self.w)):
-                if (self.vld & (1 << last_unset)):
-                    last_unset += 1
-                    break
-            else:
-                last_unset = 0
+            # Position above the most significant valid bit
+            last_unset = self.vld.bit_length()
     
             space_left = self.w - last_unset
             
@@ -359,9 +404,44 @@ class bit(TypeBase):
         else:
             raise ConversionError
     
+    @classmethod
+    def _conv_plan(cls, src):
+        from sydpy.types._conv_plan import BitPlan, BytesPlan
+        from sydpy.types.byte_array import byte_array
+        
+        # Single bit destinations are converted bit by bit by iteration 
+        if cls.w == 1:
+            return None
+        elif issubclass(src, bit) and (src.w != cls.w):
+            return BitPlan(src, cls)
+        elif issubclass(src, (byte_array, memoryview)):
+            return BytesPlan(src, cls)
+        else:
+            return None
+    
     @classmethod    
     def _from_int(cls, other):
-        return cls(other)
+        return cls._make(other & cls._mask)
+    
+    @classmethod
+    def intern_range(cls, limit):
+        """Share a single frozen instance for each of the fully valid values 
+        from 0 to limit - 1. The interned instances are committed to the 
+        signals in place of the written values, hence they are returned when
+        the signals are read. The conversions, the arithmetic operations and
+        calling the type return the private instances."""
+        limit = min(limit, cls._mask + 1)
+        cls._interned = [cls(v)._freeze() for v in range(limit)]
+    
+    @classmethod
+    def _make(cls, val):
+        """Return the fully valid value. The val needs to be masked."""
+        # Created slot by slot, the bits need no normalization
+        new = object.__new__(cls)
+        new.val = val
+        new.vld = cls._mask
+        new._frozen = False
+        return new
     
     
 #     def __nonzero__(self):
@@ -375,20 +455,97 @@ class bit(TypeBase):
         
     # integer-like methods
 
+    def _result(self, cls, val, vld):
+        if vld == cls._mask:
+            return cls._make(val)
+        else:
+            return cls(val, vld)
+    
+    def _arith(self, int_op, op, other):
+        """Apply the arithmetic operator from _four_state. The result has the
+        width of self, and the narrower bit operand is zero extended. For 
+        the fully valid operands, the int_op is applied instead."""
+        mask = self._mask
+        
+        if other.__class__ is int:
+            b = other & mask
+            b_vld = mask
+        else:
+            try:
+                b = other.val & mask
+                b_vld = (other.vld | (mask ^ other._mask)) & mask
+            except AttributeError:
+                b = int(other) & mask
+                b_vld = mask
+        
+        if self.vld & b_vld == mask:
+            return self._make(int_op(self.val, b) & mask)
+        
+        return self._result(self.__class__, *op(self.val, self.vld, b, b_vld, mask))
+    
+    def _logic(self, int_op, op, other):
+        """Apply the logic operator from _four_state. The result has the 
+        width of the wider operand, and the narrower one is zero extended. 
+        For the fully valid operands, the int_op is applied instead."""
+        if other.__class__ is int:
+            mask = self._mask
+            if self.vld == mask:
+                return self._make(int_op(self.val, other) & mask)
+            
+            return self._result(self.__class__, *op(self.val, self.vld, other & mask, mask, mask))
+        
+        try:
+            w = other.w
+        except AttributeError:
+            mask = self._mask
+            return self._result(self.__class__, *op(self.val, self.vld, int(other) & mask, mask, mask))
+        
+        if w == self.w:
+            mask = self._mask
+            if self.vld & other.vld == mask:
+                return self._make(int_op(self.val, other.val))
+            
+            return self._result(self.__class__, *op(self.val, self.vld, other.val, other.vld, mask))
+        elif w < self.w:
+            cls = Bit(self.w)
+            a, a_vld = self.val, self.vld
+            b, b_vld = other.val, other.vld | (self._mask ^ other._mask)
+        else:
+            cls = Bit(w)
+            a, a_vld = self.val, self.vld | (other._mask ^ self._mask)
+            b, b_vld = other.val, other.vld
+        
+        return self._result(cls, *op(a, a_vld, b, b_vld, cls._mask))
+    
     def __add__(self, other):
-        return Bit(self.w)((self.val + int(other)) & self._mask)
+        return self._arith(operator.add, _four_state.add, other)
         
     def __radd__(self, other):
         return self.__add__(other)
     
     def __sub__(self, other):
-        return Bit(self.w)((self.val - int(other)) & self._mask)
+        return self._arith(operator.sub, _four_state.sub, other)
+    
+    def __rsub__(self, other):
+        return (-self).__add__(other)
     
     def __mul__(self, other):
-        return Bit(self.w)((self.val * int(other)) & self._mask)
+        return self._arith(operator.mul, _four_state.mul, other)
+    
+    def __rmul__(self, other):
+        return self.__mul__(other)
     
     def __truediv__(self, other):
-        return Bit(self.w)(int(self.val / int(other)) & self._mask)
+        try:
+            full = self._full() and other._full()
+        except AttributeError:
+            full = self._full()
+        
+        # Any invalid operand bit makes the whole quotient invalid
+        if not full:
+            return self.__class__(0, 0)
+        
+        return self._make(int(self.val / int(other)) & self._mask)
     
 #     def __sub__(self, other):
 #         try:
@@ -474,12 +631,10 @@ class bit(TypeBase):
         return self.__class__(self.val << other, ((self.vld << other) | (vld_mask)))
     
     def __xor__(self, other):
-        width, self_val, self_vld, other_val, other_vld  = bit_normalization(self, other)
-        
-        return Bit(width)(self_val ^ other_val, self_vld & other_vld)
+        return self._logic(operator.xor, _four_state.xor, other)
     
     def __rxor__(self, other):
-        return other ^ self.val
+        return self.__xor__(other)
 
 #     def __rlshift__(self, other):
 #         return other << self.read()
@@ -488,34 +643,39 @@ class bit(TypeBase):
 #         return other >> self.read()
            
     def __and__(self, other):
-        width, self_val, self_vld, other_val, other_vld  = bit_normalization(self, other)
-        
-        return Bit(width)(self_val & other_val, self_vld & other_vld)
-
+        return self._logic(operator.and_, _four_state.and_, other)
     
     def __rand__(self, other):
-        return other & self.read()
+        return self.__and__(other)
 
     def __or__(self, other):
-        try:
-            other = other.read()
-        except AttributeError:
-            pass
-        return self.read() | other
+        return self._logic(operator.or_, _four_state.or_, other)
+    
     def __ror__(self, other):
-        return other | self.read()
+        return self.__or__(other)
     
     def __neg__(self):
-        return -self.read()
+        return self._result(self.__class__, *_four_state.neg(self.val, self.vld, self._mask))
 
     def __pos__(self):
-        return +self.read()
+        return self
 
     def __abs__(self):
-        return abs(self.read())
+        return self
 
     def __invert__(self):
-        return self.__class__(self.val ^ self._mask, self.vld)
+        if self.vld == self._mask:
+            return self._make(self.val ^ self._mask)
+        
+        return self.__class__(*_four_state.invert(self.val, self.vld, self._mask))
+    
+    @classmethod
+    def batch(cls, op, a, b=None):
+        """Apply the operator to the NumPy uint64 arrays of (val, vld) pairs 
+        of this type's values. The op is the name of the operator from 
+        sydpy.types._four_state, e.g. 'add' or 'and_'. See _four_state.batch().
+        """
+        return _four_state.batch(op, cls.w, a, b)
             
     # conversions
     
@@ -523,13 +683,13 @@ class bit(TypeBase):
         return self.val
         
     def __float__(self):
-        return float(self.read())
+        return float(self.val)
     
     def __oct__(self):
-        return oct(self.read())
+        return oct(self.val)
     
     def __hex__(self):
-        return hex(self.read())
+        return hex(self.val)
     
     def __index__(self):
         return int(self)
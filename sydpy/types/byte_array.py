@@ -0,0 +1,196 @@
+#  This file is part of sydpy.
+#
+#  Copyright (C) 2014-2015 Bogdan Vukobratovic
+#
+#  sydpy is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation, either version 2.1
+#  of the License, or (at your option) any later version.
+#
+#  sydpy is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General
+#  Public License along with sydpy.  If not, see
+#  <http://www.gnu.org/licenses/>.
+
+"""Module that implements byte array sydpy type.
+
+Byte array is the array of bit8 elements backed by the Python bytearray,
+hence it supports the buffer protocol: it can be passed directly to zlib,
+hashlib, struct, numpy.frombuffer() etc. Elements are read as integers,
+and the slices are memoryviews sharing the memory with the array."""
+
+__byte_array_classes = {}
+
+from sydpy.types._type_base import TypeBase
+from sydpy.types.bit import bit8
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_buffer_types = (bytes, bytearray, memoryview)
+
+def ByteArray(max_size=((1 << 16) - 1)):
+    if max_size not in __byte_array_classes:
+        __byte_array_classes[max_size] = type('byte_array', (byte_array,), dict(max_size=max_size, __slots__=()))
+
+    return __byte_array_classes[max_size]
+
+class byte_array(TypeBase, bytearray):
+    __slots__ = ['_frozen']
+
+    dtype = bit8
+    max_size = (1 << 16) - 1
+
+    def __init__(self, val=b''):
+
+        self._frozen = False
+
+        if isinstance(val, _buffer_types):
+            # Bulk copy through the buffer protocol
+            bytearray.__init__(self, val)
+        elif (numpy is not None) and isinstance(val, numpy.ndarray):
+            bytearray.__init__(self, val.astype(numpy.uint8, copy=False))
+        else:
+            bytearray.__init__(self, [self.dtype.conv(v).val for v in val])
+
+    def __copy__(self):
+        return self.__class__(self)
+
+    def __deepcopy__(self, memo):
+        return self.__class__(self)
+
+    def _replace(self, key, val):
+        new_self = self.__class__(self)
+
+        if isinstance( key, slice ) :
+            high = max(key.start, key.stop)
+            low = min(key.start, key.stop)
+
+            for key in range(low, high + 1):
+                bytearray.__setitem__(new_self, key, self.dtype.conv(val[key - low]).val)
+        elif isinstance( key, int ) :
+            bytearray.__setitem__(new_self, key, self.dtype.conv(val).val)
+        else:
+            raise TypeError("Invalid argument type.")
+
+        return new_self
+
+    def __getitem__(self, key):
+        if isinstance( key, slice ) :
+            view = memoryview(self)
+            if self._frozen:
+                view = view.toreadonly()
+
+            return view[key]
+        else:
+            return bytearray.__getitem__(self, key)
+
+    def __setitem__(self, key, val):
+        self._check_mutable()
+        bytearray.__setitem__(self, key, val)
+
+    def __delitem__(self, key):
+        self._check_mutable()
+        bytearray.__delitem__(self, key)
+
+    def __iadd__(self, other):
+        if not isinstance(other, _buffer_types):
+            other = self.__class__(other)
+
+        # Frozen array is shared, hence the extended copy is returned
+        if self._frozen:
+            return self.__class__(bytes(self) + bytes(other))
+
+        return bytearray.__iadd__(self, other)
+
+    def _mutator(name):
+        method = getattr(bytearray, name)
+
+        def mutate(self, *args):
+            self._check_mutable()
+            return method(self, *args)
+
+        mutate.__name__ = name
+        return mutate
+
+    append = _mutator('append')
+    extend = _mutator('extend')
+    insert = _mutator('insert')
+    pop = _mutator('pop')
+    remove = _mutator('remove')
+    clear = _mutator('clear')
+    reverse = _mutator('reverse')
+
+    del _mutator
+
+    def tobytes(self):
+        return bytes(self)
+
+    def view(self):
+        """Return the memoryview of the array. The array cannot be resized
+        while the view exists."""
+        return self[:]
+
+    def to_numpy(self):
+        """Return the NumPy uint8 array sharing the memory with the byte
+        array. The returned array is read-only if the value is frozen."""
+        if numpy is None:
+            raise ImportError("Conversion to the NumPy array requires NumPy.")
+
+        arr = numpy.frombuffer(self, dtype=numpy.uint8)
+
+        if self._frozen:
+            arr.flags.writeable = False
+
+        return arr
+
+    def _full(self):
+        return False
+
+    @classmethod
+    def _from_NoneType(cls, other):
+        return cls()
+
+    @classmethod
+    def _from_bit(cls, other):
+        # Least significant byte first, as for the convgen() to bit8
+        return cls(other.val.to_bytes((other.w + 7) // 8, 'little'))
+
+    _from_pstruct = _from_bit
+    _from_pvector = _from_bit
+
+    @classmethod
+    def _rnd(cls, rnd_gen):
+        size = rnd_gen.rnd_int(1, cls.max_size)
+
+        return cls(rnd_gen._rnd_bytes(size))
+
+    @classmethod
+    def deref(self, key):
+        return self.dtype
+
+    def __str__(self):
+        return "[" + ",".join(["0x{0:02x}".format(e) for e in bytearray.__iter__(self)]) + "]"
+
+    __repr__ = __str__
+
+    @classmethod
+    def cls_eq(cls, other):
+        return cls.dtype == other.dtype
+
+    def _icon(self, other):
+        if isinstance(other, _buffer_types):
+            return (self.__class__(bytes(self) + bytes(other)), None)
+
+        val = bytearray(self)
+
+        for data, _ in self.dtype._convgen(other):
+            val.append(data.val)
+
+        return (self.__class__(val), None)
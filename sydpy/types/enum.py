@@ -20,27 +20,40 @@
 
 __struct_classes = {}
 
+from sydpy import ConversionError
 from sydpy.types._type_base import TypeBase
 
 def Enum(*args):
     if args not in __struct_classes:
-        __struct_classes[args] = type('enum', (enum,), dict(vals=args))
+        cls = type('enum', (enum,), dict(vals=args, 
+                                         _index={v: i for i, v in enumerate(args)}, 
+                                         __slots__=()))
+        cls._interned = [cls(i)._freeze() for i in range(len(args))]
+        __struct_classes[args] = cls
         
     return __struct_classes[args]
 
 class enum(TypeBase):
+    __slots__ = ['_val', '_name', '_frozen']
     
     vals = None
+    # Index of each of the member names
+    _index = None
+    # Shared frozen instance of each of the members, returned by the 
+    # conversions
+    _interned = None
     
     def __init__(self, val=None):
+        self._frozen = False
+        
         if val is None:
             self._val = None
+            self._name = None
+            return
         elif isinstance(val, str):
-            for i, v in enumerate(self.vals):
-                if v == val:
-                    self._val = i
-                    return
-            else:
+            try:
+                self._val = self._index[val]
+            except KeyError:
                 raise Exception("Supplied value not among enum members!")
         else:
             try:
@@ -50,16 +63,38 @@ class enum(TypeBase):
                     self._val = int(val)
                 except TypeError:
                     raise Exception("Cannot convert to enum!")
+            
+            if not (0 <= self._val < len(self.vals)):
+                raise Exception("Cannot convert to enum!")
         
+        self._name = self.vals[self._val]
+    
     @classmethod
-    def _rnd(cls, rnd_gen):
-        val = rnd_gen._rnd_int(0, len(cls.vals))
+    def _make(cls, val):
+        """Return the shared instance of the member with index val."""
+        if 0 <= val < len(cls._interned):
+            return cls._interned[val]
+        else:
+            raise ConversionError
+        
+    @classmethod
+    def _from_str(cls, other):
+        try:
+            return cls._interned[cls._index[other]]
+        except KeyError:
+            raise ConversionError
+    
+    @classmethod
+    def _from_int(cls, other):
+        return cls._make(other)
         
-        return cls(val)
+    @classmethod
+    def _rnd(cls, rnd_gen):
+        return cls._make(rnd_gen._rnd_int(0, len(cls.vals) - 1))
     
     def __str__(self):
-        if self._val is not None:
-            return self.vals[self._val]
+        if self._name is not None:
+            return self._name
         else:
             return ''
     
@@ -69,20 +104,26 @@ class enum(TypeBase):
         return self._val
     
     def __eq__(self, other):
+        # Values equal the member names and the values of the same type only,
+        # hence they hash consistently by the name. Indexes are compared 
+        # through int().
         if isinstance(other, str):
-            if self._val is None:
-                return False
-            else:
-                return self.vals[self._val] == other
+            return self._name == other
+        elif other.__class__ is self.__class__:
+            return (self is other) or (self._val == other._val)
+        elif isinstance(other, (list, tuple, set, frozenset)):
+            return any([self == v for v in other])
         else:
             try:
                 for v in other:
                     if self == v:
                         return True
-                    
-                return False
             except TypeError:
-                return self._val == other
-        
-
-    
\ No newline at end of file
+                pass
+            
+            return False
+    
+    def __hash__(self):
+        # Equal to the member name, so the values can look up the dicts 
+        # keyed by the names
+        return hash(self._name)
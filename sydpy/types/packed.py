@@ -0,0 +1,243 @@
+#  This file is part of sydpy.
+#
+#  Copyright (C) 2014-2015 Bogdan Vukobratovic
+#
+#  sydpy is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation, either version 2.1
+#  of the License, or (at your option) any later version.
+#
+#  sydpy is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General
+#  Public License along with sydpy.  If not, see
+#  <http://www.gnu.org/licenses/>.
+
+"""Module that implements packed struct and vector sydpy types.
+
+Packed aggregate keeps all its fields within two integers, the value and
+the valid bits, the same way the bit type does. The first field occupies
+the least significant bits. Each field is accessed by a shift and a mask,
+and the conversions from and to the Bit types of the same width only copy
+the two integers."""
+
+from sydpy import ConversionError
+from sydpy.types.bit import bit
+
+def _field_table(dtypes):
+    """Return the width and the (dtype, offset, mask) of each field."""
+    fields = []
+    offset = 0
+
+    for dt in dtypes:
+        if not (isinstance(dt, type) and issubclass(dt, bit)):
+            raise TypeError("Fields of the packed types need to be of the bit types.")
+
+        fields.append((dt, offset, (1 << dt.w) - 1))
+        offset += dt.w
+
+    return offset, tuple(fields)
+
+def packed_type(name, base, dtypes, **attrs):
+    w, fields = _field_table(dtypes)
+
+    return type(name, (base,), dict(w=w, _mask=(1 << w) - 1, _interned=None,
+                                    _fields=fields, __slots__=(), **attrs))
+
+class packed(bit):
+    """Base class for the packed aggregates."""
+
+    __slots__ = ()
+
+    _fields = ()
+
+    def __init__(self, val=None, vld=None):
+        if isinstance(val, (list, tuple)):
+            bit.__init__(self, *self._pack(val))
+        else:
+            bit.__init__(self, val, vld)
+
+    @classmethod
+    def _pack(cls, vals):
+        val = 0
+        vld = 0
+
+        for (dt, offset, _), v in zip(cls._fields, vals):
+            v = dt.conv(v)
+            val |= v.val << offset
+            vld |= v.vld << offset
+
+        return val, vld
+
+    def _field(self, index):
+        dt, offset, mask = self._fields[index]
+
+        val = (self.val >> offset) & mask
+        vld = (self.vld >> offset) & mask
+
+        if vld == mask:
+            return dt._make(val)
+        else:
+            return dt(val, vld)
+
+    def _index(self, key):
+        return key
+
+    @classmethod
+    def _key_mask(cls, key):
+        if isinstance(key, slice):
+            fields = cls._fields[key]
+            mask = 0
+            for _, offset, fmask in fields:
+                mask |= fmask << offset
+
+            return mask
+        else:
+            _, offset, mask = cls._fields[cls._index(cls, key)]
+            return mask << offset
+
+    def __getitem__(self, key):
+        if isinstance( key, slice ) :
+            fields = self._fields[key]
+
+            if not fields:
+                raise IndexError("The slice ({0}) is empty.".format(key))
+
+            mask = self._key_mask(key)
+            offset = fields[0][1]
+            return self._slice_type(key)((self.val & mask) >> offset, (self.vld & mask) >> offset)
+        else:
+            return self._field(self._index(key))
+
+    def _replace(self, key, val):
+        if isinstance( key, slice ) :
+            high = max(key.start, key.stop)
+            low = min(key.start, key.stop)
+
+            new_self = self
+            for i in range(low, high + 1):
+                new_self = new_self._replace(i, val[i - low])
+
+            return new_self
+
+        dt, offset, mask = self._fields[self._index(key)]
+
+        if val is None:
+            fval = fvld = 0
+        else:
+            val = dt.conv(val)
+            fval = val.val
+            fvld = val.vld
+
+        clear = self._mask ^ (mask << offset)
+
+        return self.__class__((self.val & clear) | (fval << offset),
+                              (self.vld & clear) | (fvld << offset))
+
+    def __setitem__(self, key, val):
+        self._check_mutable()
+
+        new_self = self._replace(key, val)
+
+        self.val = new_self.val
+        self.vld = new_self.vld
+
+    def __iter__(self):
+        for i in range(len(self._fields)):
+            yield self._field(i)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __str__(self):
+        return "(" + ",".join([str(e) for e in self]) + ")"
+
+    __repr__ = __str__
+
+    @classmethod
+    def deref(cls, key):
+        if isinstance( key, slice ) :
+            return cls._slice_type(key)
+        else:
+            return cls._fields[cls._index(cls, key)][0]
+
+    @classmethod
+    def _from_bit(cls, other):
+        if cls.w == other.w:
+            return cls(other.val, other.vld)
+        else:
+            raise ConversionError
+
+    def _to_bit(self, cls):
+        if cls.w == self.w:
+            return cls(self.val, self.vld)
+        else:
+            raise ConversionError
+
+    def _icon(self, other):
+        new_self, remain = bit._icon(self, other)
+
+        return self.__class__(new_self.val, new_self.vld), remain
+
+class pstruct(packed):
+    """Packed struct. Fields are accessed by their names or indices."""
+
+    __slots__ = ()
+
+    dtype = None
+    # Field index by field name
+    _names = {}
+
+    def _index(self, key):
+        if isinstance(key, str):
+            try:
+                return self._names[key]
+            except KeyError:
+                raise AttributeError(key)
+
+        return key
+
+    def __getattr__(self, key):
+        try:
+            index = self._names[key]
+        except KeyError:
+            raise AttributeError(key)
+
+        return self._field(index)
+
+    @classmethod
+    def _slice_type(cls, key):
+        from sydpy.types.struct import Struct
+
+        return Struct(*list(cls.dtype.items())[key], packed=True)
+
+    @classmethod
+    def _from_dict(cls, other):
+        s = cls()
+        for k, v in other.items():
+            if k not in cls._names:
+                raise ConversionError
+
+            s = s._replace(k, v)
+
+        return s
+
+class pvector(packed):
+    """Packed vector of the elements of the same bit type."""
+
+    __slots__ = ()
+
+    dtype = None
+
+    @classmethod
+    def _slice_type(cls, key):
+        from sydpy.types.vector import Vector
+
+        return Vector(len(cls._fields[key]), cls.dtype, packed=True)
+
+    def __reversed__(self):
+        for i in reversed(range(len(self._fields))):
+            yield self._field(i)
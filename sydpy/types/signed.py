@@ -0,0 +1,337 @@
+#  This file is part of sydpy.
+#
+#  Copyright (C) 2014-2015 Bogdan Vukobratovic
+#
+#  sydpy is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation, either version 2.1
+#  of the License, or (at your option) any later version.
+#
+#  sydpy is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General
+#  Public License along with sydpy.  If not, see
+#  <http://www.gnu.org/licenses/>.
+
+"""Module that implements signed and fixed-point sydpy types.
+
+The values are kept as the two's complement bits in the val and vld of the
+bit type, hence they convert to and from the Bit types of the same width by
+copying the bits. The numbers passed to the constructors and operators are
+the numeric values: Fixed(16, 8)(1.5) holds the bits 0x0180.
+
+Arithmetic results have the type of the left operand. They wrap around, or
+if the type is created with saturate=True, they saturate at the limits of
+the type."""
+
+__signed_classes = {}
+
+from sydpy import ConversionError
+from sydpy.types.bit import bit
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def _check_numpy():
+    if numpy is None:
+        raise ImportError("Batch mode of the signed types requires NumPy.")
+
+def Fixed(w, frac, saturate=False):
+    """Create the fixed-point type of width w with frac fractional bits."""
+    key = (w, frac, saturate)
+
+    if key not in __signed_classes:
+        name = 'fixed' if frac else 'signed'
+        base = fixed if frac else signed
+        cls = type(name, (base,), dict(w=w, frac=frac, saturate=saturate,
+                                       _mask=(1 << w) - 1, _sign=1 << (w - 1),
+                                       _min=-(1 << (w - 1)), _max=(1 << (w - 1)) - 1,
+                                       _interned=None, __slots__=()))
+
+        if not frac:
+            cls.intern_range(1 << min(w, 8))
+
+        __signed_classes[key] = cls
+
+    return __signed_classes[key]
+
+def Signed(w, saturate=False):
+    """Create the signed integer type of width w."""
+    return Fixed(w, 0, saturate)
+
+class signed(bit):
+    __slots__ = ()
+
+    frac = 0
+    saturate = False
+    _sign = 1
+    _min = -1
+    _max = 0
+
+    def __init__(self, val=None, vld=None):
+        # Numbers are quantized, the raw bits are given together with vld
+        if (vld is None) and isinstance(val, (int, float)) and not isinstance(val, bool):
+            val = self._fit(self._quantize(val))
+
+        bit.__init__(self, val, vld)
+
+    @classmethod
+    def _quantize(cls, num):
+        """Return the raw signed integer representing the number."""
+        if isinstance(num, float):
+            return round(num * (1 << cls.frac))
+        else:
+            return num << cls.frac
+
+    @classmethod
+    def _fit(cls, raw):
+        """Saturate the raw signed integer to the type limits if the type
+        saturates. Wrapping is done by the bit masking."""
+        if cls.saturate:
+            if raw > cls._max:
+                return cls._max
+            elif raw < cls._min:
+                return cls._min
+
+        return raw
+
+    @classmethod
+    def intern_range(cls, limit):
+        limit = min(limit, cls._mask + 1)
+        cls._interned = [cls(v, cls._mask)._freeze() for v in range(limit)]
+
+    @property
+    def raw(self):
+        """Raw signed integer, i.e. the value scaled by 2**frac."""
+        val = self.val
+        return val - ((val & self._sign) << 1)
+
+    def __int__(self):
+        return self.raw >> self.frac
+
+    def __index__(self):
+        return int(self)
+
+    def __float__(self):
+        return self.raw / (1 << self.frac)
+
+    @classmethod
+    def _from_bit(cls, other):
+        if cls.w == other.w:
+            return cls(other.val, other.vld)
+        else:
+            raise ConversionError
+
+    @classmethod
+    def _from_int(cls, other):
+        return cls(other)
+
+    @classmethod
+    def _from_float(cls, other):
+        return cls(other)
+
+    @classmethod
+    def _from_signed(cls, other):
+        if not other._full():
+            raise ConversionError
+
+        return cls._make(cls._fit(cls._rescale(other.raw, other.frac)) & cls._mask)
+
+    _from_fixed = _from_signed
+
+    @classmethod
+    def _rescale(cls, raw, frac):
+        if frac <= cls.frac:
+            return raw << (cls.frac - frac)
+        else:
+            return raw >> (frac - cls.frac)
+
+    def _operand(self, other):
+        """Return the raw signed integer of the fully valid other, in the
+        scale of self, or None if other has invalid bits."""
+        if isinstance(other, signed):
+            if not other._full():
+                return None
+
+            return self._rescale(other.raw, other.frac)
+        elif isinstance(other, bit):
+            if not other._full():
+                return None
+
+            return other.val << self.frac
+        else:
+            return self._quantize(other)
+
+    def _arith(self, int_op, op, other):
+        b = self._operand(other)
+
+        if (b is None) or (self.vld != self._mask):
+            # Invalid bits propagate as for the two's complement bit values
+            return bit._arith(self, int_op, op, other if b is None else b)
+
+        return self._make(self._fit(int_op(self.raw, b)) & self._mask)
+
+    def __mul__(self, other):
+        b = self._operand(other)
+
+        if (b is None) or (self.vld != self._mask):
+            return self.__class__(0, 0)
+
+        return self._make(self._fit((self.raw * b) >> self.frac) & self._mask)
+
+    def __truediv__(self, other):
+        b = self._operand(other)
+
+        if (b is None) or (self.vld != self._mask):
+            return self.__class__(0, 0)
+
+        # Quotient is rounded towards zero
+        q = abs(self.raw << self.frac) // abs(b)
+        if (self.raw < 0) != (b < 0):
+            q = -q
+
+        return self._make(self._fit(q) & self._mask)
+
+    def __rsub__(self, other):
+        return self.__class__(other) - self
+
+    def __neg__(self):
+        if self.vld != self._mask:
+            return bit.__neg__(self)
+
+        return self._make(self._fit(-self.raw) & self._mask)
+
+    def __abs__(self):
+        if self.raw < 0:
+            return -self
+        else:
+            return self
+
+    def __rshift__(self, other):
+        if self.vld != self._mask:
+            return bit.__rshift__(self, other)
+
+        # Arithmetic shift keeps the sign
+        return self._make((self.raw >> other) & self._mask)
+
+    def _compare_operands(self, other):
+        """Return the raw signed integers of self and other, scaled to the 
+        common number of the fractional bits, or None if either of them has 
+        invalid bits."""
+        if not self._full():
+            return None
+
+        if isinstance(other, signed):
+            if not other._full():
+                return None
+
+            frac = max(self.frac, other.frac)
+            return (self.raw << (frac - self.frac), other.raw << (frac - other.frac))
+        elif isinstance(other, bit):
+            if not other._full():
+                return None
+
+            return (self.raw, other.val << self.frac)
+        elif isinstance(other, float):
+            # Scaling by the power of two is exact, as is comparing the int 
+            # to the float
+            return (self.raw, other * (1 << self.frac))
+        else:
+            return (self.raw, other << self.frac)
+
+    def __eq__(self, other):
+        if isinstance(other, (int, float, signed)) and not isinstance(other, bool):
+            ops = self._compare_operands(other)
+            return (ops is not None) and (ops[0] == ops[1])
+        else:
+            return bit.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    # Values with the invalid bits are unordered, as NaN is for the floats
+
+    def __lt__(self, other):
+        ops = self._compare_operands(other)
+        return (ops is not None) and (ops[0] < ops[1])
+
+    def __le__(self, other):
+        ops = self._compare_operands(other)
+        return (ops is not None) and (ops[0] <= ops[1])
+
+    def __gt__(self, other):
+        ops = self._compare_operands(other)
+        return (ops is not None) and (ops[0] > ops[1])
+
+    def __ge__(self, other):
+        ops = self._compare_operands(other)
+        return (ops is not None) and (ops[0] >= ops[1])
+
+    @classmethod
+    def quantize(cls, nums):
+        """Return the NumPy int64 array of the raw signed integers of the
+        numbers, rounded, and wrapped or saturated as by the type."""
+        _check_numpy()
+
+        arr = numpy.asarray(nums)
+
+        if numpy.issubdtype(arr.dtype, numpy.floating):
+            raw = numpy.rint(arr * (1 << cls.frac)).astype(numpy.int64)
+        else:
+            raw = arr.astype(numpy.int64) << cls.frac
+
+        return cls._fit_array(raw)
+
+    @classmethod
+    def dequantize(cls, raw):
+        """Return the NumPy float array of the numbers for the raw integers."""
+        _check_numpy()
+
+        return numpy.asarray(raw, dtype=numpy.int64) / float(1 << cls.frac)
+
+    @classmethod
+    def _fit_array(cls, raw):
+        if cls.saturate:
+            return numpy.clip(raw, cls._min, cls._max)
+        else:
+            return ((raw - cls._min) & cls._mask) + cls._min
+
+    @classmethod
+    def batch(cls, op, a, b=None):
+        """Apply the operator to the NumPy arrays of the raw signed integers
+        (see quantize()) of this type's values, with the wrapping or the
+        saturation of the type. The second operand b can also be a single
+        raw integer. The op is one of 'add', 'sub', 'mul' and 'neg'. Widths
+        up to 32 bits are supported."""
+
+        _check_numpy()
+
+        if cls.w > 32:
+            raise ValueError("Batch operators support the widths up to 32 bits.")
+
+        a = numpy.asarray(a, dtype=numpy.int64)
+
+        if op == 'neg':
+            res = -a
+        elif op == 'add':
+            res = a + b
+        elif op == 'sub':
+            res = a - b
+        elif op == 'mul':
+            res = (a * b) >> cls.frac
+        else:
+            raise ValueError("Unsupported batch operator {0}.".format(op))
+
+        return cls._fit_array(res)
+
+class fixed(signed):
+    __slots__ = ()
+
+    def __int__(self):
+        # Rounded towards zero, as for the floats
+        return int(float(self))
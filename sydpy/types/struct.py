@@ -21,11 +21,18 @@
 __struct_classes = {}
 
 from sydpy.types._type_base import TypeBase
+from sydpy.types.packed import packed_type, pstruct
+from sydpy.types.bit import bit
 from sydpy import ConversionError
 from collections import OrderedDict
 from itertools import islice
 
-def Struct(*args):
+def Struct(*args, packed=False):
+    """Create the struct type with the fields given as (name, type) pairs.
+    
+    If packed is True, the fields need to be of the bit types, and the 
+    struct keeps its value packed within two integers (see pstruct).
+    """
     vals = []
     names = []
     for a in args:
@@ -35,17 +42,27 @@ def Struct(*args):
 #     s_tuple = tuple(names)    
     dtype=OrderedDict(list(zip(names, vals)))
     
-    if args not in __struct_classes:
-        __struct_classes[args] = type('struct', (struct,), dict(dtype=dtype))
+    names = dict((n, i) for i, n in enumerate(names))
+    key = (args, packed)
+    
+    if key not in __struct_classes:
+        if packed:
+            __struct_classes[key] = packed_type('pstruct', pstruct, vals, dtype=dtype, _names=names)
+        else:
+            __struct_classes[key] = type('struct', (struct,), dict(dtype=dtype, _names=names, __slots__=()))
         
-    return __struct_classes[args]
+    return __struct_classes[key]
 
 class struct(TypeBase):
+    __slots__ = ['_val', '_vld', '_frozen']
     
     dtype = None
+    # Field index by field name
+    _names = {}
     
     def __init__(self, val=[]):
         
+        self._frozen = False
         self._val = []
         self._vld = []
         
@@ -62,29 +79,38 @@ class struct(TypeBase):
             self._val.append(t())
             self._vld.append(False)
 
+    def _freeze(self):
+        # Fields are shared together with the value
+        for f in self._val:
+            try:
+                f._freeze()
+            except AttributeError:
+                pass
+        
+        return TypeBase._freeze(self)
+
     def _replace(self, key, val):
+        dtypes = list(self.dtype.values())
+        new_val = self._val.copy()
+        
         if isinstance( key, slice ) :
             high = max(key.start, key.stop)
             low = min(key.start, key.stop)
         
-            if high >= self.w:
+            if high >= len(dtypes):
                 raise IndexError("The index ({0}) is out of range.".format(key))
             
-            val = self._val.copy()
-            
             for key in range(low, high + 1):
-                val[key] = self.dtype(val[key - low])
+                new_val[key] = dtypes[key](val[key - low])
         elif isinstance( key, int ) :
-            if high >= self.w:
+            if key >= len(dtypes):
                 raise IndexError("The index ({0}) is out of range.".format(key))
             
-            val = self._val.copy()
-            
-            val[key] = self.dtype(val)
+            new_val[key] = dtypes[key](val)
         else:
             raise TypeError("Invalid argument type.")
         
-        return self.__class__(val)
+        return self.__class__(new_val)
     
     def _hdl_gen_ref(self, conv):
         s = conv._hdl_gen_ref(self._val[0])
@@ -138,13 +164,15 @@ class struct(TypeBase):
         return True
     
     def __getattr__(self, key):
+        # Slots are unset while copy rebuilds the instance, and the field
+        # lookup would recurse through _val
+        if key.startswith('_'):
+            raise AttributeError(key)
+
         try:
-            if key in self.dtype.keys():
-                return self._val[list(self.dtype.keys()).index(key)]
-            else:
-                return super().__getattribute__(key)
-        except ValueError:
-            raise AttributeError
+            return self._val[self._names[key]]
+        except KeyError:
+            return super().__getattribute__(key)
         
 #     def __setattr__(self, key, val):
 #         try:
@@ -191,6 +219,21 @@ class struct(TypeBase):
         
         return cls(val)
     
+    @classmethod
+    def _rnd_many(cls, rnd_gen, n):
+        dtypes = list(cls.dtype.values())
+        
+        if not all(issubclass(t, bit) for t in dtypes):
+            return [cls._rnd(rnd_gen) for _ in range(n)]
+        
+        # Fields of the bit types are drawn for all the structs at once, in
+        # the same order as by _rnd()
+        vals = rnd_gen._rnd_words([t.w for t in dtypes], n)
+        fields = len(dtypes)
+        
+        return [cls([t(v, t._mask) for t, v in zip(dtypes, vals[i:i + fields])]) 
+                for i in range(0, fields*n, fields)]
+    
     def _icon(self, other):
         
         for i, u in reversed(list(enumerate(self._vld))):
@@ -21,21 +21,36 @@
 __vector_classes = {}
 
 from sydpy.types._type_base import TypeBase
+from sydpy.types.packed import packed_type, pvector
 from sydpy import ConversionError
 
-def Vector(w, cls):
-    if cls not in __vector_classes:
-        __vector_classes[(w, cls)] = type('vector', (vector,), dict(dtype=cls, w=w))
+def Vector(w, cls, packed=False):
+    """Create the vector type of w elements of type cls.
+    
+    If packed is True, cls needs to be a bit type, and the vector keeps its 
+    value packed within two integers (see pvector). The w attribute of the 
+    packed vector type is then its width in bits, as for the bit types, 
+    while len() returns the number of elements.
+    """
+    key = (w, cls, packed)
+    
+    if key not in __vector_classes:
+        if packed:
+            __vector_classes[key] = packed_type('pvector', pvector, [cls]*w, dtype=cls)
+        else:
+            __vector_classes[key] = type('vector', (vector,), dict(dtype=cls, w=w, __slots__=()))
         
-    return __vector_classes[(w, cls)]
+    return __vector_classes[key]
 
 class vector(TypeBase):
+    __slots__ = ['_val', '_vld', '_frozen']
     
     dtype = None
     w = 1
     
     def __init__(self, val=[]):
         
+        self._frozen = False
         self._val = []
         self._vld = []
         
@@ -48,7 +63,16 @@ class vector(TypeBase):
             self._val.append(self.dtype())
             self._vld.append(False)
 
+    def _freeze(self):
+        # Elements are shared together with the value
+        for e in self._val:
+            e._freeze()
+        
+        return TypeBase._freeze(self)
+
     def _replace(self, key, val):
+        new_val = self._val.copy()
+        
         if isinstance( key, slice ) :
             high = max(key.start, key.stop)
             low = min(key.start, key.stop)
@@ -56,21 +80,17 @@ class vector(TypeBase):
             if high >= self.w:
                 raise IndexError("The index ({0}) is out of range.".format(key))
             
-            val = self._val.copy()
-            
             for key in range(low, high + 1):
-                val[key] = self.dtype(val[key - low])
+                new_val[key] = self.dtype(val[key - low])
         elif isinstance( key, int ) :
-            if high >= self.w:
+            if key >= self.w:
                 raise IndexError("The index ({0}) is out of range.".format(key))
             
-            val = self._val.copy()
-            
-            val[key] = self.dtype(val)
+            new_val[key] = self.dtype(val)
         else:
             raise TypeError("Invalid argument type.")
         
-        return self.__class__(*val)
+        return self.__class__(new_val)
     
     def _hdl_gen_ref(self, conv):
         s = conv._hdl_gen_ref(self._val[0])
@@ -124,10 +144,11 @@ class vector(TypeBase):
         return True
     
     @classmethod
-    def _rnd(cls, rnd_gen):
-        val = [rnd_gen._rnd(cls.dtype) for _ in range(cls.w)] 
+    def _rnd_many(cls, rnd_gen, n):
+        # Elements of all the vectors are drawn at once, in order
+        vals = rnd_gen._rnd_many(cls.dtype, cls.w*n)
         
-        return cls(val)
+        return [cls(vals[i:i + cls.w]) for i in range(0, cls.w*n, cls.w)]
     
     def _icon(self, other):
         
@@ -20,11 +20,13 @@ from .basic_rnd_seq import BasicRndSeq
 from .basic_seq import BasicSeq
 from .sequencer import Sequencer
 from .scoreboard import Scoreboard
-from .unittest import UnitTest
+from .unittest import UnitTest, UnitTestResult, UnitTestSummary
 
 __all__ = ["BasicRndSeq",
            "Sequencer",
            "BasicSeq",
            "Scoreboard",
-           "UnitTest"
+           "UnitTest",
+           "UnitTestResult",
+           "UnitTestSummary"
            ]
@@ -34,7 +34,8 @@ class BasicRndSeq(BasicSeq):
             Tuple    - Then it specifies the range from which a random delay is generated
             Integer  - Then it specifies a fixed delay between the transactions
             
-    seed       - The seed from random number generation 
+    seed       - The seed from random number generation. The delays are drawn
+            by a separate generator, seeded from the same seed.
     
     init       - Initial value to output, before the first random value is outputted.
             
@@ -42,6 +43,9 @@ class BasicRndSeq(BasicSeq):
             of tlm and it has to be master.
     """
     
+    # Number of the transactions drawn at once by the random generator
+    rnd_batch = 256
+    
     def rnd_gen(self, dtype, delay=None, seed=None, init=None):
         """The generator function to be supplied to BasicSeq to generate the 
         transactions."""
@@ -49,13 +53,16 @@ class BasicRndSeq(BasicSeq):
         if init is not None:
             yield (init, 0)
         
-        self.rnd_var = rnd(dtype, seed)
+        # Transactions are drawn in bulk, hence the delays are drawn by a 
+        # separate generator, so that neither depends on the rnd_batch
+        self.rnd_var = rnd(dtype, seed, batch=self.rnd_batch)
+        self.rnd_delay = rnd(None, '{0}:delay'.format(self.rnd_var.seed))
         
         while(1):
             next_seq = next(self.rnd_var)
             
             try:
-                next_delay = self.rnd_var.rnd_int(delay[0], delay[1])
+                next_delay = self.rnd_delay.rnd_int(delay[0], delay[1])
             except TypeError:
                 next_delay = delay
             
@@ -18,6 +18,14 @@
 
 """Module implements classes for performing multiple tests on the design."""
 
+import multiprocessing
+import multiprocessing.connection
+import os
+import pickle
+import random
+import time
+import traceback
+
 from sydpy._simulator import Simulator
 from sydpy._component import component_visitor
 
@@ -53,20 +61,104 @@ class UnitTestResult(object):
                 
         return passed
     
+    def _make_picklable(self):
+        """Replace the scoreboard data that cannot be pickled with its string
+        representation, so that the result can be sent from the worker."""
+        for s in self.scoreboard_results:
+            for r in s['results']:
+                try:
+                    pickle.dumps(r['data'])
+                except Exception:
+                    r['data'] = str(r['data'])
+    
     def __str__(self):
-        return "Test for '" + self.test_name + "' " + ("passed." if self.result else "failed!")  
+        name = self.test_name
+        if self.seed is not None:
+            name += " (seed {0})".format(self.seed)
+            
+        if self.error:
+            return "Test for '" + name + "' failed! " + self.error.strip().splitlines()[-1]
+        else:
+            return "Test for '" + name + "' " + ("passed." if self.result else "failed!")  
     
     def __bool__(self):
         return self.result
     
-    def __init__(self, sim, test_name, verbose=False):
+    def __init__(self, sim, test_name, verbose=False, seed=None, error=None):
+        """Create the result of the test, by checking the scoreboards of the 
+        simulated design. If the simulation could not be completed, sim is 
+        None and error contains the reason."""
         self.test_name = test_name
         self.verbose = verbose
-        self.result = self.check_scoreboard_failed(sim)
+        self.seed = seed
+        self.error = error
+        self.elapsed = None
+        
+        if sim is None:
+            self.scoreboard_results = []
+            self.result = False
+        else:
+            self.result = self.check_scoreboard_failed(sim)
+
+class UnitTestSummary(object):
+    """Collects the test results and reports which tests failed."""
+    
+    def __init__(self, results=()):
+        self.results = []
+        for r in results:
+            self.add(r)
+            
+    def add(self, result):
+        self.results.append(result)
+        
+    @property
+    def passed(self):
+        return [r for r in self.results if r]
+    
+    @property
+    def failed(self):
+        return [r for r in self.results if not r]
+    
+    def __bool__(self):
+        return not self.failed
+    
+    def __str__(self):
+        lines = ["{0} tests run, {1} passed, {2} failed.".format(
+                    len(self.results), len(self.passed), len(self.failed))]
+        
+        for r in self.failed:
+            lines.append("    " + str(r))
+            
+        return '\n'.join(lines)
+
+def _worker(unit_test, job, conn):
+    """Run the test job within the worker process and send back the result."""
+    try:
+        res = unit_test._run_job(*job)
+    except Exception:
+        res = UnitTestResult(None, job[1], seed=job[2], error=traceback.format_exc())
+    
+    res._make_picklable()
+    
+    try:
+        conn.send(res)
+    except Exception:
+        conn.send(UnitTestResult(None, job[1], seed=job[2], error=traceback.format_exc()))
+        
+    conn.close()
 
 class UnitTest(object):
+    """Runs the simulations of the design for a list of configurations.
     
-    def __iter__(self):
+    configs   - List of (conf, test_name) pairs. The conf is either the 
+                configuration dictionary or the path of the module 
+                attribute holding it.
+    deal_outs - If True, each test gets its own output_path.
+    seeds     - If supplied, each configuration is run once for each of the 
+                random generator seeds.
+    """
+    
+    def _jobs(self):
         for conf in self.configs:
             test_name = conf[1]
             conf = conf[0]
@@ -81,22 +173,102 @@ class UnitTest(object):
                 
                 module = __import__(module_name, fromlist=[class_name])
                 conf = getattr(module, class_name)
+            
+            for seed in (self.seeds or [None]):
+                job_conf = dict(conf)
+                out_name = test_name
+                
+                if seed is not None:
+                    job_conf['sys.seed'] = seed
+                    out_name += "/seed_" + str(seed)
+                    
+                if self.deal_outs:
+                    
+                    if 'sys.output_path' in conf:
+                        job_conf['sys.output_path'] = conf['sys.output_path'] + "/" + out_name
+                    else:
+                        job_conf['sys.output_path'] = "./out/" + out_name
+                        
+                yield job_conf, test_name, seed
+                
+    def _run_job(self, conf, test_name, seed):
+        if seed is not None:
+            random.seed(seed)
+        
+        start = time.time()
+        sim = Simulator(conf)
+        sim.run()
+        
+        res = UnitTestResult(sim, test_name, verbose=self.verbose, seed=seed)
+        res.elapsed = time.time() - start
+        
+        return res
+    
+    def __iter__(self):
+        for job in self._jobs():
+            yield self._run_job(*job) 
+            
+    def run_parallel(self, jobs=None, timeout=None):
+        """Run the tests in parallel, each in its own worker process, and 
+        yield the results in the order the tests complete.
+        
+        jobs    - Maximum number of the workers running at the same time. 
+                  Defaults to the number of CPUs.
+        timeout - Time in seconds after which the worker running the test 
+                  is killed and the test is reported as failed.
+        """
+        
+        ctx = multiprocessing.get_context('fork')
+        jobs = jobs or os.cpu_count() or 1
+        pending = list(self._jobs())
+        running = {}
+        
+        while pending or running:
+            while pending and (len(running) < jobs):
+                job = pending.pop(0)
+                rconn, wconn = ctx.Pipe(duplex=False)
+                proc = ctx.Process(target=_worker, args=(self, job, wconn), daemon=True)
+                proc.start()
+                wconn.close()
+                running[rconn] = (proc, job, time.time())
+            
+            if timeout is None:
+                wait_time = None
+            else:
+                first_start = min(start for _, _, start in running.values())
+                wait_time = max(0, first_start + timeout - time.time())
                 
-            if self.deal_outs:
+            for conn in multiprocessing.connection.wait(list(running), wait_time):
+                proc, job, start = running.pop(conn)
                 
-                if hasattr(conf, 'sys.output_path'):
-                    conf['sys.output_path'] = conf['sys.output_path'] + "/" + test_name
-                else:
-                    conf['sys.output_path'] = "./out/" + test_name
+                try:
+                    res = conn.recv()
+                except EOFError:
+                    proc.join()
+                    res = UnitTestResult(None, job[1], seed=job[2], 
+                                         error="Worker exited with code {0}".format(proc.exitcode))
+                    res.elapsed = time.time() - start
+                    
+                conn.close()
+                proc.join()
+                yield res
                 
-            sim = Simulator(conf)
-            sim.run()
-                         
-            yield UnitTestResult(sim, test_name, verbose=self.verbose) 
+            if timeout is not None:
+                now = time.time()
+                for conn, (proc, job, start) in list(running.items()):
+                    if now - start >= timeout:
+                        del running[conn]
+                        proc.kill()
+                        proc.join()
+                        conn.close()
+                        res = UnitTestResult(None, job[1], seed=job[2], 
+                                             error="Timed out after {0}s".format(timeout))
+                        res.elapsed = now - start
+                        yield res
     
-    def __init__(self, configs=[], deal_outs=True, verbose=False):
+    def __init__(self, configs=[], deal_outs=True, verbose=False, seeds=None):
         self.configs = configs
         self.deal_outs = deal_outs
         self.verbose = verbose
+        self.seeds = seeds
         
-    
\ No newline at end of file
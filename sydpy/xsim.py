@@ -165,7 +165,7 @@ class XsimIntf(Component):
         ret_type, params = self.send_command('EXPORT')
         
         for intf, p in zip(sorted(self.outputs.items()), params):
-            intf[1].write('0x' + p.replace('x', 'u').replace('z', 'u'))
+            intf[1].write('0x' + p)
             
         sydsys().sim._update()
 
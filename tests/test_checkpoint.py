@@ -0,0 +1,148 @@
+import os
+import pytest
+from sydpy import ddic, compinit, Component, Process, isig, Delay, bit, bit8, \
+    Simulator, Scheduler
+from sydpy._checkpoint import CheckpointError
+
+@pytest.fixture
+def sim():
+    sim = Simulator(Scheduler(), duration=1000)
+    ddic.provide('sim', sim)
+    return sim
+
+class Top(Component):
+    @compinit
+    def __init__(self, name, parent, free=False, **kwargs):
+        Component.__init__(self, name, parent)
+        self.clk = isig('clk', self, dtype=bit, dflt=0)
+        self.cnt = isig('cnt', self, dtype=bit8, dflt=0)
+        self.d = isig('d', self, dtype=bit8, dflt=0)
+        Process('p_clk', self, self.p_clk, senslist=[Delay(5)])
+        Process('p_cnt', self, self.p_cnt, senslist=[self.clk.e['posedge']])
+        Process('p_d', self, self.p_d, senslist=[self.cnt])
+
+        if free:
+            self.proc_free = Process('p_free', self, self.p_free, senslist=[])
+
+    def p_clk(self):
+        self.clk <<= ~self.clk.read()
+
+    def p_cnt(self):
+        self.cnt <<= self.cnt.read() + 1
+
+    def p_d(self):
+        self.d <<= self.cnt.read() * 3
+
+    def p_free(self):
+        while True:
+            ddic['sim'].wait(Delay(7))
+
+def trace(sim, top):
+    log = []
+
+    def timestep_end(time, sim):
+        log.append((time, int(top.clk.read()), int(top.cnt.read()), int(top.d.read())))
+        return True
+
+    sim.events['timestep_end'].append(timestep_end)
+    return log
+
+def test_restore_rerun(sim):
+    top = Top('top', None)
+    log = trace(sim, top)
+
+    sim.run(until=22)
+    cp = sim.checkpoint()
+    del log[:]
+
+    sim.run(until=64)
+    first = list(log)
+    del log[:]
+
+    sim.restore(cp)
+    assert (sim.time, int(top.cnt.read())) == (22, 2)
+
+    sim.run(until=64)
+    assert log == first
+    assert first[-1] == (60, 0, 6, 18)
+
+    # Checkpoint can be restored repeatedly
+    sim.restore(cp)
+    del log[:]
+    sim.run(until=64)
+    assert log == first
+
+def test_restore_moved(sim):
+    top = Top('top', None, free=True)
+
+    sim.run(until=22)
+    cp = sim.checkpoint()
+    sim.run(until=40)
+
+    with pytest.raises(CheckpointError, match='top/p_free has moved'):
+        sim.restore(cp)
+
+def test_restore_terminated(sim):
+    top = Top('top', None, free=True)
+
+    sim.run(until=22)
+    cp = sim.checkpoint()
+    # Kill the process while the simulation is paused
+    top.proc_free.throw()
+    assert top.proc_free.dead
+
+    with pytest.raises(CheckpointError, match='top/p_free has terminated'):
+        sim.restore(cp)
+
+def test_not_paused(sim):
+    top = Top('top', None)
+    errors = []
+
+    def timestep_end(time, sim):
+        try:
+            sim.checkpoint()
+        except CheckpointError as e:
+            errors.append(str(e))
+
+        return False
+
+    sim.run(until=12)
+    cp = sim.checkpoint()
+    sim.events['timestep_end'].append(timestep_end)
+    sim.run(until=22)
+    assert errors == ["Simulation state can only be saved or restored while the simulation is paused"]
+
+    sim.duration = 30
+    sim.resume()
+
+    with pytest.raises(CheckpointError, match='finished'):
+        sim.checkpoint()
+
+    with pytest.raises(CheckpointError, match='finished'):
+        sim.restore(cp)
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="Branching requires os.fork()")
+def test_branch(sim):
+    top = Top('top', None)
+    sim.run(until=22)
+
+    def run_to(until):
+        def func(sim):
+            sim.run(until=until)
+            return (sim.time, int(top.cnt.read()))
+
+        return func
+
+    def fail(sim):
+        raise ValueError("branch failure")
+
+    assert sim.branch([run_to(40), run_to(80)]) == [(40, 4), (80, 8)]
+    # Branches run in the children, the parent stays paused
+    assert (sim.time, int(top.cnt.read())) == (22, 2)
+
+    with pytest.raises(CheckpointError) as excinfo:
+        sim.branch([run_to(40), fail], jobs=1)
+
+    assert 'Branch 1 failed' in str(excinfo.value)
+    assert 'ValueError: branch failure' in str(excinfo.value)
+    assert 'Branch 0' not in str(excinfo.value)
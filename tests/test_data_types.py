@@ -3,8 +3,13 @@ Created on Dec 25, 2014
 
 @author: bvukobratovic
 '''
-from sydpy import Bit, Vector
+from sydpy import Bit, Vector, Struct, Array, ByteArray, Signed, Fixed, Enum, bit, bit8, bit32, ConversionError
+from sydpy.types._type_base import _converters, convgen
+from sydpy.types.bit import bitstr_many
+import copy
 from random import randint 
+import pytest
+import zlib
 
 def test_bit():
     # Test Bit initialization and conversion to hex
@@ -37,4 +42,294 @@ def test_bit():
 def test_vector():
     pass
 
+def test_conv_memoized():
+    b16 = Bit(16)
+    assert int(b16.conv(5)) == 5
+    assert (b16, int) in _converters
+    assert int(b16.conv(7)) == 7
+    
+    # Failed conversion between sydpy types is memoized
+    with pytest.raises(ConversionError):
+        bit8.conv(b16(5))
+    assert _converters[(bit8, b16)] is None
+    with pytest.raises(ConversionError):
+        bit8.conv(b16(5))
+    
+    # Failed conversion of a string depends on the value
+    with pytest.raises(ConversionError):
+        bit8.conv('zz')
+    assert int(bit8.conv('0x12')) == 0x12
+    
+def test_conv_memoized_fallback():
+    class Src(object):
+        def __init__(self, v):
+            self.v = v
+            
+        def _to_bit(self, cls):
+            if self.v < 0:
+                raise ConversionError
+            
+            return cls(100 // self.v)
+    
+    assert int(bit8.conv(Src(4))) == 25
+    assert (bit8, Src) in _converters
+    with pytest.raises(ConversionError):
+        bit8.conv(Src(-1))
+    
+    # Errors other than the failed conversion are not masked
+    with pytest.raises(ZeroDivisionError):
+        bit8.conv(Src(0))
+    
+    # Proxy takes the conversion method from the value it wraps, like Intf
+    class Proxy(object):
+        def __init__(self, wrapped):
+            self.wrapped = wrapped
+            
+        def __getattr__(self, name):
+            return getattr(self.wrapped, name)
+    
+    assert int(bit8.conv(Proxy(Src(5)))) == 20
+    assert (bit8, Proxy) not in _converters
+    assert int(bit8.conv(Proxy(bit8(7)))) == 7
+
+def test_interned():
+    # Test that the committed small values are shared
+    assert bit8(5)._frozen_copy() is bit8(5)._frozen_copy()
+    assert bit8.conv(5)._frozen_copy() is bit8._interned[5]
+    assert bit8(5)._frozen_copy()._frozen
+    assert bit8(0, 0)._frozen_copy() is not bit8(0, 0)._frozen_copy()
+    
+    # Converted and computed values remain private, for all the widths
+    for dtype in (bit8, Bit(16)):
+        x = dtype.conv(1) + 1
+        x[0] = 1
+        assert int(x) == 3
+        
+        y = ~dtype.conv(0)
+        y[0] = 0
+        assert int(y) == dtype._mask - 1
+        assert dtype.conv(5) is not dtype.conv(5)
+    
+    b16 = Bit(16)
+    assert b16(5)._frozen_copy() is not b16(5)._frozen_copy()
+    b16.intern_range(16)
+    assert b16(5)._frozen_copy() is b16(5)._frozen_copy()
+    assert b16(16)._frozen_copy() is not b16(16)._frozen_copy()
+    b16._interned = None
+
+def test_packed():
+    # Test that the packed struct keeps the first field in the low bits
+    p_type = Struct(('addr', Bit(12)), ('data', bit8), ('last', bit), packed=True)
+    p_val = p_type([0x123, 0x45, 1])
+    assert p_val.val == 0x145123
+    assert p_val.addr == 0x123
+    assert p_val['data'] == 0x45
+    assert p_val[2] == 1
+    assert str(p_val[0:2]) == "(0x123,0x45)"
+    assert str(p_val._replace('data', None)) == "(0x123,0xUU,0x1)"
+    assert p_type.conv(Bit(21)(0x145123)) == p_val
+    assert Bit(21).conv(p_val).val == 0x145123
+    assert p_type.conv({'data': 0x45}).data == 0x45
+    
+    with pytest.raises(TypeError):
+        Struct(('data', Array(bit8)), packed=True)
+    
+    v_type = Vector(4, bit8, packed=True)
+    v_val = v_type.conv(Bit(32)(0x04030201))
+    assert len(v_val) == 4
+    assert [int(e) for e in v_val] == [1, 2, 3, 4]
+    assert [int(e) for e, _ in bit8._convgen(v_val)] == [1, 2, 3, 4]
+    assert v_type._key_mask(1) == 0xff00
+    
+    with pytest.raises(TypeError):
+        p_val._freeze()['addr'] = 0
+
+def test_byte_array():
+    b_type = ByteArray()
+    b_val = b_type.conv(b'sydpy')
+    assert zlib.crc32(b_val) == zlib.crc32(b'sydpy')
+    assert b_val[1:3].tobytes() == b'yd'
+    assert b_type.conv(Array(bit8)([1, 2])) == b'\x01\x02'
+    assert b_type.conv(Bit(16)(0x0201)) == b'\x01\x02'
+    assert [int(e) for e, _ in bit8._convgen(b_val)] == list(b'sydpy')
+    assert str(b_val._replace(0, 0x53)) == "[0x53,0x79,0x64,0x70,0x79]"
+    
+    # Views of the shared value are read-only
+    b_val._freeze()
+    with pytest.raises(TypeError):
+        b_val[1:3][0] = 0
+    with pytest.raises(TypeError):
+        b_val.append(0)
+    
+    b_ext_val = b_val
+    b_ext_val += [0x21]
+    assert len(b_val) == 5
+    assert b_ext_val == b'sydpy!'
+    
+    # Struct is gathered into the buffer in the order of the convgen()
+    s_type = Struct(('dest', Vector(2, bit8)), ('len_type', Bit(16)), ('data', Array(bit8)))
+    s_val = s_type([[1, 2], 0x0800, [3, 4, 5]])
+    assert b_type.conv(s_val) == bytes(int(b) for b in convgen(s_val, bit8))
+    assert b_type.conv(s_val) == b'\x01\x02\x00\x08\x03\x04\x05'
+    
+    # Exported for the star imports of the designs
+    names = {}
+    exec('from sydpy import *', names)
+    assert names['ByteArray'] is ByteArray
+
+def test_conv_plan():
+    b12 = Bit(12)
+    
+    # Plan yields the same values and remains as the generic search
+    for src in [Bit(40)(0x123456789a), Bit(4)(0xa)]:
+        remain = b12(0x5, 0xf)
+        assert [(str(d), str(r)) for d, r in b12._convgen(src, remain)] == \
+               [(str(d), str(r)) for d, r in b12._convgen_search(src, remain)]
+    
+    # Remain of one conversion is completed by the next one
+    conv_gen = bit32._convgen(Bit(24)(0x030201))
+    with pytest.raises(StopIteration) as e:
+        next(conv_gen)
+    
+    data, _ = next(bit32._convgen(bit8(0x04), e.value.value))
+    assert int(data) == 0x04030201
+    
+    b_val = ByteArray().conv(b'\x01\x02\x03\x04\x05')
+    assert [int(d) for d, _ in bit32._convgen(b_val)] == [0x04030201]
+
+def test_bit_str():
+    b_val = Bit(12)(0x05c, 0x0ff)
+    assert str(b_val) == "0xU5c"
+    assert b_val.bitstr() == "0bUUUU01011100"
+    assert Bit(12)(str(b_val)) == b_val
+    assert Bit(8)("0x1x").vld == 0xf0
+    assert Bit(4)("0b1u0z").vld == 0b1010
+    
+    wide_val = Bit(1024)(1 << 1000)
+    assert str(wide_val) == '0x' + '0'*5 + '1' + '0'*250
+    assert Bit(1024)(str(wide_val)) == wide_val
+    
+    assert bitstr_many([bit(1), Bit(4)(0x3, 0x3), bit8(0xa5)]) == \
+           ['1', 'UU11', '10100101']
+
+def test_four_state():
+    # Valid zero makes the AND valid, valid one makes the OR valid
+    a_val = Bit(4)(0b0101, 0b0011)
+    b_val = Bit(4)(0b0000, 0b1111)
+    assert (a_val & b_val) == Bit(4)(0b0000, 0b1111)
+    assert (a_val | b_val) == Bit(4)(0b0001, 0b0011)
+    assert (a_val ^ b_val) == Bit(4)(0b0001, 0b0011)
+    assert ~a_val == Bit(4)(0b0010, 0b0011)
+    
+    # Sum is valid below the lowest invalid operand bit
+    assert (a_val + 1) == Bit(4)(0b0010, 0b0011)
+    assert (bit8(0xff) + 1) == 0
+    assert (3 - bit8(4)) == 0xff
+    
+    np = pytest.importorskip('numpy')
+    pairs = np.array([[1, 0xff], [2, 0x0f]], dtype=np.uint64)
+    assert bit8.batch('add', pairs, 0xff).tolist() == [[0, 0xff], [1, 0x0f]]
+    assert bit8.batch('and_', pairs, pairs).tolist() == [[1, 0xff], [2, 0x0f]]
+
+def test_signed_fixed():
+    s8 = Signed(8)
+    assert int(s8(-3)) == -3
+    assert s8(-3) == Bit(8)(0xfd)
+    assert int(s8(127) + 1) == -128
+    assert int(Signed(8, saturate=True)(127) + 1) == 127
+    assert int(Signed(8, saturate=True)(-100) * 2) == -128
+    assert int(s8(-8) >> 1) == -4
+    
+    q8 = Fixed(16, 8)
+    assert float(q8(1.5) * q8(-2.25)) == -3.375
+    assert float(q8(1.5) / 2) == 0.75
+    assert q8.conv(s8(-3)) == -3
+    assert s8.conv(q8(-2.5)) == -3
+    assert q8.conv(Bit(16)(0x0180)) == 1.5
+    
+    # Comparisons are exact beyond the float precision
+    s64 = Signed(64)
+    assert s64(2**62 + 1) < s64(2**62 + 2)
+    assert s64(2**62 + 2) > 2**62 + 1
+    assert s64(-2**62 - 1) <= -2**62 - 1 and not (s64(-2**62 - 1) < -2**62 - 1)
+    assert q8(1.0) < 1.001 and q8(-0.5) >= -0.5
+    assert Fixed(16, 4)(1.0) != q8(1.0625) and Fixed(16, 4)(1.0) < q8(1.0625)
+    
+    # Values with the invalid bits are unordered
+    assert not (s8(0, 0) < 1) and not (s8(0, 0) >= 1) and not (s8(1) > s8(0, 0))
+    
+    np = pytest.importorskip('numpy')
+    q8_sat = Fixed(16, 8, saturate=True)
+    raw = q8_sat.quantize([1.5, -0.5, 200.0])
+    assert raw.tolist() == [0x180, -0x80, 0x7fff]
+    assert q8_sat.dequantize(q8_sat.batch('add', raw, raw)).tolist() == [3.0, -1.0, 0x7fff / 256]
+
+def test_enum():
+    states = Enum('idle', 'conv')
+    state = states.conv('conv')
+    assert state is states.conv('conv')
+    assert state == 'conv' and state != 'idle' and state != 'none'
+    assert state == states('conv') and int(state) == 1
+    assert state in ('idle', 'conv') and state == ['conv']
+    assert {'idle': 0, 'conv': 1}[state] == 1
+    
+    # Values do not equal the indexes, which hash differently
+    assert state != 1 and state not in {1: 'conv'}
+    assert hash(state) == hash(states(1)) == hash('conv')
+    
+    with pytest.raises(ConversionError):
+        states.conv('none')
+    
+    with pytest.raises(ConversionError):
+        states.conv(2)
+    
+    for i in (2, -1):
+        with pytest.raises(Exception, match='Cannot convert to enum!'):
+            states(i)
+
+def test_rnd_take():
+    from sydpy.rnd import rnd
+    
+    for dtype in (Bit(70), Vector(4, Bit(3)), Struct(('a', bit8), ('b', Signed(4))), Array(bit8, 10)):
+        vals = [str(v) for v in rnd(dtype, 7).take(50)]
+        r = rnd(dtype, 7, batch=16)
+        assert [str(next(r)) for _ in range(20)] + [str(v) for v in r.take(30)] == vals
+
+def test_struct_copy():
+    s_type = Struct(('addr', bit32), ('data', Array(bit8)), ('last', bit))
+    s_val = s_type([5, [1, 2, 3], 1])
+    
+    s_copy = copy.copy(s_val)
+    assert str(s_copy) == "(0x00000005,[0x01,0x02,0x03],0x1)"
+    assert s_copy.addr is s_val.addr
+    
+    s_deep = copy.deepcopy(s_val)
+    assert str(s_deep) == "(0x00000005,[0x01,0x02,0x03],0x1)"
+    assert s_deep.data is not s_val.data
+    
+    with pytest.raises(AttributeError):
+        s_val.size
+
+def test_frozen():
+    # Test that the shared values get replaced instead of being modified
+    s_type = Struct(('addr', bit32), ('data', Array(bit8)))
+    s_val = s_type([1, [1, 2]])._freeze()
+    s_repl_val = s_val._replace(1, [3])
+    assert str(s_val) == "(0x00000001,[0x01,0x02])"
+    assert str(s_repl_val) == "(0x00000001,[0x03])"
+    assert s_type.conv(s_val) is s_val
+    
+    b_val = Bit(16)(0xff)._freeze()
+    with pytest.raises(TypeError):
+        b_val[0] = 0
+    
+    assert int(b_val._replace(0, 0)) == 0xfe
+    assert int(b_val) == 0xff
+    
+    a_val = Array(bit8)([1, 2])._freeze()
+    a_ext_val = a_val
+    a_ext_val += [3]
+    assert len(a_val) == 2
+    assert len(a_ext_val) == 3
+
 print(Bit(16)("0xfb"))
\ No newline at end of file
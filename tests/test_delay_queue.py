@@ -0,0 +1,93 @@
+from sydpy._delay_queue import DelayQueue
+from random import randint, seed
+
+def test_order():
+    q = DelayQueue(wheel_bits=4)
+    
+    # Mix of the wheel and heap entries, with some sharing the timestamp
+    q.push('a', 5)
+    q.push('b', 100)
+    q.push('c', 5)
+    q.push('d', 3)
+    q.push('e', 2.5)
+    
+    assert q.peek_time() == 2.5
+    assert q.pop_next() == (2.5, ['e'])
+    assert q.pop_next() == (3, ['d'])
+    assert q.pop_next() == (5, ['a', 'c'])
+    assert q.pop_next() == (100, ['b'])
+    assert q.pop_next() is None
+    assert not q
+
+def test_cancel():
+    q = DelayQueue(wheel_bits=4)
+    
+    q.push('a', 1)
+    q.push('b', 1)
+    q.push('c', 50)
+    q.cancel('a')
+    q.cancel('c')
+    q.cancel('missing')
+    
+    # Rescheduling cancels the previous entry
+    q.push('b', 7)
+    
+    assert len(q) == 1
+    assert q.pop_next() == (7, ['b'])
+    assert q.pop_next() is None
+    
+    stats = q.stats()
+    assert stats['cancels'] == 2
+    assert stats['stale'] == 3
+
+def test_against_reference():
+    seed(0)
+    q = DelayQueue(wheel_bits=3)
+    ref = {}
+    now = 0
+    
+    for _ in range(200):
+        for p in range(randint(0, 5)):
+            proc = randint(0, 30)
+            t = now + randint(0, 20)
+            q.push(proc, t)
+            ref[proc] = t
+            
+        for p in range(randint(0, 2)):
+            proc = randint(0, 30)
+            q.cancel(proc)
+            ref.pop(proc, None)
+        
+        res = q.pop_next()
+        if not ref:
+            assert res is None
+            continue
+        
+        now = min(ref.values())
+        expected = {p for p, t in ref.items() if t == now}
+        assert res[0] == now
+        assert set(res[1]) == expected
+        
+        for p in expected:
+            del ref[p]
+
+def test_restore():
+    q = DelayQueue(wheel_bits=3)
+    for p, t in [('a', 5), ('b', 20), ('c', 5), ('d', 9)]:
+        q.push(p, t)
+    
+    assert q.pop_next() == (5, ['a', 'c'])
+    
+    items = q.items()
+    now = q._now
+    
+    assert q.pop_next() == (9, ['d'])
+    q.push('e', 12)
+    
+    q.restore(items, now)
+    
+    assert len(q) == 2
+    assert 'e' not in q
+    assert q.pop_next() == (9, ['d'])
+    assert q.pop_next() == (20, ['b'])
+    assert q.pop_next() is None
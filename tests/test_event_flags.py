@@ -0,0 +1,27 @@
+from sydpy._event import EventSet, Event, EV_CHANGED, EV_POSEDGE, _key_mask
+
+def test_flags():
+    es = EventSet('e', None)
+    assert es.flags == 0
+    
+    changed = es['changed']
+    es['posedge']
+    es['custom']
+    assert es.flags == EV_CHANGED | EV_POSEDGE
+    
+    es.comp.clear()
+    es.comp['changed'] = changed
+    es._update_flags()
+    assert es.flags == EV_CHANGED
+
+def test_key_mask():
+    assert _key_mask(3) == 0b1000
+    assert _key_mask(slice(1, 3)) == 0b1110
+    assert _key_mask(slice(3, 1)) == 0b1110
+    assert _key_mask('addr') is None
+
+def test_subevents():
+    es = EventSet('e', None)
+    sube = es['event_def'][slice(0, 1)]
+    assert sube is es['event_def'][slice(0, 1)]
+    assert sube.mask == 0b11
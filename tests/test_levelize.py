@@ -0,0 +1,33 @@
+import pytest
+from sydpy._levelize import levelize, CombLoopError
+
+class Proc(object):
+    def __init__(self, name, inputs, outputs):
+        self.name = name
+        self.senslist = tuple(inputs)
+        self.outputs = set(outputs)
+
+def names(levels):
+    return [[p.name for p in level] for level in levels]
+
+def test_levels():
+    a, b, c, x, y = ['a', 'b', 'c', 'x', 'y']
+    procs = [Proc('p3', [y, b], [c]),
+             Proc('p2', [x], [y]),
+             Proc('p1', [a], [x]),
+             Proc('p0', [a], [b])]
+    
+    assert names(levelize(procs)) == [['p1', 'p0'], ['p2'], ['p3']]
+
+def test_self_dependency_ignored():
+    procs = [Proc('p0', ['a', 'x'], ['x'])]
+    
+    assert names(levelize(procs)) == [['p0']]
+
+def test_loop():
+    procs = [Proc('p0', ['a', 'y'], ['x']),
+             Proc('p1', ['x'], ['y']),
+             Proc('p2', ['a'], ['b'])]
+    
+    with pytest.raises(CombLoopError):
+        levelize(procs)
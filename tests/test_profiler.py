@@ -0,0 +1,99 @@
+import json
+from sydpy._profiler import KernelProfiler
+from sydpy import ddic, compinit, Component, Process, isig, Delay, bit, bit8, \
+    Simulator, Scheduler
+
+class Proc(object):
+    def __init__(self, name):
+        self.name = name
+
+class Sim(object):
+    def __init__(self):
+        self.trig_pool = []
+        self.update_pool = []
+        self.events = {'timestep_end': []}
+        self.delta_count = 0
+
+def test_rollup_and_export():
+    sim = Sim()
+    prof = KernelProfiler(sim)
+    
+    assert sim.profiler is prof
+    
+    p0 = Proc('top/a/p0')
+    p1 = Proc('top/b/p1')
+    
+    def act(n_trig, n_upd):
+        sim.trig_pool.extend([None]*n_trig)
+        sim.update_pool.extend([None]*n_upd)
+        return 'done'
+    
+    assert prof.measure(p0, act, 1, 2) == 'done'
+    prof.measure(p0, act, 0, 1)
+    prof.measure(p1, act, 2, 0)
+    
+    for d in [1, 3, 1]:
+        sim.delta_count = d
+        prof._timestep_end(0, sim)
+    
+    procs = prof.process_stats()
+    assert procs['top/a/p0']['activations'] == 2
+    assert procs['top/a/p0']['events'] == 1
+    assert procs['top/a/p0']['updates'] == 3
+    
+    comps = prof.component_stats()
+    assert comps['top']['activations'] == 3
+    assert comps['top']['events'] == 3
+    assert comps['top/b']['activations'] == 1
+    
+    assert prof.delta_histogram() == {1: 2, 3: 1}
+    assert json.loads(prof.to_json())['delta_histogram'] == {'1': 2, '3': 1}
+    assert prof.to_folded(metric='activations') == "top;a;p0 2\ntop;b;p1 1\n"
+    
+    prof.detach()
+    assert sim.profiler is None
+    assert not sim.events['timestep_end']
+
+def test_simulator_profile():
+    sim = Simulator(Scheduler(), profile=True)
+    ddic.provide('sim', sim)
+    
+    class Counter(Component):
+        @compinit
+        def __init__(self, name, parent, **kwargs):
+            Component.__init__(self, name, parent)
+            self.clk = isig('clk', self, dtype=bit, dflt=0)
+            self.cnt = isig('cnt', self, dtype=bit8, dflt=0)
+            Process('p_clk', self, self.p_clk, senslist=[Delay(5)])
+            Process('p_cnt', self, self.p_cnt, senslist=[self.clk.e['posedge']])
+    
+        def p_clk(self):
+            self.clk <<= ~self.clk.read()
+    
+        def p_cnt(self):
+            self.cnt <<= self.cnt.read() + 1
+    
+    top = Counter('top', None)
+    sim.duration = 50
+    sim.run()
+    
+    prof = sim.profiler
+    procs = prof.process_stats()
+    assert int(top.cnt.read()) == 5
+    # Initial activations at time 0 are counted as well
+    assert procs['top/p_clk']['activations'] == 11
+    assert procs['top/p_cnt']['activations'] == 6
+    assert procs['top/p_clk']['updates'] == 10
+    # Clock updates trigger the posedge on every other edge
+    assert procs['top/p_clk']['events'] == 5
+    assert procs['top/p_cnt']['events'] == 0
+    
+    # Rising clock edges take three delta cycles, the counter being updated 
+    # in the last one
+    assert prof.delta_histogram() == {1: 6, 3: 5}
+    
+    data = json.loads(prof.to_json())
+    assert data['delta_histogram'] == {'1': 6, '3': 5}
+    assert data['processes']['top/p_cnt']['updates'] == 5
+    assert data['components']['top']['activations'] == 17
+    assert prof.to_folded(metric='events') == "top;p_clk 5\ntop;p_cnt 0\n"
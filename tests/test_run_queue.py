@@ -0,0 +1,54 @@
+from sydpy._run_queue import RunQueue
+
+class Obj(object):
+    def __init__(self, name):
+        self.name = name
+
+def test_order_and_dedup():
+    objs = [Obj(i) for i in range(5)]
+    q = RunQueue()
+    
+    for i in [3, 1, 3, 4, 1, 0]:
+        q.add(objs[i])
+    
+    assert len(q) == 4
+    assert objs[3] in q
+    assert objs[2] not in q
+    assert [o.name for o in q.swap()] == [3, 1, 4, 0]
+    assert not q
+    
+def test_generations():
+    a, b = Obj('a'), Obj('b')
+    q1 = RunQueue()
+    q2 = RunQueue()
+    
+    q1.add(a)
+    q2.add(b)
+    batch = q1.swap()
+    
+    # Objects from the taken batch can be queued again
+    q1.add(a)
+    q1.add(b)
+    q1.add(a)
+    
+    assert batch == [a]
+    assert q1.swap() == [a, b]
+    assert q2.swap() == [b]
+    
+def test_interleaved_queues():
+    a, b = Obj('a'), Obj('b')
+    q1 = RunQueue()
+    q2 = RunQueue()
+    
+    # Queuing an object elsewhere does not hide that it is already queued
+    q1.add(a)
+    q2.add(a)
+    q1.add(a)
+    q2.add(b)
+    q1.add(b)
+    q2.add(a)
+    
+    assert a in q1 and a in q2
+    assert q1.swap() == [a, b]
+    assert q2.swap() == [a, b]
+    assert a not in q1
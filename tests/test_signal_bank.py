@@ -0,0 +1,62 @@
+import pytest
+from sydpy import ddic, bit8
+from sydpy._event import EventSet
+from sydpy._signal_bank import SignalBank
+
+class Sim(object):
+    def __init__(self):
+        self.update_pool = []
+        self.trig_pool = []
+        
+    def update(self, sig):
+        self.update_pool.append(sig)
+        
+    def trigger(self, event):
+        self.trig_pool.append(event.name.rsplit('/', 1)[-1])
+
+class Intf(object):
+    def __init__(self, name):
+        self.e = EventSet(name, None)
+
+@pytest.fixture(params=['vector', 'scalar'])
+def bank(request):
+    ddic.provide('sim', Sim())
+    bank = SignalBank(bit8, 4, dflt=0)
+    if request.param == 'scalar':
+        bank._views = None
+    return bank
+
+def test_update(bank):
+    intfs = [Intf('i{}'.format(i)) for i in range(4)]
+    bank.attach(intfs)
+    intfs[1].e['changed']
+    intfs[2].e['updated']
+    sim = ddic['sim']
+    
+    bank[1].write(5)
+    bank[2].write(0)
+    bank[3].write(7)
+    assert sim.update_pool == [bank]
+    assert int(bank[1].read()) == 0
+    assert int(bank[1]._next) == 5
+    
+    bank._update()
+    assert sim.trig_pool == ['updated', 'changed']
+    assert [int(s.read()) for s in bank] == [0, 5, 0, 7]
+
+def test_state(bank):
+    bank[0].write(3)
+    state = bank.state()
+    bank._update()
+    bank[0].write(4)
+    bank._update()
+    assert int(bank[0].read()) == 4
+    
+    bank.restore(state)
+    assert int(bank[0].read()) == 0
+    bank._update()
+    assert int(bank[0].read()) == 3
+
+def test_dtype():
+    with pytest.raises(TypeError):
+        SignalBank(int, 4)
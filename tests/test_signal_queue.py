@@ -0,0 +1,76 @@
+import pytest
+from sydpy import ddic
+from sydpy._signal import Signal, SignalQueueEmpty, SignalQueueFull
+
+class Sim(object):
+    def __init__(self):
+        self.updated = []
+        
+    def update(self, sig):
+        self.updated.append(sig)
+
+class Ev(object):
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+        
+    def trigger(self):
+        self.log.append(self.name)
+
+class EvSet(object):
+    def __init__(self, names):
+        self.log = []
+        self.comp = {n: Ev(n, self.log) for n in names}
+        
+    def __getitem__(self, name):
+        return self.comp[name]
+
+@pytest.fixture(autouse=True)
+def sim():
+    ddic.provide('sim', Sim())
+
+def make_sig(**kwargs):
+    return Signal(val=0, event_set=EvSet(['enqueued', 'full', 'empty']), **kwargs)
+
+def test_fifo_order():
+    sig = make_sig()
+    for i in range(1000):
+        sig.push(i)
+    
+    assert [sig.pop() for _ in range(10)] == list(range(10))
+    assert sig.pop_many(5) == list(range(10, 15))
+    assert sig.pop_many() == list(range(15, 1000))
+    assert sig._next == 999
+    
+    with pytest.raises(SignalQueueEmpty):
+        sig.pop_many()
+
+def test_capacity():
+    sig = make_sig(capacity=4)
+    sig.push_many([1, 2, 3])
+    
+    with pytest.raises(SignalQueueFull):
+        sig.push_many([4, 5])
+        
+    assert list(sig.get_queue()) == [1, 2, 3]
+    
+    sig.push(4)
+    with pytest.raises(SignalQueueFull):
+        sig.push(5)
+
+def test_watermark_events():
+    sig = make_sig(capacity=8, high_water=3)
+    sig.push_many([1, 2])
+    assert 'full' not in sig.e.log
+    
+    sig.push(3)
+    assert sig.e.log.count('full') == 1
+    
+    sig.push(4)
+    assert sig.e.log.count('full') == 1
+    
+    sig.pop_many(3)
+    assert 'empty' not in sig.e.log
+    
+    sig.pop()
+    assert sig.e.log.count('empty') == 1
@@ -0,0 +1,320 @@
+import pytest
+from sydpy import ddic, compinit, Component, Process, isig, Delay, bit, bit8, \
+    bit32, Bit, Struct, Array, Simulator, Scheduler, always_method
+from sydpy.process import BlockingCallError
+
+@pytest.fixture
+def sim():
+    sim = Simulator(Scheduler())
+    ddic.provide('sim', sim)
+    return sim
+
+class Counter(Component):
+    @compinit
+    def __init__(self, name, parent, **kwargs):
+        Component.__init__(self, name, parent)
+        self.clk = isig('clk', self, dtype=bit, dflt=0)
+        self.cnt = isig('cnt', self, dtype=bit8, dflt=0)
+        Process('p_clk', self, self.p_clk, senslist=[Delay(5)])
+        self.proc_cnt = Process('p_cnt', self, self.p_cnt, senslist=[self.clk.e['posedge']])
+
+    def p_clk(self):
+        self.clk <<= ~self.clk.read()
+
+    def p_cnt(self):
+        self.cnt <<= self.cnt.read() + 1
+
+def test_static_sens(sim):
+    top = Counter('top', None)
+    proc = top.proc_cnt
+    sens = proc.static_sens
+    posedge = top.clk.e['posedge']
+    states = []
+
+    assert sens is not None
+
+    def timestep_end(time, sim):
+        # Process stays subscribed through the StaticSens between the
+        # activations, and is re-armed after each of them
+        states.append(proc.armed and sens.subscribed and (list(posedge.pool) == [sens]))
+        return True
+
+    sim.events['timestep_end'].append(timestep_end)
+    sim.duration = 92
+    sim.run()
+
+    assert len(states) == 19 and all(states)
+    # Initial activation only arms the process, posedges are at 5, 15, ...
+    assert int(top.cnt.read()) == 9
+
+class MethodCounter(Component):
+    @compinit
+    def __init__(self, name, parent, block=False, **kwargs):
+        Component.__init__(self, name, parent)
+        self.clk = isig('clk', self, dtype=bit, dflt=0)
+        self.cnt = isig('cnt', self, dtype=bit8, dflt=0)
+        self.times = []
+        Process('p_clk', self, self.p_clk, senslist=[Delay(5)])
+
+        @always_method(self, self.clk.e['posedge'])
+        def m_cnt():
+            self.times.append(ddic['sim'].time)
+            self.cnt <<= self.cnt.read() + 1
+
+            if block:
+                ddic['sim'].wait(Delay(1))
+
+        self.proc_cnt = m_cnt
+
+    def p_clk(self):
+        self.clk <<= ~self.clk.read()
+
+def test_method_process(sim):
+    top = MethodCounter('top', None)
+    sim.duration = 50
+    sim.run()
+
+    assert top.proc_cnt.is_method
+    assert top.times == [5, 15, 25, 35, 45]
+    assert int(top.cnt.read()) == 5
+
+def test_method_process_blocking(sim):
+    top = MethodCounter('top', None, block=True)
+    sim.duration = 50
+
+    with pytest.raises(BlockingCallError):
+        sim.run()
+
+    assert top.times == [5]
+
+def test_hooks_mid_run(sim):
+    top = Counter('top', None)
+    sim.duration = 100
+    
+    # Main loop skips the hook points without callbacks
+    assert sim._bind_hooks() == [None]*6
+    
+    starts = []
+    deltas = []
+    
+    # Callbacks stay registered while they return True
+    def timestep_start(time, sim):
+        starts.append(time)
+        return True
+    
+    def delta_end(time, delta_count, sim):
+        deltas.append(time)
+        return True
+    
+    def timestep_end(time, sim):
+        # Hooks changed from within a hook take effect in the same run
+        if time == 20:
+            sim.events['timestep_start'].append(timestep_start)
+        elif time == 30:
+            sim.events['delta_end'].append(delta_end)
+        elif time == 50:
+            sim.events['timestep_start'].remove(timestep_start)
+            return False
+        
+        return True
+    
+    sim.events['timestep_end'].append(timestep_end)
+    sim.run()
+    
+    assert starts == [25, 30, 35, 40, 45, 50]
+    assert deltas and (min(deltas) == 35) and (max(deltas) == 100)
+    assert sim.events['timestep_end'] == []
+
+class CombChain(Component):
+    @compinit
+    def __init__(self, name, parent, clocked=False, **kwargs):
+        Component.__init__(self, name, parent)
+        self.clk = isig('clk', self, dtype=bit, dflt=0)
+        self.r = isig('r', self, dtype=bit8, dflt=0)
+        self.c0 = isig('c0', self, dtype=bit8, dflt=0)
+        self.c1 = isig('c1', self, dtype=bit8, dflt=0)
+        self.c2 = isig('c2', self, dtype=bit8, dflt=0)
+        self.acts = []
+        Process('p_clk', self, self.p_clk, senslist=[Delay(5)])
+        Process('p_reg', self, self.p_reg, senslist=[self.clk.e['posedge']])
+        # Registered in the reverse order, so that they need to be sorted
+        Process('comb2', self, self.comb2)
+        Process('comb1', self, self.comb1)
+        Process('comb0', self, self.comb0)
+
+        if clocked:
+            # Clocked process sampling the combinational outputs, and the 
+            # process waiting on the register it writes
+            self.s = isig('s', self, dtype=bit8, dflt=0)
+            Process('p_smp', self, self.p_smp, senslist=[self.clk.e['posedge']])
+            Process('p_mon', self, self.p_mon, senslist=[self.s.e['changed']])
+
+    def p_clk(self):
+        self.clk <<= ~self.clk.read()
+
+    def p_reg(self):
+        self.acts.append(('p_reg', ddic['sim'].time, ddic['sim'].delta_count))
+        self.r <<= self.r.read() + 1
+
+    def p_smp(self):
+        self.acts.append(('p_smp', ddic['sim'].time, ddic['sim'].delta_count, int(self.c2.read())))
+        self.s <<= self.c2.read()
+
+    def p_mon(self):
+        self.acts.append(('p_mon', ddic['sim'].time, ddic['sim'].delta_count, 
+                          int(self.s.read()), int(self.r.read())))
+
+    def comb0(self):
+        self.c0 <<= self.r + 1
+
+    def comb1(self):
+        self.c1 <<= self.c0 + self.r
+
+    def comb2(self):
+        self.c2 <<= self.c1 ^ self.c0
+
+def count_deltas(sim):
+    deltas = [0]
+
+    def delta_end(time, delta_count, sim):
+        deltas[0] += 1
+        return True
+
+    sim.events['delta_end'].append(delta_end)
+    return deltas
+
+def run_comb_chain(cycle_based, clocked=False):
+    sim = Simulator(Scheduler(), duration=60, cycle_based=cycle_based)
+    ddic.provide('sim', sim)
+    top = CombChain('top', None, clocked=clocked)
+    deltas = count_deltas(sim)
+    log = []
+
+    def timestep_end(time, sim):
+        log.append((time, [int(s.read()) for s in (top.r, top.c0, top.c1, top.c2)]))
+        return True
+
+    sim.events['timestep_end'].append(timestep_end)
+    sim.run()
+
+    return sim, top, log, deltas[0]
+
+def test_cycle_based_equivalence():
+    ev_sim, _, ev_log, ev_deltas = run_comb_chain(False)
+    cb_sim, _, cb_log, cb_deltas = run_comb_chain(True)
+
+    assert cb_sim.levelize_error is None
+    assert [[p.name for p in l] for l in cb_sim.cycle_sched.levels] == \
+        [['top/comb0'], ['top/comb1'], ['top/comb2']]
+
+    assert cb_log == ev_log
+    assert ev_log[-1] == (60, [6, 7, 13, 10])
+    assert cb_deltas < ev_deltas
+
+def test_cycle_based_clocked():
+    ev_sim, ev_top, ev_log, ev_deltas = run_comb_chain(False, clocked=True)
+    cb_sim, cb_top, cb_log, cb_deltas = run_comb_chain(True, clocked=True)
+
+    assert [[p.name for p in l] for l in cb_sim.cycle_sched.levels] == \
+        [['top/comb0'], ['top/comb1'], ['top/comb2']]
+
+    # Processes outside of the sweep are woken up in the same delta cycles 
+    # as in the event-driven mode
+    assert cb_top.acts == ev_top.acts
+    assert ('p_smp', 55, 2, 13) in ev_top.acts
+    assert ('p_mon', 55, 4, 13, 6) in ev_top.acts
+    assert cb_log == ev_log
+    assert cb_deltas < ev_deltas
+
+def counter_state(sim, top, deltas):
+    return (sim.time, int(top.clk.read()), int(top.cnt.read()), deltas[0])
+
+def test_run_step_resume(sim):
+    top = Counter('top', None)
+    sim.duration = 100
+    deltas = count_deltas(sim)
+    
+    # Pause at until, also when no process is scheduled at that time
+    assert sim.run(until=22)
+    assert sim.time == 22
+    assert int(top.cnt.read()) == 2
+    
+    paused_deltas = deltas[0]
+    assert sim.step(3)
+    assert deltas[0] == paused_deltas + 3
+    
+    assert sim.run_until(lambda s: int(top.cnt.read()) == 5)
+    assert (sim.time, int(top.cnt.read())) == (45, 5)
+    
+    assert not sim.resume()
+    assert not sim.run(until=200)
+    paused_state = counter_state(sim, top, deltas)
+    
+    # Uninterrupted run reaches the same state
+    sim = Simulator(Scheduler(), duration=100)
+    ddic.provide('sim', sim)
+    top = Counter('top', None)
+    deltas = count_deltas(sim)
+    assert not sim.run()
+    
+    assert counter_state(sim, top, deltas) == paused_state
+
+Transaction = Struct(('addr', bit32), ('data', Array(bit8)))
+
+class Writer(Component):
+    @compinit
+    def __init__(self, name, parent, **kwargs):
+        Component.__init__(self, name, parent)
+        self.trans = isig('trans', self, dtype=Transaction, dflt=Transaction())
+        self.word = isig('word', self, dtype=Bit(16), dflt=0)
+        self.mine = []
+        Process('p_write', self, self.p_write, senslist=[Delay(5)])
+
+    def p_write(self):
+        trans = Transaction([1, [2, 3]])
+        word = Bit(16)(3)
+        self.trans <<= trans
+        self.word <<= word
+        self.mine = [trans, word]
+
+def test_shared_values(sim):
+    top = Writer('top', None)
+    sim.duration = 10
+    sim.run()
+
+    # Writer keeps its own values mutable
+    trans, word = top.mine
+    word[0] = 0
+    list(trans.data)[0][0] = 0
+    trans.addr[1] = 1
+    assert (int(word), int(list(trans.data)[0]), int(trans.addr)) == (2, 2, 3)
+
+    # Committed values are frozen all the way down
+    assert int(top.word.read()) == 3
+    val = top.trans.read()
+    with pytest.raises(TypeError):
+        val.addr[0] = 0
+    with pytest.raises(TypeError):
+        list(val.data)[1][0] = 0
+
+    assert (int(val.addr), [int(d) for d in val.data]) == (1, [2, 3])
+
+def test_sliced_subscribe(sim):
+    top = Counter('top', None)
+    sl = top.cnt[1]
+    times = []
+
+    class Listener(object):
+        def resolve(self, pool):
+            times.append(sim.time)
+
+    lstn = Listener()
+    sl.subscribe(lstn)
+    assert lstn in top.cnt.e['event_def'][1].pool
+
+    sim.duration = 50
+    sim.run()
+    sl.unsubscribe(lstn)
+    assert lstn not in top.cnt.e['event_def'][1].pool
+    # Second bit of the counter changes on every other rising clock edge
+    assert times == [15, 35]
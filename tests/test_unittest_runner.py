@@ -0,0 +1,91 @@
+import importlib.util
+import os
+import sys
+import time
+import pytest
+
+import sydpy
+
+def load_unittest():
+    # The verif package imports the sequencers of the former API, hence the
+    # runner module is loaded on its own
+    name = 'sydpy.verif.unittest'
+    if name not in sys.modules:
+        path = os.path.join(os.path.dirname(sydpy.__file__), 'verif', 'unittest.py')
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+
+    return sys.modules[name]
+
+unittest = load_unittest()
+
+class FakeUnitTest(unittest.UnitTest):
+    """Runs the jobs without the simulator. The job configuration tells the
+    job to fail or to hang."""
+
+    def _run_job(self, conf, test_name, seed):
+        if conf.get('hang'):
+            with open(conf['hang'], 'w') as f:
+                f.write(str(os.getpid()))
+
+            time.sleep(60)
+
+        if conf.get('fail'):
+            raise ValueError("job failed")
+
+        res = unittest.UnitTestResult(None, test_name, seed=seed)
+        res.result = True
+        res.conf = conf
+        res.pid = os.getpid()
+        return res
+
+def test_jobs():
+    ut = FakeUnitTest([({'sys.output_path': './res'}, 'a'), ({}, 'b')], seeds=[1, 2])
+    jobs = [(conf.get('sys.seed'), conf['sys.output_path'], name, seed)
+            for conf, name, seed in ut._jobs()]
+
+    assert jobs == [(1, './res/a/seed_1', 'a', 1), (2, './res/a/seed_2', 'a', 2),
+                    (1, './out/b/seed_1', 'b', 1), (2, './out/b/seed_2', 'b', 2)]
+
+def test_run_parallel():
+    ut = FakeUnitTest([({}, 'ok'), ({'fail': True}, 'bad')], seeds=[3, 4])
+    results = list(ut.run_parallel(jobs=2))
+
+    assert sorted((r.test_name, r.seed) for r in results) == \
+        [('bad', 3), ('bad', 4), ('ok', 3), ('ok', 4)]
+
+    for r in results:
+        if r.test_name == 'ok':
+            # Each job runs in its own worker, with its own seed and output
+            assert r.pid != os.getpid()
+            assert r.conf['sys.seed'] == r.seed
+            assert r.conf['sys.output_path'] == './out/ok/seed_{0}'.format(r.seed)
+
+    summary = unittest.UnitTestSummary(results)
+    assert not summary
+    assert sorted((r.test_name, r.seed) for r in summary.failed) == [('bad', 3), ('bad', 4)]
+
+    lines = str(summary).splitlines()
+    assert lines[0] == "4 tests run, 2 passed, 2 failed."
+    assert "    Test for 'bad (seed 3)' failed! ValueError: job failed" in lines
+
+def test_timeout(tmp_path):
+    pid_file = str(tmp_path / 'pid')
+    ut = FakeUnitTest([({'hang': pid_file}, 'hang'), ({}, 'ok')])
+
+    start = time.time()
+    results = {r.test_name: r for r in ut.run_parallel(jobs=2, timeout=1)}
+
+    assert time.time() - start < 30
+    assert results['ok']
+    assert not results['hang']
+    assert results['hang'].error == "Timed out after 1s"
+
+    # Worker is killed and reaped
+    with open(pid_file) as f:
+        pid = int(f.read())
+
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)